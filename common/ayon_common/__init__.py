@@ -11,6 +11,7 @@ from .utils import (
     get_downloads_dir,
     get_archive_ext_and_type,
     extract_archive_file,
+    extract_archive_stream,
     validate_file_checksum,
     calculate_file_checksum,
 )
@@ -29,6 +30,7 @@ __all__ = (
     "get_downloads_dir",
     "get_archive_ext_and_type",
     "extract_archive_file",
+    "extract_archive_stream",
     "validate_file_checksum",
     "calculate_file_checksum",
 )
@@ -9,9 +9,14 @@ AYON launcher version. The connection object lives in 'ayon_api'.
 """
 
 import os
+import copy
 import json
+import time
+import uuid
+import hashlib
 import platform
 import datetime
+import threading
 import contextlib
 import subprocess
 import tempfile
@@ -32,6 +37,9 @@ from ayon_common.utils import (
     get_ayon_launch_args,
 )
 
+# Seconds for which validated token is trusted without server request
+DEFAULT_TOKEN_VALIDATION_TTL = 300
+
 
 class ChangeUserResult:
     def __init__(
@@ -59,6 +67,307 @@ def _get_servers_path():
     return get_launcher_local_dir("used_servers.json")
 
 
+class _KeyringState:
+    initialized = False
+
+
+def _get_keyring():
+    """Import 'keyring' and set its backend once per process."""
+
+    try:
+        import keyring
+
+    except Exception as exc:
+        raise NotImplementedError(
+            "Python module `keyring` is not available."
+        ) from exc
+
+    if not _KeyringState.initialized:
+        # hack for cx_freeze and Windows keyring backend
+        if platform.system().lower() == "windows":
+            from keyring.backends import Windows
+
+            keyring.set_keyring(Windows.WinVaultKeyring())
+        _KeyringState.initialized = True
+    return keyring
+
+
+class CredentialsStore:
+    """In-process cache of used servers metadata and tokens.
+
+    Servers metadata from 'used_servers.json' are loaded once and reloaded
+        only when the file was changed by other process. Tokens are loaded
+        from keyring once per url, because some keyring backends are slow.
+
+    Changes are written immediately, or at the end of 'batch' context
+        when used. Servers metadata are written atomically.
+
+    Use 'get_credentials_store' to get the store of current process.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._servers_data = None
+        self._servers_mtime = None
+        self._servers_changed = False
+        self._tokens = {}
+        self._changed_tokens = set()
+        self._batch_depth = 0
+
+    def _get_servers_mtime(self):
+        try:
+            return os.stat(_get_servers_path()).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load_servers_data(self):
+        if self._servers_changed:
+            return self._servers_data
+
+        mtime = self._get_servers_mtime()
+        if self._servers_data is not None and mtime == self._servers_mtime:
+            return self._servers_data
+
+        data = {}
+        if mtime is not None:
+            with open(_get_servers_path(), "r") as stream:
+                with contextlib.suppress(BaseException):
+                    data = json.load(stream)
+        self._servers_data = data
+        self._servers_mtime = mtime
+        return data
+
+    def get_servers_data(self) -> dict[str, Any]:
+        """Metadata about used servers.
+
+        Returns:
+            dict[str, Any]: Copy of servers metadata.
+        """
+
+        with self._lock:
+            return copy.deepcopy(self._load_servers_data())
+
+    def set_servers_data(self, data: dict[str, Any]):
+        """Change metadata about used servers.
+
+        Args:
+            data (dict[str, Any]): New servers metadata.
+        """
+
+        with self._lock:
+            self._servers_data = copy.deepcopy(data)
+            self._servers_changed = True
+            self._flush_if_not_batched()
+
+    def get_token(self, url: str) -> Union[str, None]:
+        """Token for url from keyring.
+
+        Args:
+            url (str): Server url.
+
+        Returns:
+            Union[str, None]: Token for passed url.
+        """
+
+        with self._lock:
+            if url not in self._tokens:
+                self._tokens[url] = TokenKeyring(url).get_value()
+            return self._tokens[url]
+
+    def set_token(self, url: str, token: Union[str, None]):
+        """Change token for url in keyring.
+
+        Args:
+            url (str): Server url.
+            token (Union[str, None]): Token, token is removed if is 'None'.
+        """
+
+        with self._lock:
+            self._tokens[url] = token
+            self._changed_tokens.add(url)
+            self._flush_if_not_batched()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Write all changes made in the context at once."""
+
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                self._flush_if_not_batched()
+
+    def _flush_if_not_batched(self):
+        if self._batch_depth == 0:
+            self.flush()
+
+    def flush(self):
+        """Write pending changes to disk and keyring."""
+
+        with self._lock:
+            if self._servers_changed:
+                self._write_servers_data()
+                self._servers_changed = False
+
+            changed_tokens = self._changed_tokens
+            self._changed_tokens = set()
+            for url in changed_tokens:
+                TokenKeyring(url).set_value(self._tokens[url])
+
+    def _write_servers_data(self):
+        filepath = _get_servers_path()
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as stream:
+            json.dump(self._servers_data, stream)
+        os.replace(tmp_path, filepath)
+        self._servers_mtime = self._get_servers_mtime()
+
+    def reset(self):
+        """Drop cached values, they are loaded again on next access."""
+
+        with self._lock:
+            self.flush()
+            self._servers_data = None
+            self._servers_mtime = None
+            self._tokens = {}
+
+
+_CREDENTIALS_STORE = CredentialsStore()
+
+
+def get_credentials_store() -> CredentialsStore:
+    """Credentials store of current process.
+
+    Returns:
+        CredentialsStore: Credentials store.
+    """
+
+    return _CREDENTIALS_STORE
+
+
+def _get_token_validation_path():
+    return get_launcher_local_dir("validated_tokens.json")
+
+
+def get_token_validation_ttl() -> int:
+    """Seconds for which validated token is trusted without server request.
+
+    The value can be changed using 'AYON_TOKEN_VALIDATION_TTL' environment
+        variable, '0' disables the cache of validated tokens.
+
+    Returns:
+        int: Time to live of validated token in seconds.
+    """
+
+    ttl = DEFAULT_TOKEN_VALIDATION_TTL
+    value = os.environ.get("AYON_TOKEN_VALIDATION_TTL")
+    if value:
+        try:
+            ttl = int(value)
+        except ValueError:
+            print(
+                "Invalid value of 'AYON_TOKEN_VALIDATION_TTL'"
+                f" environment variable \"{value}\". Expected integer."
+            )
+    return max(0, ttl)
+
+
+def _get_token_validation_key(url: str, token: str) -> str:
+    # Token itself is never stored, only its hash
+    url = url.rstrip("/")
+    return hashlib.sha256(f"{url}|{token}".encode("utf-8")).hexdigest()
+
+
+def _load_validated_tokens() -> dict[str, Any]:
+    try:
+        with open(_get_token_validation_path(), "r") as stream:
+            data = json.load(stream)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return data
+
+
+def _store_validated_tokens(data: dict[str, Any]):
+    filepath = _get_token_validation_path()
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    now = time.time()
+    ttl = get_token_validation_ttl()
+    data = {
+        key: value
+        for key, value in data.items()
+        if now - value.get("validated", 0) < ttl
+    }
+    tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as stream:
+            json.dump(data, stream)
+        os.replace(tmp_path, filepath)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def get_validated_username(url: str, token: str) -> Union[str, None]:
+    """Username of token which was recently validated on server.
+
+    Args:
+        url (str): Server url.
+        token (str): User's token.
+
+    Returns:
+        Union[str, None]: Username of token, or None if token was not
+            validated in last 'get_token_validation_ttl' seconds.
+    """
+
+    ttl = get_token_validation_ttl()
+    if not ttl or not url or not token:
+        return None
+    item = _load_validated_tokens().get(_get_token_validation_key(url, token))
+    if not item or time.time() - item.get("validated", 0) >= ttl:
+        return None
+    return item.get("username")
+
+
+def store_validated_token(url: str, token: str, username: str):
+    """Store that token was validated on server.
+
+    Args:
+        url (str): Server url.
+        token (str): User's token.
+        username (str): Username of token.
+    """
+
+    if not get_token_validation_ttl():
+        return
+    data = _load_validated_tokens()
+    data[_get_token_validation_key(url, token)] = {
+        "username": username,
+        "validated": time.time(),
+    }
+    _store_validated_tokens(data)
+
+
+def remove_validated_token(url: str, token: str):
+    """Remove token from validated tokens.
+
+    Should be used when server rejected a token which was validated.
+
+    Args:
+        url (str): Server url.
+        token (str): User's token.
+    """
+
+    data = _load_validated_tokens()
+    if data.pop(_get_token_validation_key(url, token), None) is not None:
+        _store_validated_tokens(data)
+
+
 def _get_ui_dir_path(*args) -> str:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(current_dir, "ui", *args)
@@ -75,18 +384,7 @@ def get_servers_info_data():
         dict[str, Any]: Information about servers.
     """
 
-    data = {}
-    servers_info_path = _get_servers_path()
-    if not os.path.exists(servers_info_path):
-        dirpath = os.path.dirname(servers_info_path)
-        os.makedirs(dirpath, exist_ok=True)
-
-        return data
-
-    with open(servers_info_path, "r") as stream:
-        with contextlib.suppress(BaseException):
-            data = json.load(stream)
-    return data
+    return get_credentials_store().get_servers_data()
 
 
 def add_server(url: str, username: str):
@@ -100,7 +398,6 @@ def add_server(url: str, username: str):
         username (str): Name of user used to log in.
     """
 
-    servers_info_path = _get_servers_path()
     data = get_servers_info_data()
     data["last_server"] = url
     if "urls" not in data:
@@ -109,9 +406,7 @@ def add_server(url: str, username: str):
         "updated_dt": datetime.datetime.now().strftime("%Y/%m/%d %H:%M:%S"),
         "username": username,
     }
-
-    with open(servers_info_path, "w") as stream:
-        json.dump(data, stream)
+    get_credentials_store().set_servers_data(data)
 
 
 def remove_server(url: str):
@@ -127,16 +422,13 @@ def remove_server(url: str):
     if not url:
         return
 
-    servers_info_path = _get_servers_path()
     data = get_servers_info_data()
     if data.get("last_server") == url:
         data["last_server"] = None
 
     if "urls" in data:
         data["urls"].pop(url, None)
-
-    with open(servers_info_path, "w") as stream:
-        json.dump(data, stream)
+    get_credentials_store().set_servers_data(data)
 
 
 def get_last_server(
@@ -191,7 +483,7 @@ def get_last_server_with_username():
 
     data = get_servers_info_data()
     url = get_last_server(data)
-    username = get_last_username_by_url(url)
+    username = get_last_username_by_url(url, data)
     return url, username
 
 
@@ -200,30 +492,18 @@ class TokenKeyring:
     username_key = "username"
 
     def __init__(self, url):
-        try:
-            import keyring
-
-        except Exception as exc:
-            raise NotImplementedError(
-                "Python module `keyring` is not available."
-            ) from exc
-
-        # hack for cx_freeze and Windows keyring backend
-        if platform.system().lower() == "windows":
-            from keyring.backends import Windows
-
-            keyring.set_keyring(Windows.WinVaultKeyring())
+        _get_keyring()
 
         self._url = url
         self._keyring_key = f"AYON/{url}"
 
     def get_value(self):
-        import keyring
+        keyring = _get_keyring()
 
         return keyring.get_password(self._keyring_key, self.username_key)
 
     def set_value(self, value):
-        import keyring
+        keyring = _get_keyring()
 
         if value is not None:
             keyring.set_password(self._keyring_key, self.username_key, value)
@@ -243,7 +523,7 @@ def load_token(url: str) -> Union[str, None]:
         Union[str, None]: Token for passed url available in keyring.
     """
 
-    return TokenKeyring(url).get_value()
+    return get_credentials_store().get_token(url)
 
 
 def store_token(url: str, token: str):
@@ -254,7 +534,7 @@ def store_token(url: str, token: str):
         token (str): User token to server.
     """
 
-    TokenKeyring(url).set_value(token)
+    get_credentials_store().set_token(url, token)
 
 
 def ask_to_login_ui(
@@ -407,12 +687,13 @@ def change_token(
 
     if old_url is None:
         old_url = get_last_server()
-    if old_url and old_url == url:
-        remove_url_cache(old_url)
+    with get_credentials_store().batch():
+        if old_url and old_url == url:
+            remove_url_cache(old_url)
 
-    # TODO check if ayon_api is already connected
-    add_server(url, username)
-    store_token(url, token)
+        # TODO check if ayon_api is already connected
+        add_server(url, username)
+        store_token(url, token)
     ayon_api.change_token(url, token)
 
 
@@ -437,6 +718,7 @@ def remove_token_cache(url: str, token: str):
         token (str): Token to be removed from url cache.
     """
 
+    remove_validated_token(url, token)
     if load_token(url) == token:
         remove_url_cache(url)
 
@@ -449,10 +731,11 @@ def logout(url: str, token: str):
         token (str): Token which should be used to log out.
     """
 
-    remove_server(url)
+    with get_credentials_store().batch():
+        remove_server(url)
+        remove_token_cache(url, token)
     ayon_api.close_connection()
     ayon_api.set_environments(None, None)
-    remove_token_cache(url, token)
     logout_from_server(url, token)
 
 
@@ -494,18 +777,29 @@ def set_environments(url: str, token: str):
     ayon_api.set_environments(url, token)
 
 
-def create_global_connection():
+def create_global_connection() -> bool:
     """Create global connection with site id and AYON launcher version.
 
     Make sure this function is called once during process runtime.
 
     The global connection in 'ayon_api' have entered site id and
         AYON launcher version.
+
+    Connection validates token on server. If token was rejected it is
+        removed from validated tokens, so next validation is done
+        on server.
+
+    Returns:
+        bool: Token of the connection is valid.
     """
 
-    ayon_api.create_connection(
+    con = ayon_api.create_connection(
         get_local_site_id(), os.environ.get("AYON_VERSION")
     )
+    if con.has_valid_token:
+        return True
+    remove_validated_token(con.get_base_url(), con.get_token())
+    return False
 
 
 def is_token_valid(
@@ -513,6 +807,9 @@ def is_token_valid(
 ) -> bool:
     """Check if token is valid.
 
+    Token validated in last 'get_token_validation_ttl' seconds is
+        considered valid without server request.
+
     Note:
         This function is available in 'ayon_api', but does not support to
             validate service api key, only user's token. The support will be
@@ -530,20 +827,32 @@ def is_token_valid(
         bool: True if token is valid.
     """
 
-    api = ayon_api.ServerAPI(url, token)
-    if not api.has_valid_token:
-        return False
+    username = get_validated_username(url, token)
+    if username is None:
+        api = ayon_api.ServerAPI(url, token)
+        if not api.has_valid_token:
+            return False
+        username = api.get_user()["name"]
+        store_validated_token(url, token, username)
+
     if expected_username:
-        return expected_username == api.get_user()["name"]
+        return expected_username == username
     return True
 
 
-def need_server_or_login(username: Optional[str] = None) -> tuple[bool, bool]:
+def need_server_or_login(
+    username: Optional[str] = None, timeout: Optional[float] = None
+) -> tuple[bool, bool]:
     """Check if server url or login to the server are needed.
 
     It is recommended to call 'load_environments' on startup before this check.
     But in some cases this function could be called after startup.
 
+    Args:
+        username (Optional[str]): Username expected for the token.
+        timeout (Optional[float]): Timeout of server url validation in
+            seconds. Default timeout of 'ayon_api' is used if not passed.
+
     Returns:
         tuple[bool, bool]: Server or api key needed. Both are 'True' if
             are available and valid.
@@ -554,7 +863,7 @@ def need_server_or_login(username: Optional[str] = None) -> tuple[bool, bool]:
         return True, True
 
     try:
-        server_url = validate_url(server_url)
+        server_url = validate_url(server_url, timeout=timeout)
     except UrlError:
         return True, True
 
@@ -579,8 +888,9 @@ def confirm_server_login(url: str, token: str, username: Union[str, None]):
         username (Union[str, None]): Username related to API token.
     """
 
-    add_server(url, username)
-    store_token(url, token)
+    with get_credentials_store().batch():
+        add_server(url, username)
+        store_token(url, token)
     set_environments(url, token)
 
 
@@ -0,0 +1,103 @@
+import os
+import json
+
+import ayon_api
+
+from ayon_common.distribution.control import fetch_bootstrap_catalog
+
+
+def test_token_validation_cache(printer, temp_folder, monkeypatch):
+    """Tests that validated token is not validated again on server."""
+
+    from ayon_common.connection import credentials
+    from ayon_common.distribution.tests.local_server import (
+        LocalAyonServer,
+    )
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    with LocalAyonServer() as server:
+        assert credentials.is_token_valid(server.url, "token", "admin")
+        request_count = server.request_count
+        assert request_count > 0
+        assert credentials.get_validated_username(
+            server.url + "/", "token"
+        ) == "admin"
+
+        # Cached validation does not send any request
+        assert credentials.is_token_valid(server.url, "token", "admin")
+        assert not credentials.is_token_valid(server.url, "token", "other")
+        assert server.request_count == request_count
+
+        # Username is not fetched again with catalog
+        con = ayon_api.ServerAPI(server.url, token="token")
+        request_count = server.request_count
+        catalog = fetch_bootstrap_catalog(
+            catalog_cache=None,
+            include_installers=False,
+            con=con,
+            active_user="admin",
+        )
+        assert catalog["active_user"] == "admin"
+        assert not any(
+            path == "/api/users/me"
+            for path in server.get_request_paths()[request_count:]
+        )
+
+        credentials.remove_validated_token(server.url, "token")
+        assert credentials.get_validated_username(server.url, "token") is None
+
+        monkeypatch.setenv("AYON_TOKEN_VALIDATION_TTL", "0")
+        assert credentials.is_token_valid(server.url, "token")
+        assert credentials.get_validated_username(server.url, "token") is None
+
+
+def test_credentials_store(printer, temp_folder, monkeypatch):
+    """Tests cached credentials with batched writes."""
+
+    from ayon_common.connection import credentials
+
+    keyring_calls = []
+    keyring_values = {"https://a.io": "token_a"}
+
+    class _FakeKeyring:
+        def __init__(self, url):
+            self._url = url
+
+        def get_value(self):
+            keyring_calls.append(("get", self._url))
+            return keyring_values.get(self._url)
+
+        def set_value(self, value):
+            keyring_calls.append(("set", self._url))
+            keyring_values[self._url] = value
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    monkeypatch.setattr(credentials, "TokenKeyring", _FakeKeyring)
+    monkeypatch.setattr(
+        credentials, "_CREDENTIALS_STORE", credentials.CredentialsStore()
+    )
+    servers_path = os.path.join(temp_folder, "used_servers.json")
+
+    # Keyring is asked only once per url
+    assert credentials.load_token("https://a.io") == "token_a"
+    assert credentials.load_token("https://a.io") == "token_a"
+    assert keyring_calls == [("get", "https://a.io")]
+
+    # Changes in batch are written at the end
+    with credentials.get_credentials_store().batch():
+        credentials.remove_url_cache("https://b.io")
+        credentials.add_server("https://b.io", "user")
+        credentials.store_token("https://b.io", "token_b")
+        assert not os.path.exists(servers_path)
+        assert "https://b.io" not in keyring_values
+    assert keyring_calls[1:] == [("set", "https://b.io")]
+    assert keyring_values["https://b.io"] == "token_b"
+    assert credentials.get_last_server_with_username() == (
+        "https://b.io", "user"
+    )
+
+    # Changes of file made by other process are loaded
+    with open(servers_path, "w") as stream:
+        json.dump({"last_server": "https://c.io"}, stream)
+    os.utime(servers_path, ns=(0, 0))
+    assert credentials.get_last_server() == "https://c.io"
@@ -2,8 +2,10 @@ from .exceptions import (
     BundleNotFoundError,
     InstallerDistributionError,
 )
-from .control import AyonDistribution
+from .control import AyonDistribution, fetch_bootstrap_catalog
+from .dedup import cli_dedupe_storage
 from .utils import (
+    get_distribution_workers,
     show_missing_bundle_information,
     show_installer_issue_information,
     UpdateWindowManager,
@@ -15,7 +17,10 @@ __all__ = (
     "InstallerDistributionError",
 
     "AyonDistribution",
+    "fetch_bootstrap_catalog",
+    "cli_dedupe_storage",
 
+    "get_distribution_workers",
     "show_missing_bundle_information",
     "show_installer_issue_information",
     "UpdateWindowManager",
@@ -0,0 +1,249 @@
+"""Content addressable cache of downloaded distribution archives.
+
+Archives of addons, dependency packages and installers are stored by their
+checksum, so re-distribution of already known version does not require
+to download the file again (e.g. when switching between production and
+staging bundle).
+"""
+import os
+import re
+import uuid
+import shutil
+import logging
+
+from ayon_common.utils import get_launcher_storage_dir
+
+# Default maximum size of cache in MB
+DEFAULT_ARCHIVE_CACHE_SIZE = 10 * 1024
+_CHECKSUM_REGEX = re.compile(r"^[0-9a-fA-F]+$")
+
+
+def get_archive_cache_dir():
+    """Directory where archives cache is stored.
+
+    The path can be changed using 'AYON_ARCHIVE_CACHE_DIR' environment
+    variable.
+
+    Returns:
+        str: Path to archives cache directory.
+    """
+
+    cache_dir = os.environ.get("AYON_ARCHIVE_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = get_launcher_storage_dir("archive_cache")
+    return cache_dir
+
+
+def get_archive_cache_max_size():
+    """Maximum size of archives cache in bytes.
+
+    The size can be changed using 'AYON_ARCHIVE_CACHE_SIZE' environment
+    variable in megabytes. Value '0' disables the cache.
+
+    Returns:
+        int: Maximum size of cache in bytes.
+    """
+
+    size = DEFAULT_ARCHIVE_CACHE_SIZE
+    value = os.environ.get("AYON_ARCHIVE_CACHE_SIZE")
+    if value:
+        try:
+            size = int(value)
+        except ValueError:
+            print(
+                "Invalid value of 'AYON_ARCHIVE_CACHE_SIZE'"
+                f" environment variable \"{value}\". Expected integer."
+            )
+    return max(0, size) * 1024 * 1024
+
+
+def _link_or_copy(src_path, dst_path):
+    try:
+        os.link(src_path, dst_path)
+    except OSError:
+        shutil.copyfile(src_path, dst_path)
+
+
+class ArchiveCache:
+    """Cache of archive files addressed by checksum.
+
+    Each archive is stored in '<root>/<algorithm>/<checksum>/<filename>'.
+    Files are hardlinked when possible, so storing a file to cache or
+    receiving a file from cache does not copy any bytes when cache is on the
+    same disk as target directory.
+
+    Modification time of the checksum directory is used as last access time
+    for LRU eviction when cache exceeds its maximum size.
+
+    Args:
+        root (Optional[str]): Root directory of cache.
+        max_size (Optional[int]): Maximum size of cache in bytes. Cache is
+            disabled when is set to '0'.
+    """
+
+    def __init__(self, root=None, max_size=None):
+        if root is None:
+            root = get_archive_cache_dir()
+        if max_size is None:
+            max_size = get_archive_cache_max_size()
+        self._root = root
+        self._max_size = max_size
+        self._log = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def enabled(self):
+        return self._max_size > 0
+
+    def _get_item_dir(self, checksum, checksum_algorithm):
+        if (
+            not checksum
+            or not checksum_algorithm
+            or not _CHECKSUM_REGEX.match(checksum)
+            or not checksum_algorithm.isalnum()
+        ):
+            return None
+        return os.path.join(
+            self._root, checksum_algorithm.lower(), checksum.lower()
+        )
+
+    def get_filepath(self, checksum, checksum_algorithm):
+        """Path to cached archive with checksum.
+
+        Args:
+            checksum (str): Checksum of archive.
+            checksum_algorithm (str): Algorithm used to calculate checksum.
+
+        Returns:
+            Union[str, None]: Path to cached archive or None if is not
+                in cache.
+        """
+
+        if not self.enabled:
+            return None
+        item_dir = self._get_item_dir(checksum, checksum_algorithm)
+        if not item_dir or not os.path.isdir(item_dir):
+            return None
+
+        for filename in os.listdir(item_dir):
+            filepath = os.path.join(item_dir, filename)
+            if os.path.isfile(filepath):
+                # Mark item as recently used
+                try:
+                    os.utime(item_dir)
+                except OSError:
+                    pass
+                return filepath
+        return None
+
+    def materialize(self, checksum, checksum_algorithm, dst_dir):
+        """Make cached archive available in a directory.
+
+        Args:
+            checksum (str): Checksum of archive.
+            checksum_algorithm (str): Algorithm used to calculate checksum.
+            dst_dir (str): Directory where the archive should be available.
+
+        Returns:
+            Union[str, None]: Path to archive in 'dst_dir' or None if
+                archive is not in cache.
+        """
+
+        src_path = self.get_filepath(checksum, checksum_algorithm)
+        if not src_path:
+            return None
+
+        os.makedirs(dst_dir, exist_ok=True)
+        dst_path = os.path.join(dst_dir, os.path.basename(src_path))
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        try:
+            _link_or_copy(src_path, dst_path)
+        except OSError:
+            # Cache item could be evicted by other process in the meantime
+            self._log.debug(
+                f"Failed to receive '{src_path}' from cache", exc_info=True
+            )
+            return None
+        return dst_path
+
+    def store(self, filepath, checksum, checksum_algorithm):
+        """Store archive to cache.
+
+        Checksum of the file is not validated, it is expected that the file
+            was already validated.
+
+        Args:
+            filepath (str): Path to archive.
+            checksum (str): Checksum of archive.
+            checksum_algorithm (str): Algorithm used to calculate checksum.
+        """
+
+        if not self.enabled:
+            return
+        item_dir = self._get_item_dir(checksum, checksum_algorithm)
+        if not item_dir or os.path.isdir(item_dir):
+            return
+
+        # Ignore files that would not fit into cache at all
+        if os.path.getsize(filepath) > self._max_size:
+            return
+
+        algorithm_dir = os.path.dirname(item_dir)
+        os.makedirs(algorithm_dir, exist_ok=True)
+        # Prepare the item in temp directory and rename it, so other
+        #   processes never see partially copied file
+        tmp_dir = os.path.join(algorithm_dir, f".tmp_{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+        try:
+            _link_or_copy(
+                filepath,
+                os.path.join(tmp_dir, os.path.basename(filepath))
+            )
+            os.rename(tmp_dir, item_dir)
+        except OSError:
+            # Item was probably stored by other process at the same time
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used archives until cache fits max size."""
+
+        if not os.path.isdir(self._root):
+            return
+
+        items = []
+        total_size = 0
+        for algorithm in os.listdir(self._root):
+            algorithm_dir = os.path.join(self._root, algorithm)
+            if not os.path.isdir(algorithm_dir):
+                continue
+            for checksum in os.listdir(algorithm_dir):
+                if checksum.startswith("."):
+                    continue
+                item_dir = os.path.join(algorithm_dir, checksum)
+                try:
+                    size = sum(
+                        entry.stat().st_size
+                        for entry in os.scandir(item_dir)
+                        if entry.is_file()
+                    )
+                    last_used = os.stat(item_dir).st_mtime
+                except OSError:
+                    continue
+                total_size += size
+                items.append((last_used, size, item_dir))
+
+        if total_size <= self._max_size:
+            return
+
+        items.sort()
+        for _, size, item_dir in items:
+            if total_size <= self._max_size:
+                break
+            self._log.debug(f"Removing '{item_dir}' from archive cache")
+            shutil.rmtree(item_dir, ignore_errors=True)
+            total_size -= size
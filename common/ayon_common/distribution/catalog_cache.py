@@ -0,0 +1,302 @@
+"""Cache of server catalog used for distribution.
+
+Responses of bundles, addons, dependency packages and installers endpoints
+are stored on disk with their 'ETag' and 'Last-Modified' headers. Cached
+response is revalidated using conditional request, so unchanged catalog
+costs only a small response without body.
+
+Addon settings needed during bootstrap are cached the same way per bundle
+and settings variant.
+"""
+import os
+import json
+import time
+import uuid
+import hashlib
+import logging
+from urllib.parse import quote
+
+import requests
+import ayon_api
+
+from ayon_common.utils import get_launcher_local_dir
+
+# Catalog entries by name and their server endpoints
+CATALOG_ENDPOINTS = {
+    "bundles": "bundles",
+    "addons": "addons?details=1",
+    "dependency_packages": "desktop/dependencyPackages",
+    "installers": "desktop/installers",
+}
+
+
+def is_catalog_cache_enabled():
+    """Server catalog is cached on disk.
+
+    The cache can be disabled using 'AYON_CATALOG_CACHE' environment
+    variable set to '0'.
+
+    Returns:
+        bool: Catalog cache is enabled.
+    """
+
+    return os.getenv("AYON_CATALOG_CACHE") != "0"
+
+
+def get_catalog_cache_ttl():
+    """Time in seconds for which cached catalog is used without revalidation.
+
+    The value can be changed using 'AYON_CATALOG_CACHE_TTL' environment
+    variable. Default value '0' means that catalog is revalidated
+    on each use.
+
+    Returns:
+        int: Time to live of cached catalog in seconds.
+    """
+
+    ttl = 0
+    value = os.environ.get("AYON_CATALOG_CACHE_TTL")
+    if value:
+        try:
+            ttl = int(value)
+        except ValueError:
+            print(
+                "Invalid value of 'AYON_CATALOG_CACHE_TTL'"
+                f" environment variable \"{value}\". Expected integer."
+            )
+    return max(0, ttl)
+
+
+def fetch_endpoint(endpoint, con=None):
+    """Fetch data of REST endpoint without session of connection.
+
+    Each call uses own HTTP connection, so it can be used from multiple
+    threads at once, which is not safe with session of connection.
+
+    Args:
+        endpoint (str): Endpoint relative to REST url of server.
+        con (Optional[ayon_api.ServerAPI]): Server connection. Global
+            connection is used if not passed.
+
+    Returns:
+        Any: Response data.
+
+    Raises:
+        requests.HTTPError: Server returned error.
+    """
+
+    if con is None:
+        con = ayon_api.get_server_api_connection()
+    response = requests.get(
+        f"{con.get_rest_url()}/{endpoint}",
+        headers=con.get_headers(),
+        timeout=con.timeout,
+        verify=con.get_ssl_verify(),
+        cert=con.get_cert(),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+class CatalogCache:
+    """Disk cache of server catalog revalidated by conditional requests.
+
+    Entries are stored per server url in '<root>/<server hash>/<name>.json'.
+
+    Args:
+        root (Optional[str]): Root directory of cache.
+        ttl (Optional[int]): Time in seconds for which cached entry is used
+            without revalidation.
+    """
+
+    def __init__(self, root=None, ttl=None):
+        if root is None:
+            root = get_launcher_local_dir("catalog_cache")
+        if ttl is None:
+            ttl = get_catalog_cache_ttl()
+        self._root = root
+        self._ttl = ttl
+        self._log = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def root(self):
+        return self._root
+
+    def get_entry_path(self, server_url, name):
+        server_hash = hashlib.sha1(server_url.encode("utf-8")).hexdigest()
+        return os.path.join(self._root, server_hash[:16], f"{name}.json")
+
+    def load_entry(self, server_url, name):
+        """Load cached entry.
+
+        Args:
+            server_url (str): Server url.
+            name (str): Catalog entry name.
+
+        Returns:
+            Union[dict[str, Any], None]: Cached entry with 'data' and
+                validators, or None if entry is not cached.
+        """
+
+        filepath = self.get_entry_path(server_url, name)
+        try:
+            with open(filepath, "r") as stream:
+                entry = json.load(stream)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "data" not in entry:
+            return None
+        return entry
+
+    def save_entry(self, server_url, name, entry):
+        filepath = self.get_entry_path(server_url, name)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w") as stream:
+                json.dump(entry, stream, separators=(",", ":"))
+            os.replace(tmp_path, filepath)
+        except OSError:
+            self._log.debug(
+                f"Failed to store catalog cache '{filepath}'", exc_info=True
+            )
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get(self, name, con=None):
+        """Catalog data from cache or server.
+
+        Args:
+            name (str): Catalog entry name from 'CATALOG_ENDPOINTS'.
+            con (Optional[ayon_api.ServerAPI]): Server connection. Global
+                connection is used if not passed.
+
+        Returns:
+            Any: Response data.
+
+        Raises:
+            requests.HTTPError: Server returned error.
+        """
+
+        return self.get_endpoint(name, CATALOG_ENDPOINTS[name], con)
+
+    def get_endpoint(self, name, endpoint, con=None):
+        """Data of any REST endpoint from cache or server.
+
+        Args:
+            name (str): Entry name used as filename of cached entry.
+            endpoint (str): Endpoint relative to REST url of server.
+            con (Optional[ayon_api.ServerAPI]): Server connection. Global
+                connection is used if not passed.
+
+        Returns:
+            Any: Response data.
+
+        Raises:
+            requests.HTTPError: Server returned error.
+        """
+
+        if con is None:
+            con = ayon_api.get_server_api_connection()
+        server_url = con.get_base_url()
+        entry = self.load_entry(server_url, name)
+        if (
+            entry is not None
+            and self._ttl
+            and time.time() - entry.get("fetched", 0) < self._ttl
+        ):
+            return entry["data"]
+
+        headers = con.get_headers()
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        url = f"{con.get_rest_url()}/{endpoint}"
+        request_kwargs = {
+            "timeout": con.timeout,
+            "verify": con.get_ssl_verify(),
+            "cert": con.get_cert(),
+        }
+        response = requests.get(url, headers=headers, **request_kwargs)
+        if response.status_code == 304:
+            if entry is not None:
+                self._log.debug(f"Catalog '{name}' did not change")
+                entry["fetched"] = time.time()
+                self.save_entry(server_url, name, entry)
+                return entry["data"]
+
+            # Not modified response without cached entry (e.g. from proxy)
+            #   is a cache miss
+            headers = con.get_headers()
+            headers["Cache-Control"] = "no-cache"
+            response = requests.get(url, headers=headers, **request_kwargs)
+            if response.status_code == 304:
+                raise requests.HTTPError(
+                    f"Server did not send content of '{url}'.",
+                    response=response,
+                )
+
+        response.raise_for_status()
+        data = response.json()
+        self.save_entry(server_url, name, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched": time.time(),
+            "data": data,
+        })
+        return data
+
+
+def get_cached_addon_settings(
+    addon_name,
+    addon_version,
+    bundle_name,
+    variant,
+    catalog_cache=None,
+    con=None,
+):
+    """Studio settings of addon cached per bundle and settings variant.
+
+    Cached settings are revalidated on server with conditional request
+    like server catalog.
+
+    Args:
+        addon_name (str): Addon name.
+        addon_version (str): Addon version.
+        bundle_name (str): Bundle name.
+        variant (str): Settings variant.
+        catalog_cache (Optional[CatalogCache]): Cache used to store
+            settings. Default cache is used if not passed and cache
+            is enabled.
+        con (Optional[ayon_api.ServerAPI]): Server connection. Global
+            connection is used if not passed.
+
+    Returns:
+        dict[str, Any]: Addon studio settings.
+    """
+
+    if con is None:
+        con = ayon_api.get_server_api_connection()
+    if catalog_cache is None and is_catalog_cache_enabled():
+        catalog_cache = CatalogCache()
+    if catalog_cache is None:
+        return con.get_addon_studio_settings(
+            addon_name, addon_version, variant
+        )
+
+    key = hashlib.sha1(
+        f"{bundle_name}|{variant}|{addon_name}|{addon_version}".encode(
+            "utf-8"
+        )
+    ).hexdigest()
+    return catalog_cache.get_endpoint(
+        f"settings_{key[:16]}",
+        (
+            f"addons/{addon_name}/{addon_version}/settings"
+            f"?variant={quote(variant)}"
+        ),
+        con,
+    )
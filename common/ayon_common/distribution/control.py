@@ -1,17 +1,18 @@
 import os
 import sys
 import json
+import time
 import uuid
 import ctypes
 import tempfile
 import traceback
-import collections
 import datetime
 import logging
 import shutil
 import threading
 import platform
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
 
 import attr
@@ -19,19 +20,45 @@ import ayon_api
 
 from ayon_common.utils import (
     HEADLESS_MODE_ENABLED,
+    ZipFileLongPaths,
+    file_lock,
     extract_archive_file,
+    extract_archive_stream,
+    get_archive_ext_and_type,
     is_staging_enabled,
     is_dev_mode_enabled,
     get_executables_info_by_version,
     get_downloads_dir,
 )
 
+from ayon_common.tracing import trace_span
+
 from .exceptions import BundleNotFoundError, InstallerDistributionError
 from .utils import (
     get_addons_dir,
     get_dependencies_dir,
+    get_distribution_workers,
+    is_stream_extract_enabled,
+    is_delta_update_enabled,
 )
 from .downloaders import get_default_download_factory
+from .archive_cache import ArchiveCache
+from .metadata import MetadataStore
+from .catalog_cache import (
+    CATALOG_ENDPOINTS,
+    CatalogCache,
+    fetch_endpoint,
+    is_catalog_cache_enabled,
+)
+from .dedup import ObjectStore, DedupResult, is_inline_dedup_enabled
+from .delta import (
+    get_manifest_path,
+    create_zip_manifest,
+    load_manifest,
+    save_manifest,
+    remove_manifest,
+    extract_zip_delta,
+)
 from .data_structures import (
     Installer,
     AddonInfo,
@@ -40,6 +67,10 @@ from .data_structures import (
 )
 
 NOT_SET = type("UNKNOWN", (), {"__bool__": lambda: False})()
+# Shared staging directories are created and removed from multiple threads
+_STAGING_LOCK = threading.Lock()
+# Threads removing content of trash directories
+_TRASH_CLEANUP_THREADS = []
 
 
 class UpdateState(Enum):
@@ -53,10 +84,13 @@ class UpdateState(Enum):
 class DistributeTransferProgress:
     """Progress of single source item in 'DistributionItem'.
 
-    The item is to keep track of single source item.
+    The item is to keep track of single source item. State changes are
+    guarded by lock because the progress can be changed from distribution
+    worker thread and read from other threads at the same time.
     """
 
     def __init__(self):
+        self._lock = threading.Lock()
         self._transfer_progress = ayon_api.TransferProgress()
         self._started = False
         self._failed = False
@@ -69,7 +103,8 @@ class DistributeTransferProgress:
     def set_started(self):
         """Call when source distribution starts."""
 
-        self._started = True
+        with self._lock:
+            self._started = True
 
     def set_failed(self, reason):
         """Set source distribution as failed.
@@ -78,28 +113,33 @@ class DistributeTransferProgress:
             reason (str): Error message why the transfer failed.
         """
 
-        self._failed = True
-        self._fail_reason = reason
+        with self._lock:
+            self._failed = True
+            self._fail_reason = reason
 
     def set_hash_check_started(self):
         """Call just before hash check starts."""
 
-        self._hash_check_started = True
+        with self._lock:
+            self._hash_check_started = True
 
     def set_hash_check_finished(self):
         """Call just after hash check finishes."""
 
-        self._hash_check_finished = True
+        with self._lock:
+            self._hash_check_finished = True
 
     def set_unzip_started(self):
         """Call just before unzip starts."""
 
-        self._unzip_started = True
+        with self._lock:
+            self._unzip_started = True
 
     def set_unzip_finished(self):
         """Call just after unzip finishes."""
 
-        self._unzip_finished = True
+        with self._lock:
+            self._unzip_finished = True
 
     @property
     def is_running(self):
@@ -109,11 +149,12 @@ class DistributeTransferProgress:
             bool: Transfer is in progress.
         """
 
-        return bool(
-            self._started
-            and not self._failed
-            and not self._hash_check_finished
-        )
+        with self._lock:
+            return bool(
+                self._started
+                and not self._failed
+                and not self._hash_check_finished
+            )
 
     @property
     def transfer_progress(self):
@@ -182,6 +223,8 @@ class BaseDistributionItem:
         downloader_data (Dict[str, Any]): More information for downloaders.
         item_label (str): Label used in log outputs (and in UI).
         logger (logging.Logger): Logger object.
+        archive_cache (Optional[ArchiveCache]): Cache of already downloaded
+            archives which is checked before downloading from sources.
     """
 
     def __init__(
@@ -195,6 +238,7 @@ class BaseDistributionItem:
         downloader_data,
         item_label,
         logger=None,
+        archive_cache=None,
     ):
         if logger is None:
             logger = logging.getLogger(self.__class__.__name__)
@@ -207,6 +251,7 @@ class BaseDistributionItem:
         self.sources = self._prepare_sources(sources)
         self.downloader_data = downloader_data
         self.item_label = item_label
+        self.archive_cache = archive_cache
 
         self._need_distribution = state != UpdateState.UPDATED
         self._current_source_progress = None
@@ -284,6 +329,48 @@ class BaseDistributionItem:
 
         return self._error_detail
 
+    def get_progress_info(self):
+        """Current progress of distribution usable for UI.
+
+        Phase is one of 'waiting', 'downloading', 'validating',
+        'extracting', 'done' or 'failed'. Size is '0' if is not known.
+
+        Returns:
+            dict[str, Any]: Item label, phase, transferred and
+                expected size.
+        """
+
+        progress = self._used_source_progress
+        if progress is None:
+            progress = self._current_source_progress
+
+        phase = "waiting"
+        transferred = size = 0
+        if progress is not None:
+            transfer_progress = progress.transfer_progress
+            transferred = transfer_progress.get_transferred_size() or 0
+            size = transfer_progress.get_content_size() or 0
+
+        if self._dist_finished:
+            if self.state == UpdateState.UPDATED:
+                phase = "done"
+            else:
+                phase = "failed"
+        elif progress is not None and progress.started:
+            if progress.unzip_started:
+                phase = "extracting"
+            elif progress.hash_check_started:
+                phase = "validating"
+            else:
+                phase = "downloading"
+
+        return {
+            "label": self.item_label,
+            "phase": phase,
+            "transferred": transferred,
+            "size": size,
+        }
+
     def _pre_source_process(self):
         os.makedirs(self.download_dirpath, exist_ok=True)
 
@@ -303,13 +390,25 @@ class BaseDistributionItem:
 
         download_dirpath = self.download_dirpath
 
+        filepath = self._receive_cached_file()
+        if filepath:
+            source_progress.set_hash_check_started()
+            source_progress.set_hash_check_finished()
+            return filepath
+
+        checksum_algorithm = None
+        if self.checksum:
+            checksum_algorithm = self.checksum_algorithm
+
         try:
-            filepath = downloader.download(
-                source_data,
-                download_dirpath,
-                self.downloader_data,
-                source_progress.transfer_progress,
-            )
+            with trace_span("download", item=self.item_label):
+                filepath, file_checksum = downloader.download_with_checksum(
+                    source_data,
+                    download_dirpath,
+                    self.downloader_data,
+                    source_progress.transfer_progress,
+                    checksum_algorithm,
+                )
         except Exception:
             message = "Failed to download source"
             source_progress.set_failed(message)
@@ -325,9 +424,13 @@ class BaseDistributionItem:
             #   information about checksum at the moment.
             # TODO remove once addon can supply checksum.
             if self.checksum:
-                downloader.check_hash(
-                    filepath, self.checksum, self.checksum_algorithm
-                )
+                with trace_span("hash_check", item=self.item_label):
+                    downloader.check_hash(
+                        filepath,
+                        self.checksum,
+                        self.checksum_algorithm,
+                        file_checksum,
+                    )
         except Exception:
             message = "File hash does not match"
             source_progress.set_failed(message)
@@ -337,8 +440,194 @@ class BaseDistributionItem:
             )
             return None
         source_progress.set_hash_check_finished()
+        self._store_file_to_cache(filepath)
         return filepath
 
+    def _receive_cached_file(self):
+        """Receive file from archive cache.
+
+        Returns:
+            Union[str, None]: Path to file in download directory or None
+                if file is not available in cache.
+        """
+
+        if self.archive_cache is None or not self.checksum:
+            return None
+
+        try:
+            filepath = self.archive_cache.materialize(
+                self.checksum,
+                self.checksum_algorithm,
+                self.download_dirpath,
+            )
+        except Exception:
+            self.log.warning(
+                f"{self.item_label}: Failed to use archive cache",
+                exc_info=True
+            )
+            return None
+
+        if filepath:
+            self.log.debug(f"{self.item_label}: Using cached archive")
+        return filepath
+
+    def _store_file_to_cache(self, filepath):
+        if self.archive_cache is None or not self.checksum:
+            return
+
+        try:
+            self.archive_cache.store(
+                filepath, self.checksum, self.checksum_algorithm
+            )
+        except Exception:
+            self.log.warning(
+                f"{self.item_label}: Failed to store archive to cache",
+                exc_info=True
+            )
+
+    def _receive_stream(
+        self, source_data, source_progress, downloader, dst_dirpath
+    ):
+        """Download tar archive and extract it at the same time.
+
+        Checksum is calculated from the same stream. Content extracted to
+            'dst_dirpath' should be used only if 'True' is returned.
+
+        Args:
+            source_data (dict[str, Any]): Source information.
+            source_progress (DistributeTransferProgress): Object where to
+                track process of a source.
+            downloader (SourceDownloader): Downloader object which should care
+                about receiving content from source.
+            dst_dirpath (str): Directory where content is extracted.
+
+        Returns:
+            Union[bool, None]: None if source can't be streamed, otherwise
+                if content was extracted and checksum matches.
+        """
+
+        if not is_stream_extract_enabled():
+            return None
+
+        filename = downloader.get_source_filename(source_data)
+        if not filename or get_archive_ext_and_type(filename)[1] != "tar":
+            return None
+
+        # Prefer cached archive over download
+        if (
+            self.archive_cache is not None
+            and self.checksum
+            and self.archive_cache.get_filepath(
+                self.checksum, self.checksum_algorithm
+            )
+        ):
+            return None
+
+        checksum_algorithm = None
+        if self.checksum:
+            checksum_algorithm = self.checksum_algorithm
+
+        transfer_progress = source_progress.transfer_progress
+        try:
+            stream = downloader.open_stream(
+                source_data,
+                self.downloader_data,
+                transfer_progress,
+                checksum_algorithm,
+            )
+        except Exception:
+            message = "Failed to download source"
+            source_progress.set_failed(message)
+            self.log.warning(
+                f"{self.item_label}: {message}",
+                exc_info=True
+            )
+            return False
+
+        if stream is None:
+            return None
+
+        if os.path.exists(dst_dirpath):
+            shutil.rmtree(dst_dirpath)
+        with _STAGING_LOCK:
+            os.makedirs(dst_dirpath)
+
+        source_progress.set_unzip_started()
+        try:
+            with stream:
+                extract_archive_stream(stream, filename, dst_dirpath)
+                # Archive can end with padding which is not read by tarfile
+                stream.read_to_end()
+                file_checksum = stream.hexdigest()
+
+        except Exception:
+            shutil.rmtree(dst_dirpath, ignore_errors=True)
+            message = "Couldn't extract source stream"
+            source_progress.set_failed(message)
+            self.log.warning(
+                f"{self.item_label}: {message}",
+                exc_info=True
+            )
+            return False
+
+        if not transfer_progress.get_transfer_done():
+            transfer_progress.set_transfer_done()
+
+        source_progress.set_hash_check_started()
+        if self.checksum and file_checksum != self.checksum:
+            shutil.rmtree(dst_dirpath, ignore_errors=True)
+            message = "File hash does not match"
+            source_progress.set_failed(message)
+            self.log.warning(f"{self.item_label}: {message}")
+            return False
+
+        source_progress.set_hash_check_finished()
+        source_progress.set_unzip_finished()
+        return True
+
+    def _process_source_delta(
+        self, source_data, source_progress, downloader
+    ):
+        """Process source by receiving only changed files.
+
+        Override this method if item can reuse content of other version.
+
+        Args:
+            source_data (dict[str, Any]): Source information data.
+            source_progress (DistributeTransferProgress): Object where to
+                track process of a source.
+            downloader (SourceDownloader): Object which cares about download
+                of content.
+
+        Returns:
+            Union[bool, None]: None if source was not processed as delta,
+                otherwise same as '_post_source_process'.
+        """
+
+        return None
+
+    def _process_source_stream(
+        self, source_data, source_progress, downloader
+    ):
+        """Process source by extracting its content while downloading.
+
+        Override this method if item can use streamed content, see
+            '_receive_stream'.
+
+        Args:
+            source_data (dict[str, Any]): Source information data.
+            source_progress (DistributeTransferProgress): Object where to
+                track process of a source.
+            downloader (SourceDownloader): Object which cares about download
+                of content.
+
+        Returns:
+            Union[bool, None]: None if source was not processed as stream,
+                otherwise same as '_post_source_process'.
+        """
+
+        return None
+
     def _post_source_process(
         self, filepath, source_data, source_progress, downloader
     ):
@@ -402,6 +691,17 @@ class BaseDistributionItem:
 
         try:
             source_data = attr.asdict(source)
+            processed = self._process_source_delta(
+                source_data, source_progress, downloader
+            )
+            if processed is None:
+                with trace_span("stream_extract", item=self.item_label):
+                    processed = self._process_source_stream(
+                        source_data, source_progress, downloader
+                    )
+            if processed is not None:
+                return processed
+
             filepath = self._receive_file(
                 source_data,
                 source_progress,
@@ -457,7 +757,8 @@ class BaseDistributionItem:
         self._dist_started = True
         try:
             if self.state == UpdateState.OUTDATED:
-                self._distribute()
+                with trace_span("distribute_item", item=self.item_label):
+                    self._distribute()
 
         except Exception as exc:
             self.state = UpdateState.UPDATE_FAILED
@@ -479,6 +780,47 @@ class BaseDistributionItem:
             self._post_distribute()
 
 
+def cleanup_trash_dir(trash_dirpath):
+    """Remove content of trash directory in background thread.
+
+    Content which can't be removed (e.g. files used by other process) is
+    skipped and removed on next cleanup.
+
+    Args:
+        trash_dirpath (str): Path to trash directory.
+
+    Returns:
+        threading.Thread: Thread removing the content.
+    """
+
+    def _cleanup():
+        if not os.path.isdir(trash_dirpath):
+            return
+        for name in os.listdir(trash_dirpath):
+            path = os.path.join(trash_dirpath, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    thread = threading.Thread(
+        target=_cleanup, name="AYONTrashCleanup", daemon=True
+    )
+    thread.start()
+    _TRASH_CLEANUP_THREADS.append(thread)
+    return thread
+
+
+def wait_for_trash_cleanup():
+    """Wait until all trash cleanups running in background are finished."""
+
+    while _TRASH_CLEANUP_THREADS:
+        _TRASH_CLEANUP_THREADS.pop(0).join()
+
+
 def create_tmp_file(suffix=None, prefix=None):
     with tempfile.NamedTemporaryFile(
         suffix=suffix, prefix=prefix, delete=False
@@ -674,7 +1016,7 @@ class InstallerDistributionItem(BaseDistributionItem):
         Args:
             filepath (str): Path to a .tar.gz file.
         """
-        install_root = os.path.dirname(os.path.dirname(sys.executable))
+        install_root = self._get_linux_install_root()
 
         self.log.info(f"Installing AYON launcher {filepath} into:\n{install_root}")
 
@@ -689,11 +1031,80 @@ class InstallerDistributionItem(BaseDistributionItem):
                 " Try to install AYON manually."
             )
 
-        installer_dir = os.path.basename(filepath).replace(".tar.gz", "")
+        self._set_linux_executable(install_root, os.path.basename(filepath))
+
+    def _get_linux_install_root(self):
+        return os.path.dirname(os.path.dirname(sys.executable))
+
+    def _set_linux_executable(self, install_root, filename):
+        installer_dir = filename.replace(".tar.gz", "")
         executable = os.path.join(install_root, installer_dir, "ayon")
         self.log.info(f"Setting executable to {executable}")
         self._executable = executable
 
+    def _process_source_stream(
+        self, source_data, source_progress, downloader
+    ):
+        if platform.system().lower() != "linux":
+            return None
+
+        install_root = self._get_linux_install_root()
+        staging_root = os.path.join(install_root, ".staging")
+        staging_dirpath = os.path.join(staging_root, uuid.uuid4().hex)
+        self.log.info(
+            f"Installing AYON launcher stream into:\n{install_root}"
+        )
+        try:
+            result = self._receive_stream(
+                source_data, source_progress, downloader, staging_dirpath
+            )
+        except Exception:
+            shutil.rmtree(staging_dirpath, ignore_errors=True)
+            raise
+
+        if result is None:
+            return None
+
+        success = False
+        if result:
+            try:
+                for name in os.listdir(staging_dirpath):
+                    dst_path = os.path.join(install_root, name)
+                    if os.path.isdir(dst_path):
+                        shutil.rmtree(dst_path)
+                    elif os.path.exists(dst_path):
+                        os.remove(dst_path)
+                    os.rename(os.path.join(staging_dirpath, name), dst_path)
+                self._set_linux_executable(
+                    install_root,
+                    downloader.get_source_filename(source_data)
+                )
+                success = True
+
+            except Exception:
+                message = "Installation failed"
+                source_progress.set_failed(message)
+                self.log.warning(
+                    f"{self.item_label}: {message}",
+                    exc_info=True
+                )
+                self._installer_error = (
+                    "Distribution of AYON launcher"
+                    " failed with unexpected reason."
+                )
+
+        shutil.rmtree(staging_dirpath, ignore_errors=True)
+        try:
+            os.rmdir(staging_root)
+        except OSError:
+            pass
+
+        self.state = (
+            UpdateState.UPDATED if success else UpdateState.UPDATE_FAILED
+        )
+        self._used_source = source_data
+        return True
+
     def _install_macos(self, filepath):
         """Install macOS AYON launcher.
 
@@ -824,30 +1235,293 @@ class DistributionItem(BaseDistributionItem):
         downloader_data (Dict[str, Any]): More information for downloaders.
         item_label (str): Label used in log outputs (and in UI).
         logger (logging.Logger): Logger object.
+        manifests_dirpath (Optional[str]): Directory where manifests of
+            extracted zip archives are stored.
+        delta_base_dirpath (Optional[str]): Directory with other version
+            of the item which can be used for delta update.
     """
 
-    def __init__(self,unzip_dirpath, *args, **kwargs):
+    def __init__(
+        self,
+        unzip_dirpath,
+        *args,
+        manifests_dirpath=None,
+        delta_base_dirpath=None,
+        **kwargs
+    ):
         self.unzip_dirpath = unzip_dirpath
+        self.manifests_dirpath = manifests_dirpath
+        self.delta_base_dirpath = delta_base_dirpath
+        # State of item is based on content at this time
+        self._created_time = time.time()
         super().__init__(*args, **kwargs)
 
-    def _pre_source_process(self):
-        super()._pre_source_process()
+    def _get_manifest_path(self, dirpath):
+        if not self.manifests_dirpath:
+            return None
+        return get_manifest_path(self.manifests_dirpath, dirpath)
+
+    def _update_manifest(self, manifest):
+        manifest_path = self._get_manifest_path(self.unzip_dirpath)
+        if not manifest_path:
+            return
+        try:
+            if manifest is None:
+                remove_manifest(manifest_path)
+            else:
+                save_manifest(manifest_path, manifest)
+        except Exception:
+            self.log.warning(
+                f"{self.item_label}: Failed to store manifest",
+                exc_info=True
+            )
+
+    def _get_staging_dirpath(self):
+        parent_dirpath, dirname = os.path.split(self.unzip_dirpath)
+        return os.path.join(parent_dirpath, ".staging", dirname)
+
+    def _get_lock_path(self):
+        parent_dirpath, dirname = os.path.split(self.unzip_dirpath)
+        return os.path.join(parent_dirpath, ".locks", f"{dirname}.lock")
+
+    def _get_distributed_marker_path(self):
+        return os.path.splitext(self._get_lock_path())[0] + ".json"
+
+    def _get_distributed_by_other(self, since):
+        """Source data of item distributed by other process.
+
+        Args:
+            since (float): Time when state of the item was resolved.
+
+        Returns:
+            Union[dict[str, Any], None]: Source data used by other process
+                if it distributed the item after 'since'.
+        """
+
+        if not self.checksum or not os.path.isdir(self.unzip_dirpath):
+            return None
+        try:
+            with open(self._get_distributed_marker_path(), "r") as stream:
+                data = json.load(stream)
+        except (OSError, ValueError):
+            return None
+        if (
+            data.get("checksum") != self.checksum
+            or data.get("checksum_algorithm") != self.checksum_algorithm
+            or data.get("time", 0) < since
+        ):
+            return None
+        return data.get("source")
+
+    def _mark_distributed(self):
+        if not self.checksum:
+            return
+        with open(self._get_distributed_marker_path(), "w") as stream:
+            json.dump({
+                "checksum": self.checksum,
+                "checksum_algorithm": self.checksum_algorithm,
+                "source": self._used_source,
+                "time": time.time(),
+            }, stream)
+
+    def _get_staging_marker_path(self, staging_dirpath):
+        return f"{staging_dirpath}.json"
+
+    def _is_staging_complete(self, staging_dirpath):
+        """Staging directory contains fully extracted content of the item.
+
+        Extracted content is kept when it could not be activated, so next
+        distribution can reuse it instead of extracting the archive again.
+        """
+
+        if not self.checksum or not os.path.isdir(staging_dirpath):
+            return False
+        marker_path = self._get_staging_marker_path(staging_dirpath)
+        try:
+            with open(marker_path, "r") as stream:
+                data = json.load(stream)
+        except (OSError, ValueError):
+            return False
+        return (
+            data.get("checksum") == self.checksum
+            and data.get("checksum_algorithm") == self.checksum_algorithm
+        )
+
+    def _mark_staging_complete(self, staging_dirpath):
+        if not self.checksum:
+            return
+        marker_path = self._get_staging_marker_path(staging_dirpath)
+        with open(marker_path, "w") as stream:
+            json.dump({
+                "checksum": self.checksum,
+                "checksum_algorithm": self.checksum_algorithm,
+            }, stream)
+
+    def _cleanup_staging(self, staging_dirpath):
+        if os.path.exists(staging_dirpath):
+            shutil.rmtree(staging_dirpath, ignore_errors=True)
+        marker_path = self._get_staging_marker_path(staging_dirpath)
+        if os.path.exists(marker_path):
+            os.remove(marker_path)
+        with _STAGING_LOCK:
+            try:
+                os.rmdir(os.path.dirname(staging_dirpath))
+            except OSError:
+                pass
+
+    def _activate_staging_dir(self, staging_dirpath):
+        """Swap extracted staging directory into place.
+
+        Current content of target directory is moved to a trash directory
+        which is removed in background thread. Target directory is replaced
+        using renames only, so there is no moment when it is half-removed.
+
+        Args:
+            staging_dirpath (str): Directory with extracted content.
+        """
+
         unzip_dirpath = self.unzip_dirpath
+        parent_dirpath, dirname = os.path.split(unzip_dirpath)
+        trash_root = os.path.join(parent_dirpath, ".trash")
+        trash_dirpath = None
+        if os.path.exists(unzip_dirpath):
+            os.makedirs(trash_root, exist_ok=True)
+            trash_dirpath = os.path.join(
+                trash_root, f"{dirname}_{uuid.uuid4().hex}"
+            )
+            os.rename(unzip_dirpath, trash_dirpath)
+
+        try:
+            os.rename(staging_dirpath, unzip_dirpath)
+        except Exception:
+            if trash_dirpath is not None:
+                os.rename(trash_dirpath, unzip_dirpath)
+            raise
+
+        self._cleanup_staging(staging_dirpath)
+        if trash_dirpath is not None:
+            cleanup_trash_dir(trash_root)
+
+    def _process_source_delta(
+        self, source_data, source_progress, downloader
+    ):
+        base_dirpath = self.delta_base_dirpath
+        if (
+            not is_delta_update_enabled()
+            or not base_dirpath
+            or not self.manifests_dirpath
+            or not os.path.isdir(base_dirpath)
+        ):
+            return None
+
+        filename = downloader.get_source_filename(source_data)
+        if not filename or get_archive_ext_and_type(filename)[1] != "zip":
+            return None
+
+        # Prefer cached archive which can be validated by checksum
+        if (
+            self.archive_cache is not None
+            and self.checksum
+            and self.archive_cache.get_filepath(
+                self.checksum, self.checksum_algorithm
+            )
+        ):
+            return None
+
+        base_manifest = load_manifest(self._get_manifest_path(base_dirpath))
+        if base_manifest is None:
+            return None
+
+        staging_dirpath = self._get_staging_dirpath()
+        try:
+            range_file = downloader.open_range_file(
+                source_data,
+                self.downloader_data,
+                source_progress.transfer_progress,
+            )
+            if range_file is None:
+                return None
+
+            with trace_span("delta_update", item=self.item_label):
+                self._cleanup_staging(staging_dirpath)
+                with _STAGING_LOCK:
+                    os.makedirs(staging_dirpath)
+                with range_file, ZipFileLongPaths(range_file) as zip_file:
+                    manifest = create_zip_manifest(zip_file)
+                    reused, extracted = extract_zip_delta(
+                        zip_file, staging_dirpath, base_dirpath, base_manifest
+                    )
+                self._activate_staging_dir(staging_dirpath)
+
+        except Exception:
+            # Fallback to download of whole archive
+            self._cleanup_staging(staging_dirpath)
+            self.log.warning(
+                f"{self.item_label}: Delta update failed",
+                exc_info=True
+            )
+            return None
+
+        self.log.info((
+            f"{self.item_label}: Delta update from"
+            f" '{os.path.basename(base_dirpath)}' reused {reused} files"
+            f" and downloaded {extracted} files"
+        ))
+        self._update_manifest(manifest)
+        source_progress.set_hash_check_started()
+        source_progress.set_hash_check_finished()
+        source_progress.set_unzip_started()
+        source_progress.set_unzip_finished()
+        self.state = UpdateState.UPDATED
+        self._used_source = source_data
+        return True
 
-        # Remove directory if exists
-        if os.path.isdir(unzip_dirpath):
-            self.log.debug(f"Cleaning {unzip_dirpath}")
-            shutil.rmtree(unzip_dirpath)
+    def _process_source_stream(
+        self, source_data, source_progress, downloader
+    ):
+        staging_dirpath = self._get_staging_dirpath()
+        result = self._receive_stream(
+            source_data, source_progress, downloader, staging_dirpath
+        )
+        if result:
+            # Use extracted content only when whole archive was validated
+            self._activate_staging_dir(staging_dirpath)
+            self._update_manifest(None)
+        elif result is False:
+            self._cleanup_staging(staging_dirpath)
 
-        # Create directory
-        os.makedirs(unzip_dirpath, exist_ok=True)
+        if not result:
+            return result
+
+        self.state = UpdateState.UPDATED
+        self._used_source = source_data
+        return True
 
     def _post_source_process(
         self, filepath, source_data, source_progress, downloader
     ):
+        staging_dirpath = self._get_staging_dirpath()
         source_progress.set_unzip_started()
+        manifest = None
         try:
-            downloader.unzip(filepath, self.unzip_dirpath)
+            if (
+                self.manifests_dirpath
+                and get_archive_ext_and_type(filepath)[1] == "zip"
+            ):
+                with ZipFileLongPaths(filepath) as zip_file:
+                    manifest = create_zip_manifest(zip_file)
+
+            if self._is_staging_complete(staging_dirpath):
+                self.log.debug(
+                    f"{self.item_label}: Using already extracted content"
+                )
+            else:
+                self._cleanup_staging(staging_dirpath)
+                with _STAGING_LOCK:
+                    os.makedirs(staging_dirpath)
+                with trace_span("unzip", item=self.item_label):
+                    downloader.unzip(filepath, staging_dirpath)
+                self._mark_staging_complete(staging_dirpath)
         except Exception:
             message = "Couldn't unzip source file"
             source_progress.set_failed(message)
@@ -856,6 +1530,18 @@ class DistributionItem(BaseDistributionItem):
                 exc_info=True
             )
             return False
+
+        try:
+            self._activate_staging_dir(staging_dirpath)
+        except Exception:
+            message = "Couldn't replace current content"
+            source_progress.set_failed(message)
+            self.log.warning(
+                f"{self.item_label}: {message}",
+                exc_info=True
+            )
+            return False
+        self._update_manifest(manifest)
         source_progress.set_unzip_finished()
 
         return super()._post_source_process(
@@ -863,13 +1549,56 @@ class DistributionItem(BaseDistributionItem):
         )
 
     def _post_distribute(self):
-        if (
-            self.state != UpdateState.UPDATED
-            and self.unzip_dirpath
-            and os.path.isdir(self.unzip_dirpath)
-        ):
-            self.log.debug(f"Cleaning {self.unzip_dirpath}")
-            shutil.rmtree(self.unzip_dirpath)
+        if self.state == UpdateState.UPDATED:
+            # Remove download directory if it is empty
+            # - it may contain partially downloaded file if distribution
+            #   failed, which can be resumed on next distribution
+            if self.download_dirpath != self.unzip_dirpath:
+                try:
+                    os.rmdir(self.download_dirpath)
+                except OSError:
+                    pass
+            return
+
+        # Keep current content and fully extracted staging directory
+        #   which can be activated on next distribution
+        staging_dirpath = self._get_staging_dirpath()
+        if not self._is_staging_complete(staging_dirpath):
+            self._cleanup_staging(staging_dirpath)
+
+    def distribute(self):
+        """Execute distribution logic.
+
+        Staging directory and partially downloaded file are shared by all
+        processes, so the item is distributed under a lock shared between
+        processes. Result of other process is used if it distributed the
+        item after state of this item was resolved.
+        """
+
+        if not self.need_distribution or self._dist_started:
+            return
+
+        with file_lock(self._get_lock_path()):
+            source = self._get_distributed_by_other(self._created_time)
+            if source is not None:
+                self.log.info(
+                    f"{self.item_label}: Distributed by other process"
+                )
+                self._dist_started = True
+                self._dist_finished = True
+                self._used_source = source
+                self.state = UpdateState.UPDATED
+                return
+
+            super().distribute()
+            if self.state == UpdateState.UPDATED:
+                try:
+                    self._mark_distributed()
+                except OSError:
+                    self.log.warning(
+                        f"{self.item_label}: Failed to mark distribution",
+                        exc_info=True
+                    )
 
 
 class AyonDistribution:
@@ -901,6 +1630,11 @@ class AyonDistribution:
             If not passed, 'is_dev_mode_enabled' is used as default value.
         skip_installer_dist (Optional[bool]): Skip installer distribution. This
             is for testing purposes and for running from code.
+        archive_cache (Optional[ArchiveCache]): Cache of downloaded archives.
+            Default cache in launcher storage is used if not passed.
+        catalog_cache (Optional[CatalogCache]): Cache of server catalog.
+            Default cache in launcher local dir is used if not passed,
+            'None' disables the cache.
     """
 
     def __init__(
@@ -917,6 +1651,8 @@ class AyonDistribution:
         use_dev=None,
         active_user=None,
         skip_installer_dist=False,
+        archive_cache=None,
+        catalog_cache=NOT_SET,
     ):
         self._log = None
 
@@ -928,6 +1664,16 @@ class AyonDistribution:
         self._dist_factory = (
             dist_factory or get_default_download_factory()
         )
+        if archive_cache is None:
+            archive_cache = ArchiveCache()
+        self._archive_cache = archive_cache
+        if catalog_cache is NOT_SET:
+            catalog_cache = None
+            if is_catalog_cache_enabled():
+                catalog_cache = CatalogCache()
+        self._catalog_cache = catalog_cache
+        self._addons_metadata_store = None
+        self._dependency_metadata_store = None
 
         if bundle_name is NOT_SET:
             bundle_name = os.environ.get("AYON_BUNDLE_NAME") or NOT_SET
@@ -982,7 +1728,8 @@ class AyonDistribution:
     @property
     def active_user(self):
         if self._active_user is None:
-            user = ayon_api.get_user()
+            with trace_span("get_user"):
+                user = ayon_api.get_user()
             self._active_user = user["name"]
         return self._active_user
 
@@ -1053,7 +1800,11 @@ class AyonDistribution:
         """
 
         if self._bundles_info is NOT_SET:
-            self._bundles_info = ayon_api.get_bundles()
+            with trace_span("get_bundles"):
+                if self._catalog_cache is not None:
+                    self._bundles_info = self._catalog_cache.get("bundles")
+                else:
+                    self._bundles_info = ayon_api.get_bundles()
         return self._bundles_info
 
     @property
@@ -1172,7 +1923,12 @@ class AyonDistribution:
         """
 
         if self._installers_info is NOT_SET:
-            self._installers_info = ayon_api.get_installers()["installers"]
+            with trace_span("get_installers"):
+                if self._catalog_cache is not None:
+                    installers = self._catalog_cache.get("installers")
+                else:
+                    installers = ayon_api.get_installers()
+            self._installers_info = installers["installers"]
         return self._installers_info
 
     @property
@@ -1357,6 +2113,7 @@ class AyonDistribution:
             "type": "installer",
             "version": installer_item.version,
             "filename": installer_item.filename,
+            "size": installer_item.size,
         }
 
         tmp_used = False
@@ -1376,7 +2133,8 @@ class AyonDistribution:
                 self._dist_factory,
                 list(installer_item.sources),
                 downloader_data,
-                f"Installer {installer_item.version}"
+                f"Installer {installer_item.version}",
+                archive_cache=self._archive_cache,
             )
             dist_item.distribute()
             self._installer_executable = dist_item.executable
@@ -1422,7 +2180,11 @@ class AyonDistribution:
 
         if self._addons_info is NOT_SET:
             # Use details to get information about client.zip
-            server_info = ayon_api.get_addons_info(details=True)
+            with trace_span("get_addons_info"):
+                if self._catalog_cache is not None:
+                    server_info = self._catalog_cache.get("addons")
+                else:
+                    server_info = ayon_api.get_addons_info(details=True)
             self._addons_info = server_info["addons"]
         return self._addons_info
 
@@ -1458,8 +2220,14 @@ class AyonDistribution:
         """
 
         if self._dependency_packages_info is NOT_SET:
-            self._dependency_packages_info = (
-                ayon_api.get_dependency_packages())["packages"]
+            with trace_span("get_dependency_packages"):
+                if self._catalog_cache is not None:
+                    packages = self._catalog_cache.get(
+                        "dependency_packages"
+                    )
+                else:
+                    packages = ayon_api.get_dependency_packages()
+            self._dependency_packages_info = packages["packages"]
         return self._dependency_packages_info
 
     @property
@@ -1514,8 +2282,54 @@ class AyonDistribution:
         self._staging_bundle = staging_bundle
         self._dev_bundle = dev_bundle
 
+    def _get_manifests_dirpath(self):
+        return os.path.join(self._addons_dirpath, ".manifests")
+
+    def _find_addon_delta_base(self, addon_item, addon_version):
+        """Find distributed version of addon usable for delta update.
+
+        The most recently distributed version with manifest is used.
+
+        Args:
+            addon_item (AddonInfo): Addon information.
+            addon_version (str): Version which will be distributed.
+
+        Returns:
+            Union[str, None]: Directory of distributed version.
+        """
+
+        if not is_delta_update_enabled():
+            return None
+
+        manifests_dirpath = self._get_manifests_dirpath()
+        candidates = []
+        versions_metadata = (
+            self.get_addons_metadata_store().get_versions(addon_item.name)
+        )
+        for version, version_metadata in versions_metadata.items():
+            version_item = addon_item.versions.get(version)
+            if version == addon_version or version_item is None:
+                continue
+            dirpath = os.path.join(
+                self._addons_dirpath, version_item.full_name
+            )
+            if (
+                os.path.isdir(dirpath)
+                and os.path.exists(
+                    get_manifest_path(manifests_dirpath, dirpath)
+                )
+            ):
+                candidates.append(
+                    (version_metadata.get("distributed_dt") or "", dirpath)
+                )
+
+        if not candidates:
+            return None
+        candidates.sort()
+        return candidates[-1][1]
+
     def _prepare_current_addon_dist_items(self):
-        addons_metadata = self.get_addons_metadata()
+        metadata_store = self.get_addons_metadata_store()
         output = []
         addon_versions = {}
         dev_addons = {}
@@ -1550,12 +2364,16 @@ class AyonDistribution:
                 continue
             full_name = addon_version_item.full_name
             addon_dest = os.path.join(self._addons_dirpath, full_name)
-            self.log.debug(f"Checking {full_name} in {addon_dest}")
-            addon_in_metadata = (
-                addon_name in addons_metadata
-                and addon_version_item.version in addons_metadata[addon_name]
+            # Download to separate directory so partially downloaded file
+            #   is not removed with addon directory and can be resumed
+            download_dirpath = os.path.join(
+                self._addons_dirpath, ".downloads", full_name
             )
-            if addon_in_metadata and os.path.isdir(addon_dest):
+            self.log.debug(f"Checking {full_name} in {addon_dest}")
+            if (
+                os.path.isdir(addon_dest)
+                and metadata_store.get_item(addon_name, addon_version)
+            ):
                 self.log.debug(
                     f"Addon version folder {addon_dest} already exists."
                 )
@@ -1569,10 +2387,15 @@ class AyonDistribution:
                 "name": addon_name,
                 "version": addon_version
             }
+            delta_base_dirpath = None
+            if state == UpdateState.OUTDATED:
+                delta_base_dirpath = self._find_addon_delta_base(
+                    addon_item, addon_version
+                )
 
             dist_item = DistributionItem(
                 addon_dest,
-                download_dirpath=addon_dest,
+                download_dirpath=download_dirpath,
                 state=state,
                 checksum=addon_version_item.checksum,
                 checksum_algorithm=addon_version_item.checksum_algorithm,
@@ -1580,7 +2403,10 @@ class AyonDistribution:
                 sources=list(addon_version_item.sources),
                 downloader_data=downloader_data,
                 item_label=full_name,
-                logger=self.log
+                logger=self.log,
+                archive_cache=self._archive_cache,
+                manifests_dirpath=self._get_manifests_dirpath(),
+                delta_base_dirpath=delta_base_dirpath,
             )
             output.append({
                 "dist_item": dist_item,
@@ -1596,25 +2422,35 @@ class AyonDistribution:
         if package is None:
             return None
 
-        metadata = self.get_dependency_metadata()
         downloader_data = {
             "type": "dependency_package",
             "name": package.filename,
-            "platform": package.platform_name
+            "platform": package.platform_name,
+            "size": package.size,
         }
-        zip_dir = package_dir = os.path.join(
+        package_dir = os.path.join(
             self._dependency_dirpath, package.filename
         )
+        download_dirpath = os.path.join(
+            self._dependency_dirpath,
+            ".downloads",
+            os.path.splitext(package.filename)[0]
+        )
         self.log.debug(f"Checking {package.filename} in {package_dir}")
 
-        if not os.path.isdir(package_dir) or package.filename not in metadata:
+        if (
+            not os.path.isdir(package_dir)
+            or not self.get_dependency_metadata_store().get_item(
+                package.filename
+            )
+        ):
             state = UpdateState.OUTDATED
         else:
             state = UpdateState.UPDATED
 
         return DistributionItem(
-            zip_dir,
-            download_dirpath=package_dir,
+            package_dir,
+            download_dirpath=download_dirpath,
             state=state,
             checksum=package.checksum,
             checksum_algorithm=package.checksum_algorithm,
@@ -1623,6 +2459,7 @@ class AyonDistribution:
             downloader_data=downloader_data,
             item_label=os.path.splitext(package.filename)[0],
             logger=self.log,
+            archive_cache=self._archive_cache,
         )
 
     def get_addon_dist_items(self):
@@ -1679,6 +2516,10 @@ class AyonDistribution:
         Metadata contain information about distributed packages, used source,
         expected file hash and time when file was distributed.
 
+        The file is used only by older versions of AYON launcher, content
+        is imported to metadata store and the file is updated with content
+        of the store.
+
         Returns:
             str: Path to a file where dependency package metadata are stored.
         """
@@ -1691,6 +2532,10 @@ class AyonDistribution:
         Metadata contain information about distributed addons, used sources,
         expected file hashes and time when files were distributed.
 
+        The file is used only by older versions of AYON launcher, content
+        is imported to metadata store and the file is updated with content
+        of the store.
+
         Returns:
             str: Path to a file where addons metadata are stored.
         """
@@ -1738,32 +2583,53 @@ class AyonDistribution:
         with open(filepath, "w") as stream:
             json.dump(data, stream, indent=4)
 
+    def get_dependency_metadata_store(self):
+        """Store of distributed dependency packages metadata.
+
+        Returns:
+            MetadataStore: Metadata store.
+        """
+
+        if self._dependency_metadata_store is None:
+            self._dependency_metadata_store = MetadataStore(
+                os.path.join(self._dependency_dirpath, "dependency.db"),
+                self.get_dependency_metadata_filepath(),
+                json_has_versions=False,
+            )
+        return self._dependency_metadata_store
+
+    def get_addons_metadata_store(self):
+        """Store of distributed addons metadata.
+
+        Returns:
+            MetadataStore: Metadata store.
+        """
+
+        if self._addons_metadata_store is None:
+            self._addons_metadata_store = MetadataStore(
+                os.path.join(self._addons_dirpath, "addons.db"),
+                self.get_addons_metadata_filepath(),
+            )
+        return self._addons_metadata_store
+
     def get_dependency_metadata(self):
-        filepath = self.get_dependency_metadata_filepath()
-        return self.read_metadata_file(filepath, {})
+        return {
+            package_name: versions[""]
+            for package_name, versions in (
+                self.get_dependency_metadata_store().get_all().items()
+            )
+        }
 
     def update_dependency_metadata(self, package_name, data):
-        dependency_metadata = self.get_dependency_metadata()
-        dependency_metadata[package_name] = data
-        filepath = self.get_dependency_metadata_filepath()
-        self.save_metadata_file(filepath, dependency_metadata)
+        self.get_dependency_metadata_store().update_items(
+            {package_name: {"": data}}
+        )
 
     def get_addons_metadata(self):
-        filepath = self.get_addons_metadata_filepath()
-        return self.read_metadata_file(filepath, {})
+        return self.get_addons_metadata_store().get_all()
 
     def update_addons_metadata(self, addons_information):
-        if not addons_information:
-            return
-        addons_metadata = self.get_addons_metadata()
-        for addon_name, version_value in addons_information.items():
-            if addon_name not in addons_metadata:
-                addons_metadata[addon_name] = {}
-            for addon_version, version_data in version_value.items():
-                addons_metadata[addon_name][addon_version] = version_data
-
-        filepath = self.get_addons_metadata_filepath()
-        self.save_metadata_file(filepath, addons_metadata)
+        self.get_addons_metadata_store().update_items(addons_information)
 
     def finish_distribution(self):
         """Store metadata about distributed items."""
@@ -1853,7 +2719,7 @@ class AyonDistribution:
                 return True
         return False
 
-    def distribute(self, threaded=False):
+    def distribute(self, threaded=False, max_workers=None):
         """Distribute all missing items.
 
         Method will try to distribute all items that are required by server.
@@ -1862,7 +2728,9 @@ class AyonDistribution:
         'validate_distribution' when this method finishes.
 
         Args:
-            threaded (bool): Distribute items in threads.
+            threaded (bool): Distribute items in a pool of worker threads.
+            max_workers (Optional[int]): Maximum number of worker threads.
+                Value from 'get_distribution_workers' is used if not passed.
         """
 
         if self._dist_started:
@@ -1874,21 +2742,75 @@ class AyonDistribution:
                 self.distribute_installer()
             return
 
-        threads = collections.deque()
-        for item in self.get_all_distribution_items():
-            if threaded:
-                threads.append(threading.Thread(target=item.distribute))
-            else:
+        items = [
+            item
+            for item in self.get_all_distribution_items()
+            if item.need_distribution
+        ]
+        if threaded and len(items) > 1:
+            self._distribute_in_pool(items, max_workers)
+        else:
+            for item in items:
                 item.distribute()
 
-        while threads:
-            thread = threads.popleft()
-            if thread.is_alive():
-                threads.append(thread)
-            else:
-                thread.join()
-
         self.finish_distribution()
+        if is_inline_dedup_enabled():
+            self._dedupe_distributed_items(items)
+
+    def _dedupe_distributed_items(self, items):
+        """Replace duplicated files of distributed items with links.
+
+        Args:
+            items (list[BaseDistributionItem]): Distributed items.
+        """
+
+        store = ObjectStore()
+        result = DedupResult()
+        for item in items:
+            if (
+                not isinstance(item, DistributionItem)
+                or item.state != UpdateState.UPDATED
+            ):
+                continue
+            try:
+                store.dedupe_directory(item.unzip_dirpath, result)
+            except Exception:
+                self.log.warning(
+                    f"{item.item_label}: Failed to deduplicate files",
+                    exc_info=True
+                )
+        self.log.debug(f"Deduplication finished {result}")
+
+    def _distribute_in_pool(self, items, max_workers=None):
+        """Distribute items using a bounded pool of worker threads.
+
+        Items are submitted in passed order. Dependency package is the first
+            item in 'get_all_distribution_items' so it is picked up by
+            a worker first, as it is usually the biggest item.
+
+        Args:
+            items (list[BaseDistributionItem]): Items to distribute.
+            max_workers (Optional[int]): Maximum number of worker threads.
+        """
+
+        if max_workers is None:
+            max_workers = get_distribution_workers()
+        max_workers = max(1, min(max_workers, len(items)))
+        self.log.debug(
+            f"Distributing {len(items)} items using {max_workers} workers"
+        )
+        with ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="AYONDistribution",
+        ) as executor:
+            futures = [
+                executor.submit(item.distribute)
+                for item in items
+            ]
+            for future in as_completed(futures):
+                # Distribution items handle their errors, this only makes
+                #   sure that unexpected errors are not silently ignored
+                future.result()
 
     def validate_distribution(self):
         """Check if all required distribution items are distributed.
@@ -2002,5 +2924,81 @@ class AyonDistribution:
         return output
 
 
+def fetch_bootstrap_catalog(
+    catalog_cache=NOT_SET, include_installers=True, con=None, active_user=None
+):
+    """Fetch server catalog needed for distribution concurrently.
+
+    Output can be passed to 'AyonDistribution' as keyword arguments, so
+    catalog is not fetched sequentially on first access of each property.
+    Data which failed to be fetched are not in output, so 'AyonDistribution'
+    fetches them again and error is raised from there.
+
+    Session of connection is not safe to be used from multiple threads,
+    so each request uses own HTTP connection.
+
+    Args:
+        catalog_cache (Optional[CatalogCache]): Cache of server catalog.
+            Default cache is used if not passed, 'None' disables the cache.
+        include_installers (Optional[bool]): Fetch installers information.
+        con (Optional[ayon_api.ServerAPI]): Server connection. Global
+            connection is used if not passed.
+        active_user (Optional[str]): Name of user already known from
+            token validation. Fetched from server if not passed.
+
+    Returns:
+        dict[str, Any]: Keyword arguments for 'AyonDistribution'.
+    """
+
+    if con is None:
+        con = ayon_api.get_server_api_connection()
+    if catalog_cache is NOT_SET:
+        catalog_cache = None
+        if is_catalog_cache_enabled():
+            catalog_cache = CatalogCache()
+
+    def _get_catalog(name):
+        if catalog_cache is not None:
+            return catalog_cache.get(name, con)
+        return fetch_endpoint(CATALOG_ENDPOINTS[name], con)
+
+    def _fetch(key, func):
+        with trace_span(f"fetch_{key}"):
+            return func()
+
+    fetch_funcs = {
+        "bundles_info": lambda: _get_catalog("bundles"),
+        "addons_info": lambda: _get_catalog("addons")["addons"],
+        "dependency_packages_info": lambda: _get_catalog(
+            "dependency_packages"
+        )["packages"],
+    }
+    if not active_user:
+        fetch_funcs["active_user"] = lambda: fetch_endpoint(
+            "users/me", con
+        )["name"]
+    if include_installers:
+        fetch_funcs["installers_info"] = lambda: _get_catalog(
+            "installers"
+        )["installers"]
+
+    output = {}
+    if active_user:
+        output["active_user"] = active_user
+    log = logging.getLogger("AyonDistribution")
+    with ThreadPoolExecutor(max_workers=len(fetch_funcs)) as executor:
+        futures = {
+            executor.submit(_fetch, key, func): key
+            for key, func in fetch_funcs.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                output[key] = future.result()
+            except Exception:
+                log.warning(f"Failed to fetch '{key}'", exc_info=True)
+    return output
+
+
 def cli(*args):
     raise NotImplementedError
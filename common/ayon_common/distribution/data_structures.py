@@ -209,6 +209,7 @@ class DependencyItem(object):
     unknown_sources = attr.ib(default=attr.Factory(list))
     source_addons = attr.ib(default=attr.Factory(dict))
     python_modules = attr.ib(default=attr.Factory(dict))
+    size = attr.ib(default=None)
 
     @classmethod
     def from_dict(cls, package):
@@ -230,7 +231,8 @@ class DependencyItem(object):
             # Backwards compatibility
             checksum_algorithm=package.get("checksumAlgorithm", "sha256"),
             source_addons=package["sourceAddons"],
-            python_modules=package["pythonModules"]
+            python_modules=package["pythonModules"],
+            size=package.get("size"),
         )
 
 
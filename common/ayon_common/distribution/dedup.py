@@ -0,0 +1,329 @@
+"""Deduplication of identical files in distributed addons and packages.
+
+Files of distributed items are hashed and replaced by links to a file in
+shared object store, where each content is stored only once. Copy-on-write
+clones (reflinks) are used when filesystem supports them, otherwise files
+are hardlinked.
+
+Hardlinked files share the same inode, which also means they share page
+cache. Content of distributed items must not be modified in place, which
+is true for extracted archives.
+"""
+import os
+import sys
+import stat
+import uuid
+import errno
+import ctypes
+import hashlib
+import logging
+import platform
+
+from ayon_common.utils import get_launcher_storage_dir
+
+# Files smaller than this are not worth the link
+DEDUP_MIN_FILE_SIZE = 4096
+# 'FICLONE' ioctl request of linux
+_FICLONE = 0x40049409
+_TMP_SUFFIX = ".dedup.tmp"
+
+
+def get_object_store_dir():
+    """Directory of shared object store.
+
+    The path can be changed using 'AYON_OBJECT_STORE_DIR' environment
+    variable. Store must be on the same disk as deduplicated directories.
+
+    Returns:
+        str: Path to object store directory.
+    """
+
+    store_dir = os.environ.get("AYON_OBJECT_STORE_DIR")
+    if not store_dir:
+        store_dir = get_launcher_storage_dir("objects")
+    return store_dir
+
+
+def is_inline_dedup_enabled():
+    """Distributed items are deduplicated right after distribution.
+
+    Inline deduplication is enabled using 'AYON_DISTRIBUTION_DEDUP'
+    environment variable set to '1'.
+
+    Returns:
+        bool: Inline deduplication is enabled.
+    """
+
+    return os.getenv("AYON_DISTRIBUTION_DEDUP") == "1"
+
+
+def reflink(src_path, dst_path):
+    """Create copy-on-write clone of a file.
+
+    Args:
+        src_path (str): Source file.
+        dst_path (str): Destination path, must not exist.
+
+    Raises:
+        OSError: Filesystem or platform does not support reflinks.
+    """
+
+    platform_name = platform.system().lower()
+    if platform_name == "linux":
+        import fcntl
+
+        with open(src_path, "rb") as src_stream:
+            with open(dst_path, "xb") as dst_stream:
+                try:
+                    fcntl.ioctl(
+                        dst_stream.fileno(), _FICLONE, src_stream.fileno()
+                    )
+                    success = True
+                except OSError:
+                    success = False
+        if not success:
+            os.remove(dst_path)
+            raise OSError(errno.EOPNOTSUPP, "Reflink is not supported")
+        os.chmod(dst_path, stat.S_IMODE(os.stat(src_path).st_mode))
+        return
+
+    if platform_name == "darwin":
+        libc = ctypes.CDLL("libc.dylib", use_errno=True)
+        result = libc.clonefile(
+            os.fsencode(src_path), os.fsencode(dst_path), 0
+        )
+        if result != 0:
+            error_code = ctypes.get_errno()
+            raise OSError(error_code, os.strerror(error_code))
+        return
+
+    raise OSError(errno.EOPNOTSUPP, "Reflink is not supported")
+
+
+def _calculate_file_digest(filepath):
+    hash_obj = hashlib.sha256()
+    with open(filepath, "rb") as stream:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            hash_obj.update(chunk)
+    return hash_obj.hexdigest()
+
+
+class DedupResult:
+    """Statistics of deduplication."""
+
+    def __init__(self):
+        self.files = 0
+        self.deduplicated = 0
+        self.saved_size = 0
+
+    def __repr__(self):
+        return (
+            f"<DedupResult files={self.files}"
+            f" deduplicated={self.deduplicated}"
+            f" saved_size={self.saved_size}>"
+        )
+
+
+class ObjectStore:
+    """Store of unique file contents addressed by their sha256.
+
+    Each content is stored in '<root>/<digest[:2]>/<digest>'. Executable
+    files are stored separately with '.x' suffix, because hardlinks share
+    permissions.
+
+    Args:
+        root (Optional[str]): Root directory of store.
+        use_reflinks (Optional[bool]): Use copy-on-write clones when
+            filesystem supports them.
+    """
+
+    def __init__(self, root=None, use_reflinks=True):
+        if root is None:
+            root = get_object_store_dir()
+        self._root = root
+        self._use_reflinks = use_reflinks
+        self._log = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def root(self):
+        return self._root
+
+    def get_object_path(self, digest, executable=False):
+        filename = digest
+        if executable:
+            filename += ".x"
+        return os.path.join(self._root, digest[:2], filename)
+
+    def _link(self, src_path, dst_path):
+        if self._use_reflinks:
+            try:
+                reflink(src_path, dst_path)
+                return
+            except OSError:
+                # Do not try again on filesystem without support
+                self._use_reflinks = False
+        os.link(src_path, dst_path)
+
+    def _replace_with_link(self, src_path, dst_path):
+        tmp_path = f"{dst_path}.{uuid.uuid4().hex}{_TMP_SUFFIX}"
+        self._link(src_path, tmp_path)
+        try:
+            os.replace(tmp_path, dst_path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+
+    def dedupe_file(self, filepath):
+        """Replace file with link to object with the same content.
+
+        File is stored to object store if content is not there yet.
+
+        Args:
+            filepath (str): Path to a file.
+
+        Returns:
+            int: Number of bytes saved by deduplication.
+        """
+
+        file_stat = os.lstat(filepath)
+        if (
+            not stat.S_ISREG(file_stat.st_mode)
+            or file_stat.st_size < DEDUP_MIN_FILE_SIZE
+        ):
+            return 0
+
+        digest = _calculate_file_digest(filepath)
+        executable = bool(file_stat.st_mode & stat.S_IXUSR)
+        object_path = self.get_object_path(digest, executable)
+        try:
+            object_stat = os.stat(object_path)
+        except FileNotFoundError:
+            object_stat = None
+
+        if object_stat is None:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            self._replace_with_link(filepath, object_path)
+            return 0
+
+        if (
+            os.path.samestat(object_stat, file_stat)
+            or object_stat.st_size != file_stat.st_size
+        ):
+            return 0
+
+        self._replace_with_link(object_path, filepath)
+        return file_stat.st_size
+
+    def dedupe_directory(self, dirpath, result=None):
+        """Deduplicate all files in a directory.
+
+        Files which can't be deduplicated (e.g. are used by other process
+        or are on a different disk) are skipped.
+
+        Args:
+            dirpath (str): Directory to deduplicate.
+            result (Optional[DedupResult]): Object where statistics are
+                added.
+
+        Returns:
+            DedupResult: Deduplication statistics.
+        """
+
+        if result is None:
+            result = DedupResult()
+
+        for root, _, filenames in os.walk(dirpath):
+            for filename in filenames:
+                if filename.endswith(_TMP_SUFFIX):
+                    continue
+                filepath = os.path.join(root, filename)
+                result.files += 1
+                try:
+                    saved_size = self.dedupe_file(filepath)
+                except OSError:
+                    self._log.debug(
+                        f"Failed to deduplicate '{filepath}'", exc_info=True
+                    )
+                    continue
+                if saved_size:
+                    result.deduplicated += 1
+                    result.saved_size += saved_size
+        return result
+
+    def collect_garbage(self):
+        """Remove objects which are not used by any distributed file.
+
+        Hardlinked object with link count '1' is used only by the store.
+        Cloned objects (reflinks) always have link count '1', so they are
+        removed too, which does not affect already deduplicated files.
+
+        Returns:
+            int: Number of removed objects.
+        """
+
+        removed = 0
+        if not os.path.isdir(self._root):
+            return removed
+
+        for root, _, filenames in os.walk(self._root):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                try:
+                    if (
+                        filename.endswith(_TMP_SUFFIX)
+                        or os.stat(path).st_nlink == 1
+                    ):
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+
+def dedupe_storage(dirpaths, store=None):
+    """Deduplicate distributed items in storage directories.
+
+    Only subdirectories of passed directories are processed, hidden
+    directories (e.g. '.downloads' or '.staging') and files in the
+    root (e.g. metadata) are skipped.
+
+    Args:
+        dirpaths (Iterable[str]): Storage directories, e.g. addons and
+            dependency packages directories.
+        store (Optional[ObjectStore]): Object store.
+
+    Returns:
+        DedupResult: Deduplication statistics.
+    """
+
+    if store is None:
+        store = ObjectStore()
+
+    result = DedupResult()
+    for dirpath in dirpaths:
+        if not os.path.isdir(dirpath):
+            continue
+        for name in os.listdir(dirpath):
+            item_path = os.path.join(dirpath, name)
+            if not name.startswith(".") and os.path.isdir(item_path):
+                store.dedupe_directory(item_path, result)
+    return result
+
+
+def cli_dedupe_storage():
+    """Deduplicate addons and dependency packages and collect garbage."""
+
+    from .utils import get_addons_dir, get_dependencies_dir
+
+    store = ObjectStore()
+    result = dedupe_storage(
+        [get_addons_dir(), get_dependencies_dir()], store
+    )
+    removed = store.collect_garbage()
+    saved_mb = result.saved_size / (1024 * 1024)
+    print(
+        f"Deduplicated {result.deduplicated} of {result.files} files"
+        f" ({saved_mb:.1f} MB saved), removed {removed} unused objects"
+        f" from '{store.root}'."
+    )
+    sys.stdout.flush()
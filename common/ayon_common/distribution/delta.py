@@ -0,0 +1,140 @@
+"""File level delta updates of addons.
+
+Manifest with size and CRC32 of each file is stored for each extracted
+addon version. When a new version of addon should be distributed and
+a previous version with manifest is available, only the zip directory and
+changed members are read from the remote archive. Unchanged files are
+hardlinked (or copied) from the previous version.
+"""
+import os
+import json
+import shutil
+
+MANIFEST_VERSION = 1
+
+
+def get_manifest_path(manifests_dirpath, dirpath):
+    """Path to manifest of extracted directory.
+
+    Args:
+        manifests_dirpath (str): Directory where manifests are stored.
+        dirpath (str): Extracted directory.
+
+    Returns:
+        str: Path to manifest file.
+    """
+
+    return os.path.join(
+        manifests_dirpath, f"{os.path.basename(dirpath)}.json"
+    )
+
+
+def create_zip_manifest(zip_file):
+    """Create manifest of zip archive from its directory.
+
+    Args:
+        zip_file (zipfile.ZipFile): Opened zip file.
+
+    Returns:
+        dict[str, Any]: Manifest data.
+    """
+
+    return {
+        "version": MANIFEST_VERSION,
+        "files": {
+            member.filename: [member.file_size, member.CRC]
+            for member in zip_file.infolist()
+            if not member.is_dir()
+        }
+    }
+
+
+def load_manifest(filepath):
+    """Load manifest from file.
+
+    Args:
+        filepath (str): Path to manifest file.
+
+    Returns:
+        Union[dict[str, Any], None]: Manifest data or None if file does not
+            exist or is not valid.
+    """
+
+    try:
+        with open(filepath, "r") as stream:
+            data = json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+    if data.get("version") != MANIFEST_VERSION:
+        return None
+    return data
+
+
+def save_manifest(filepath, manifest):
+    """Save manifest to file.
+
+    Args:
+        filepath (str): Path to manifest file.
+        manifest (dict[str, Any]): Manifest data.
+    """
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, "w") as stream:
+        json.dump(manifest, stream)
+    os.replace(tmp_path, filepath)
+
+
+def remove_manifest(filepath):
+    if os.path.exists(filepath):
+        os.remove(filepath)
+
+
+def _link_or_copy(src_path, dst_path):
+    try:
+        os.link(src_path, dst_path)
+    except OSError:
+        shutil.copy2(src_path, dst_path)
+
+
+def extract_zip_delta(zip_file, dst_dirpath, base_dirpath, base_manifest):
+    """Extract zip archive reusing unchanged files of previous version.
+
+    Only members that are not in base manifest, or have different size or
+    CRC32, are read from zip file. Extracted members are validated by
+    CRC32 by 'zipfile'.
+
+    Args:
+        zip_file (ayon_common.utils.ZipFileLongPaths): Opened zip file.
+        dst_dirpath (str): Directory where content is extracted.
+        base_dirpath (str): Directory of previous version.
+        base_manifest (dict[str, Any]): Manifest of previous version.
+
+    Returns:
+        tuple[int, int]: Number of reused and extracted files.
+    """
+
+    base_files = base_manifest["files"]
+    reused = extracted = 0
+    for member in zip_file.infolist():
+        dst_dir = zip_file.get_member_dirpath(member, dst_dirpath)
+        os.makedirs(dst_dir, exist_ok=True)
+        if member.is_dir():
+            continue
+
+        base_info = base_files.get(member.filename)
+        if base_info == [member.file_size, member.CRC]:
+            base_path = zip_file.get_member_path(member, base_dirpath)
+            dst_path = zip_file.get_member_path(member, dst_dirpath)
+            try:
+                if os.path.getsize(base_path) == member.file_size:
+                    _link_or_copy(base_path, dst_path)
+                    reused += 1
+                    continue
+            except OSError:
+                pass
+
+        zip_file.extract(member, dst_dirpath)
+        extracted += 1
+    return reused, extracted
@@ -7,8 +7,9 @@ import ayon_api
 
 from ayon_common import extract_archive_file, validate_file_checksum
 
-from .file_handler import RemoteFileHandler
+from .file_handler import RemoteFileHandler, RangeFile
 from .data_structures import UrlType
+from .utils import get_download_segments
 
 
 class SourceDownloader(metaclass=ABCMeta):
@@ -39,6 +40,99 @@ class SourceDownloader(metaclass=ABCMeta):
 
         pass
 
+    @classmethod
+    def download_with_checksum(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm,
+    ):
+        """Download file and calculate its checksum during download.
+
+        Downloaders that receive file content in chunks should override
+        this method, so checksum validation does not have to read
+        the whole file again. Default implementation only downloads
+        the file and does not calculate checksum.
+
+        Args:
+            source (dict): {type:"http", "url":"https://} ...}
+            destination_dir (str): local folder to unzip
+            data (dict): More information about download content. Always have
+                'type' key in.
+            transfer_progress (ayon_api.TransferProgress): Progress of
+                transferred (copy/download) content.
+            checksum_algorithm (str): Algorithm used to calculate checksum.
+
+        Returns:
+            tuple[str, Union[str, None]]: Local path to downloaded file and
+                its checksum, or 'None' if checksum was not calculated.
+        """
+
+        filepath = cls.download(
+            source, destination_dir, data, transfer_progress
+        )
+        return filepath, None
+
+    @classmethod
+    def get_source_filename(cls, source):
+        """Filename of file received from source.
+
+        Args:
+            source (dict): Source information.
+
+        Returns:
+            Union[str, None]: Filename or None if is not known before
+                download.
+        """
+
+        return None
+
+    @classmethod
+    def open_stream(cls, source, data, transfer_progress, checksum_algorithm):
+        """Open source content as readable stream.
+
+        Downloaders which can stream content should override this method,
+        so archives can be extracted while being downloaded.
+
+        Args:
+            source (dict): Source information.
+            data (dict): More information about download content. Always have
+                'type' key in.
+            transfer_progress (ayon_api.TransferProgress): Progress of
+                transferred content.
+            checksum_algorithm (Union[str, None]): Algorithm used to
+                calculate checksum of streamed content.
+
+        Returns:
+            Union[HashingStreamReader, None]: Stream with content or None
+                if downloader does not support streaming.
+        """
+
+        return None
+
+    @classmethod
+    def open_range_file(cls, source, data, transfer_progress):
+        """Open source file for random access without downloading it.
+
+        Downloaders which can read only parts of file should override this
+        method, so only changed files of addon can be downloaded.
+
+        Args:
+            source (dict): Source information.
+            data (dict): More information about download content. Always have
+                'type' key in.
+            transfer_progress (ayon_api.TransferProgress): Progress of
+                transferred content.
+
+        Returns:
+            Union[RangeFile, None]: Seekable file or None if downloader
+                does not support random access.
+        """
+
+        return None
+
     @classmethod
     @abstractmethod
     def cleanup(cls, source, destination_dir, data):
@@ -51,21 +145,53 @@ class SourceDownloader(metaclass=ABCMeta):
         pass
 
     @classmethod
-    def check_hash(cls, filepath, checksum, checksum_algorithm="sha256"):
+    def check_hash(
+        cls,
+        filepath,
+        checksum,
+        checksum_algorithm="sha256",
+        file_checksum=None,
+    ):
         """Compares 'hash' of downloaded 'addon_url' file.
 
         Args:
             filepath (str): Local path to addon file.
             checksum (str): Hash of downloaded file.
             checksum_algorithm (str): Type of hash.
+            file_checksum (Optional[str]): Checksum calculated during
+                download. File is read to calculate checksum if not passed.
 
         Raises:
             ValueError if hashes doesn't match
         """
 
-        if not validate_file_checksum(filepath, checksum, checksum_algorithm):
+        if file_checksum is not None:
+            is_valid = file_checksum == checksum
+        else:
+            is_valid = validate_file_checksum(
+                filepath, checksum, checksum_algorithm
+            )
+        if not is_valid:
             raise ValueError(f"{filepath} doesn't match expected hash.")
 
+    @classmethod
+    def get_download_segments(cls, data):
+        """Number of concurrent range requests used to download file.
+
+        Only dependency packages and installers are big enough to benefit
+        from segmented download.
+
+        Args:
+            data (dict): More information about download content.
+
+        Returns:
+            int: Number of download segments.
+        """
+
+        if data["type"] in ("dependency_package", "installer"):
+            return get_download_segments()
+        return 1
+
     @classmethod
     def unzip(cls, filepath, destination_dir):
         """Unzips local 'addon_zip_path' to 'destination'.
@@ -111,20 +237,65 @@ class HTTPDownloader(SourceDownloader):
 
     @classmethod
     def download(cls, source, destination_dir, data, transfer_progress):
+        filepath, _ = cls.download_with_checksum(
+            source, destination_dir, data, transfer_progress, None
+        )
+        return filepath
+
+    @classmethod
+    def download_with_checksum(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm,
+    ):
         source_url = source["url"]
         cls.log.debug(f"Downloading {source_url} to {destination_dir}")
         headers = source.get("headers")
         filename = cls.get_filename(source)
 
-        # TODO use transfer progress
-        RemoteFileHandler.download_url(
+        checksum = RemoteFileHandler.download_url(
             source_url,
             destination_dir,
             filename,
-            headers=headers
+            headers=headers,
+            progress=transfer_progress,
+            size=data.get("size"),
+            segments=cls.get_download_segments(data),
+            checksum_algorithm=checksum_algorithm,
         )
 
-        return os.path.join(destination_dir, filename)
+        return os.path.join(destination_dir, filename), checksum
+
+    @classmethod
+    def get_source_filename(cls, source):
+        return cls.get_filename(source)
+
+    @classmethod
+    def open_stream(cls, source, data, transfer_progress, checksum_algorithm):
+        source_url = source["url"]
+        # Google Drive requires confirmation before download
+        if RemoteFileHandler._get_google_drive_file_id(source_url):
+            return None
+        return RemoteFileHandler.open_stream(
+            source_url,
+            headers=source.get("headers"),
+            progress=transfer_progress,
+            checksum_algorithm=checksum_algorithm,
+        )
+
+    @classmethod
+    def open_range_file(cls, source, data, transfer_progress):
+        source_url = source["url"]
+        if RemoteFileHandler._get_google_drive_file_id(source_url):
+            return None
+        return RangeFile(
+            source_url,
+            headers=source.get("headers"),
+            progress=transfer_progress,
+        )
 
     @classmethod
     def cleanup(cls, source, destination_dir, data):
@@ -138,60 +309,122 @@ class AyonServerDownloader(SourceDownloader):
     """Downloads static resource file from AYON Server.
 
     Expects filled env var AYON_SERVER_URL.
+
+    Download does not use download functions from 'ayon_api' because they
+    always start from the first byte. The download url is calculated the
+    same way as in 'ayon_api' and file is downloaded with resume support.
     """
 
     CHUNK_SIZE = 8192
 
     @classmethod
-    def download(cls, source, destination_dir, data, transfer_progress):
+    def _get_download_url(cls, con, source, data, filename):
         path = source["path"]
-        filename = source["filename"]
-        if path and not filename:
-            filename = path.split("/")[-1]
-
-        cls.log.debug(f"Downloading {filename} to {destination_dir}")
-
         if path:
-            filepath = os.path.join(destination_dir, filename)
-            return ayon_api.download_file(
-                path,
-                filepath,
-                chunk_size=cls.CHUNK_SIZE,
-                progress=transfer_progress
-            )
+            base_url = con.get_base_url()
+            if path.startswith(base_url):
+                return path
+            return f"{con.get_rest_url()}/{path.strip('/')}"
 
-        # dst_filepath = os.path.join(destination_dir, filename)
+        rest_url = con.get_rest_url()
         if data["type"] == "dependency_package":
-            return ayon_api.download_dependency_package(
-                data["name"],
-                destination_dir,
-                filename,
-                chunk_size=cls.CHUNK_SIZE,
-                progress=transfer_progress
-            )
+            return f"{rest_url}/desktop/dependencyPackages/{data['name']}"
 
         if data["type"] == "addon":
-            return ayon_api.download_addon_private_file(
-                data["name"],
-                data["version"],
-                filename,
-                destination_dir,
-                chunk_size=cls.CHUNK_SIZE,
-                progress=transfer_progress
+            endpoint = con.get_addon_endpoint(
+                data["name"], data["version"], "private", filename
             )
+            return f"{con.get_base_url()}/{endpoint}"
 
         if data["type"] == "installer":
-            filepath = os.path.join(destination_dir, filename)
-            ayon_api.download_installer(
-                filename,
-                filepath,
-                chunk_size=cls.CHUNK_SIZE,
-                progress=transfer_progress
-            )
-            return filepath
+            return f"{rest_url}/desktop/installers/{filename}"
 
         raise ValueError(f"Unknown type to download \"{data['type']}\"")
 
+    @classmethod
+    def download(cls, source, destination_dir, data, transfer_progress):
+        filepath, _ = cls.download_with_checksum(
+            source, destination_dir, data, transfer_progress, None
+        )
+        return filepath
+
+    @classmethod
+    def get_source_filename(cls, source):
+        path = source["path"]
+        filename = source["filename"]
+        if path and not filename:
+            filename = path.split("/")[-1]
+        return filename
+
+    @classmethod
+    def _get_request_args(cls, con):
+        headers = con.get_headers()
+        headers.pop("Content-Type", None)
+        request_kwargs = {
+            "verify": con.get_ssl_verify(),
+            "cert": con.get_cert(),
+        }
+        return headers, request_kwargs
+
+    @classmethod
+    def open_stream(cls, source, data, transfer_progress, checksum_algorithm):
+        filename = cls.get_source_filename(source)
+        con = ayon_api.get_server_api_connection()
+        url = cls._get_download_url(con, source, data, filename)
+        headers, request_kwargs = cls._get_request_args(con)
+        return RemoteFileHandler.open_stream(
+            url,
+            headers=headers,
+            progress=transfer_progress,
+            request_kwargs=request_kwargs,
+            checksum_algorithm=checksum_algorithm,
+        )
+
+    @classmethod
+    def open_range_file(cls, source, data, transfer_progress):
+        filename = cls.get_source_filename(source)
+        con = ayon_api.get_server_api_connection()
+        url = cls._get_download_url(con, source, data, filename)
+        headers, request_kwargs = cls._get_request_args(con)
+        return RangeFile(
+            url,
+            headers=headers,
+            request_kwargs=request_kwargs,
+            progress=transfer_progress,
+        )
+
+    @classmethod
+    def download_with_checksum(
+        cls,
+        source,
+        destination_dir,
+        data,
+        transfer_progress,
+        checksum_algorithm,
+    ):
+        filename = cls.get_source_filename(source)
+
+        cls.log.debug(f"Downloading {filename} to {destination_dir}")
+
+        con = ayon_api.get_server_api_connection()
+        url = cls._get_download_url(con, source, data, filename)
+        # Filename can contain "subfolders"
+        filepath = os.path.join(destination_dir, filename)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        headers, request_kwargs = cls._get_request_args(con)
+        return RemoteFileHandler.download_file_with_checksum(
+            url,
+            filepath,
+            headers=headers,
+            chunk_size=cls.CHUNK_SIZE,
+            progress=transfer_progress,
+            request_kwargs=request_kwargs,
+            size=data.get("size"),
+            segments=cls.get_download_segments(data),
+            checksum_algorithm=checksum_algorithm,
+        )
+
     @classmethod
     def cleanup(cls, source, destination_dir, data):
         filename = source["filename"]
@@ -1,6 +1,13 @@
+import io
 import os
 import re
+import json
+import time
+import math
 import urllib
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 import urllib.request
 import urllib.error
@@ -9,6 +16,342 @@ import itertools
 import requests
 
 USER_AGENT = "AYON-launcher"
+# Suffixes of partially downloaded file and its resume information
+PART_SUFFIX = ".part"
+PART_INFO_SUFFIX = ".part.json"
+DEFAULT_TIMEOUT = (10, 60)
+# Files smaller than this are always downloaded using single stream
+SEGMENTED_DOWNLOAD_MIN_SIZE = 32 * 1024 * 1024
+# How many times a failed segment is retried before download fails
+SEGMENT_RETRIES = 3
+# Segment offsets are stored to resume information after each N bytes
+_SEGMENT_SAVE_INTERVAL = 4 * 1024 * 1024
+
+
+def _get_part_info_path(filepath):
+    return filepath + PART_INFO_SUFFIX
+
+
+def _read_part_info(filepath):
+    part_info_path = _get_part_info_path(filepath)
+    if not os.path.exists(part_info_path):
+        return None
+    try:
+        with open(part_info_path, "r") as stream:
+            return json.load(stream)
+    except (ValueError, OSError):
+        return None
+
+
+def _write_part_info(filepath, data):
+    part_info_path = _get_part_info_path(filepath)
+    tmp_path = part_info_path + ".tmp"
+    with open(tmp_path, "w") as stream:
+        json.dump(data, stream)
+    os.replace(tmp_path, part_info_path)
+
+
+def _create_hash_obj(checksum_algorithm):
+    if not checksum_algorithm:
+        return None
+    hash_func = getattr(hashlib, checksum_algorithm, None)
+    if hash_func is None:
+        return None
+    return hash_func()
+
+
+def remove_partial_download(filepath):
+    """Remove partially downloaded file and its resume information.
+
+    Args:
+        filepath (str): Path to file that was downloaded.
+    """
+
+    for path in (
+        filepath + PART_SUFFIX,
+        _get_part_info_path(filepath),
+    ):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class HashingStreamReader:
+    """Readable stream wrapper calculating checksum of read data.
+
+    Read data are also tracked in transfer progress if is passed.
+
+    Args:
+        stream (BinaryIO): Source stream.
+        checksum_algorithm (Optional[str]): Algorithm used to calculate
+            checksum.
+        progress (Optional[ayon_api.TransferProgress]): Object where
+            transfer progress is tracked.
+        on_close (Optional[Callable[[], None]]): Called when reader is
+            closed.
+    """
+
+    def __init__(
+        self, stream, checksum_algorithm=None, progress=None, on_close=None
+    ):
+        hash_obj = None
+        if checksum_algorithm:
+            hash_func = getattr(hashlib, checksum_algorithm, None)
+            if hash_func is None:
+                raise ValueError(
+                    f"Unknown checksum algorithm '{checksum_algorithm}'"
+                )
+            hash_obj = hash_func()
+        self._stream = stream
+        self._hash_obj = hash_obj
+        self._progress = progress
+        self._on_close = on_close
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        if data:
+            if self._hash_obj is not None:
+                self._hash_obj.update(data)
+            if self._progress is not None:
+                self._progress.add_transferred_chunk(len(data))
+        return data
+
+    def read_to_end(self, chunk_size=1024 * 1024):
+        """Read rest of stream, so checksum contains whole content."""
+
+        while self.read(chunk_size):
+            pass
+
+    def hexdigest(self):
+        """Checksum of data read so far.
+
+        Returns:
+            Union[str, None]: Checksum or None if algorithm was not set.
+        """
+
+        if self._hash_obj is None:
+            return None
+        return self._hash_obj.hexdigest()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._stream.close()
+        if self._on_close is not None:
+            self._on_close()
+
+
+class _SegmentsHasher:
+    """Calculate checksum of file downloaded in segments.
+
+    Contiguous downloaded part of file from its start is hashed while
+    segments are downloaded. Chunks written right at the end of hashed
+    part are hashed from memory, data already written by following
+    segments are read back from file when the hashed part reaches them.
+
+    Args:
+        filepath (str): Path to file where segments are written.
+        hash_obj (Any): Hash object from 'hashlib'.
+        segments_info (list[list[int]]): Segments as
+            '[start, end, offset]' sorted by start.
+        total_size (int): Size of the file.
+    """
+
+    def __init__(self, filepath, hash_obj, segments_info, total_size):
+        self._filepath = filepath
+        self._hash_obj = hash_obj
+        self._segments_info = segments_info
+        self._total_size = total_size
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def update(self, start, chunk):
+        """Hash chunk written to file at 'start' if follows hashed part."""
+
+        with self._lock:
+            if start == self._offset:
+                self._hash_obj.update(chunk)
+                self._offset += len(chunk)
+
+    def catch_up(self):
+        """Hash data written to file after hashed part."""
+
+        with self._lock:
+            end = self._total_size
+            for _, segment_end, offset in self._segments_info:
+                if offset <= segment_end:
+                    end = offset
+                    break
+
+            if end <= self._offset:
+                return
+            with open(self._filepath, "rb") as stream:
+                stream.seek(self._offset)
+                while self._offset < end:
+                    chunk = stream.read(min(1024 * 1024, end - self._offset))
+                    if not chunk:
+                        break
+                    self._hash_obj.update(chunk)
+                    self._offset += len(chunk)
+
+    def hexdigest(self):
+        """Checksum of the file.
+
+        Returns:
+            Union[str, None]: Checksum or None if file is not hashed
+                completely.
+        """
+
+        self.catch_up()
+        if self._offset != self._total_size:
+            return None
+        return self._hash_obj.hexdigest()
+
+
+class RangeFile(io.RawIOBase):
+    """Seekable read-only file on server read using range requests.
+
+    Allows to read only parts of remote file, e.g. to read content of
+    a zip archive directory and only some of its members. Data are fetched
+    in blocks of at least 'block_size' bytes.
+
+    Args:
+        url (str): Url of file.
+        headers (Optional[dict[str, str]]): Additional headers.
+        request_kwargs (Optional[dict[str, Any]]): Additional arguments
+            for requests (e.g. 'verify' or 'cert').
+        progress (Optional[ayon_api.TransferProgress]): Object where
+            transferred bytes are tracked.
+        block_size (Optional[int]): Minimum size of fetched block.
+
+    Raises:
+        IOError: Server does not support range requests.
+    """
+
+    def __init__(
+        self,
+        url,
+        headers=None,
+        request_kwargs=None,
+        progress=None,
+        block_size=256 * 1024,
+    ):
+        super().__init__()
+        final_headers = {
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": "identity",
+        }
+        if headers:
+            final_headers.update(headers)
+        request_kwargs = dict(request_kwargs or {})
+        request_kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+        self._url = url
+        self._headers = final_headers
+        self._request_kwargs = request_kwargs
+        self._progress = progress
+        self._block_size = block_size
+        self._session = requests.Session()
+        self._position = 0
+        self._buffer_start = 0
+        self._buffer = b""
+        self._validator = None
+        try:
+            self._size = self._fetch_size()
+        except Exception:
+            self._session.close()
+            raise
+
+    @property
+    def size(self):
+        return self._size
+
+    def _request_range(self, start, end):
+        headers = dict(self._headers)
+        headers["Range"] = f"bytes={start}-{end}"
+        if self._validator:
+            headers["If-Range"] = self._validator
+        response = self._session.get(
+            self._url, headers=headers, **self._request_kwargs
+        )
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise IOError(
+                f"Server does not support range requests of {self._url}."
+            )
+        return response
+
+    def _fetch_size(self):
+        response = self._request_range(0, 0)
+        total = (
+            response.headers.get("Content-Range") or ""
+        ).rpartition("/")[-1]
+        if not total.isdigit():
+            raise IOError(f"Unknown size of {self._url}.")
+        etag = response.headers.get("ETag")
+        if etag and etag.startswith("W/"):
+            etag = None
+        self._validator = etag or response.headers.get("Last-Modified")
+        return int(total)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        if offset < 0:
+            raise ValueError("Negative seek position")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._size - self._position)
+        if size <= 0:
+            return 0
+
+        buffer_offset = self._position - self._buffer_start
+        if not (
+            0 <= buffer_offset
+            and buffer_offset + size <= len(self._buffer)
+        ):
+            end = min(
+                self._position + max(size, self._block_size), self._size
+            ) - 1
+            response = self._request_range(self._position, end)
+            self._buffer = response.content
+            self._buffer_start = self._position
+            buffer_offset = 0
+            if self._progress is not None:
+                self._progress.add_transferred_chunk(len(self._buffer))
+
+        data = self._buffer[buffer_offset:buffer_offset + size]
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._session.close()
+        super().close()
 
 
 class RemoteFileHandler:
@@ -20,7 +363,11 @@ class RemoteFileHandler:
         root,
         filename=None,
         max_redirect_hops=3,
-        headers=None
+        headers=None,
+        progress=None,
+        size=None,
+        segments=None,
+        checksum_algorithm=None,
     ):
         """Download a file from url and place it in root.
 
@@ -33,6 +380,17 @@ class RemoteFileHandler:
                 hops allowed
             headers (Optional[dict[str, str]]): Additional required headers
                 - Authentication etc..
+            progress (Optional[ayon_api.TransferProgress]): Object where
+                download progress is tracked.
+            size (Optional[int]): Expected size of file, if is known.
+            segments (Optional[int]): Number of concurrent range requests
+                used to download big files.
+            checksum_algorithm (Optional[str]): Algorithm used to calculate
+                checksum of file while downloading.
+
+        Returns:
+            Union[str, None]: Checksum of downloaded file if it could be
+                calculated while downloading.
         """
 
         root = os.path.expanduser(root)
@@ -49,13 +407,22 @@ class RemoteFileHandler:
         # check if file is located on Google Drive
         file_id = RemoteFileHandler._get_google_drive_file_id(url)
         if file_id is not None:
-            return RemoteFileHandler.download_file_from_google_drive(
+            RemoteFileHandler.download_file_from_google_drive(
                 file_id, root, filename)
+            return None
 
         # download the file
         try:
             print(f"Downloading {url} to {fpath}")
-            RemoteFileHandler._urlretrieve(url, fpath, headers=headers)
+            return RemoteFileHandler._urlretrieve(
+                url,
+                fpath,
+                headers=headers,
+                progress=progress,
+                size=size,
+                segments=segments,
+                checksum_algorithm=checksum_algorithm,
+            )
         except (urllib.error.URLError, IOError) as exc:
             if url[:5] != "https":
                 raise exc
@@ -65,7 +432,15 @@ class RemoteFileHandler:
                 "Failed download. Trying https -> http instead."
                 f" Downloading {url} to {fpath}"
             ))
-            RemoteFileHandler._urlretrieve(url, fpath, headers=headers)
+            return RemoteFileHandler._urlretrieve(
+                url,
+                fpath,
+                headers=headers,
+                progress=progress,
+                size=size,
+                segments=segments,
+                checksum_algorithm=checksum_algorithm,
+            )
 
     @staticmethod
     def download_file_from_google_drive(file_id, root, filename=None):
@@ -121,20 +496,572 @@ class RemoteFileHandler:
         response.close()
 
     @staticmethod
-    def _urlretrieve(url, filename, chunk_size=None, headers=None):
-        final_headers = {"User-Agent": USER_AGENT}
+    def download_file(
+        url,
+        filepath,
+        headers=None,
+        chunk_size=None,
+        progress=None,
+        request_kwargs=None,
+        size=None,
+        segments=None,
+    ):
+        """Download file from url with support of resume.
+
+        Content is downloaded to '<filepath>.part' and information needed to
+        resume the download is stored next to it to '<filepath>.part.json'
+        (url, 'ETag' or 'Last-Modified' and expected size). Size of the
+        partial file is used as resume offset.
+
+        When partial file from previous attempt exists, even from a different
+        process, the download continues using 'Range' request. 'If-Range'
+        header makes sure that server sends whole file if it has changed
+        in the meantime. The partial file is renamed to 'filepath' when
+        download finishes.
+
+        Big files can be downloaded using multiple concurrent range
+        requests when 'segments' is higher than '1', see
+        '_download_segmented' for more information.
+
+        Args:
+            url (str): Url to download file from.
+            filepath (str): Path where file should be downloaded.
+            headers (Optional[dict[str, str]]): Additional headers.
+            chunk_size (Optional[int]): Size of chunks read from response.
+            progress (Optional[ayon_api.TransferProgress]): Object where
+                download progress is tracked.
+            request_kwargs (Optional[dict[str, Any]]): Additional arguments
+                for 'requests.get' (e.g. 'verify' or 'cert').
+            size (Optional[int]): Expected size of file, if is known.
+            segments (Optional[int]): Number of concurrent range requests
+                used to download big files.
+
+        Returns:
+            str: Path to downloaded file.
+        """
+
+        return RemoteFileHandler.download_file_with_checksum(
+            url,
+            filepath,
+            headers=headers,
+            chunk_size=chunk_size,
+            progress=progress,
+            request_kwargs=request_kwargs,
+            size=size,
+            segments=segments,
+        )[0]
+
+    @staticmethod
+    def download_file_with_checksum(
+        url,
+        filepath,
+        headers=None,
+        chunk_size=None,
+        progress=None,
+        request_kwargs=None,
+        size=None,
+        segments=None,
+        checksum_algorithm=None,
+    ):
+        """Download file from url and calculate its checksum on the way.
+
+        Works the same way as 'download_file' but each received chunk is
+        also passed to a hash object, so the file does not have to be read
+        again to validate its checksum. When download is resumed only the
+        already downloaded part of file is read.
+
+        Args:
+            url (str): Url to download file from.
+            filepath (str): Path where file should be downloaded.
+            headers (Optional[dict[str, str]]): Additional headers.
+            chunk_size (Optional[int]): Size of chunks read from response.
+            progress (Optional[ayon_api.TransferProgress]): Object where
+                download progress is tracked.
+            request_kwargs (Optional[dict[str, Any]]): Additional arguments
+                for 'requests.get' (e.g. 'verify' or 'cert').
+            size (Optional[int]): Expected size of file, if is known.
+            segments (Optional[int]): Number of concurrent range requests
+                used to download big files.
+            checksum_algorithm (Optional[str]): Algorithm used to calculate
+                checksum ('md5', 'sha256', ...).
+
+        Returns:
+            tuple[str, Union[str, None]]: Path to downloaded file and its
+                checksum. Checksum is 'None' if algorithm was not passed
+                or is not available.
+        """
+
+        final_headers = {
+            "User-Agent": USER_AGENT,
+            # Offsets would not match if content would be encoded
+            "Accept-Encoding": "identity",
+        }
         if headers:
             final_headers.update(headers)
-
         chunk_size = chunk_size or 8192
-        with open(filename, "wb") as fh:
-            with urllib.request.urlopen(
-                urllib.request.Request(url, headers=final_headers)
-            ) as response:
-                for chunk in iter(lambda: response.read(chunk_size), ""):
+        request_kwargs = dict(request_kwargs or {})
+        request_kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+        if progress is not None:
+            progress.set_source_url(url)
+            progress.set_destination_url(filepath)
+            if not progress.get_started():
+                progress.set_started()
+
+        if segments and segments > 1:
+            result = RemoteFileHandler._download_segmented(
+                url,
+                filepath,
+                final_headers,
+                chunk_size,
+                progress,
+                request_kwargs,
+                size,
+                segments,
+                _create_hash_obj(checksum_algorithm),
+            )
+            if result is not None:
+                return result
+
+        part_path = filepath + PART_SUFFIX
+        part_info = _read_part_info(filepath)
+        offset = 0
+        validator = None
+        if (
+            part_info
+            and part_info.get("url") == url
+            and os.path.isfile(part_path)
+        ):
+            offset = os.path.getsize(part_path)
+            validator = part_info.get("etag") or part_info.get("last_modified")
+
+        if offset and validator:
+            final_headers["Range"] = f"bytes={offset}-"
+            final_headers["If-Range"] = validator
+        else:
+            offset = 0
+
+        with requests.get(
+            url, headers=final_headers, stream=True, **request_kwargs
+        ) as response:
+            if offset and response.status_code == 416:
+                # Partial file can't be used anymore, start from scratch
+                response.close()
+                remove_partial_download(filepath)
+                return RemoteFileHandler.download_file_with_checksum(
+                    url, filepath, headers, chunk_size, progress,
+                    request_kwargs, size, segments, checksum_algorithm
+                )
+
+            response.raise_for_status()
+            # Server sent whole content
+            if response.status_code != 206:
+                offset = 0
+
+            response_size = None
+            content_length = response.headers.get("Content-Length")
+            if content_length:
+                response_size = offset + int(content_length)
+
+            etag = response.headers.get("ETag")
+            # Weak validators cannot be used in 'If-Range' header
+            if etag and etag.startswith("W/"):
+                etag = None
+            _write_part_info(filepath, {
+                "url": url,
+                "etag": etag,
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": response_size,
+            })
+
+            # Size expected by caller has priority over server response
+            expected_size = size if size is not None else response_size
+            if progress is not None:
+                if (
+                    expected_size is not None
+                    and progress.get_content_size() is None
+                ):
+                    progress.set_content_size(expected_size)
+                progress.set_transferred_size(offset)
+
+            hash_obj = _create_hash_obj(checksum_algorithm)
+            if offset:
+                print(f"Resuming download of {url} from byte {offset}")
+                if hash_obj is not None:
+                    with open(part_path, "rb") as stream:
+                        for chunk in iter(
+                            lambda: stream.read(1024 * 1024), b""
+                        ):
+                            hash_obj.update(chunk)
+
+            with open(part_path, "ab" if offset else "wb") as stream:
+                for chunk in response.iter_content(chunk_size):
                     if not chunk:
-                        break
-                    fh.write(chunk)
+                        continue
+                    stream.write(chunk)
+                    if hash_obj is not None:
+                        hash_obj.update(chunk)
+                    if progress is not None:
+                        progress.add_transferred_chunk(len(chunk))
+
+        if (
+            expected_size is not None
+            and os.path.getsize(part_path) != expected_size
+        ):
+            raise IOError(
+                f"Download of {url} is incomplete."
+                f" Expected {expected_size} bytes."
+            )
+
+        os.replace(part_path, filepath)
+        remove_partial_download(filepath)
+        if progress is not None and not progress.get_transfer_done():
+            progress.set_transfer_done()
+        checksum = None
+        if hash_obj is not None:
+            checksum = hash_obj.hexdigest()
+        return filepath, checksum
+
+    @staticmethod
+    def open_stream(
+        url,
+        headers=None,
+        progress=None,
+        request_kwargs=None,
+        checksum_algorithm=None,
+    ):
+        """Open url content as readable stream.
+
+        Used to process content while it is being downloaded, e.g. to
+        extract archive without storing it to disk.
+
+        Args:
+            url (str): Url to download content from.
+            headers (Optional[dict[str, str]]): Additional headers.
+            progress (Optional[ayon_api.TransferProgress]): Object where
+                download progress is tracked.
+            request_kwargs (Optional[dict[str, Any]]): Additional arguments
+                for 'requests.get' (e.g. 'verify' or 'cert').
+            checksum_algorithm (Optional[str]): Algorithm used to calculate
+                checksum of content.
+
+        Returns:
+            HashingStreamReader: Stream with content.
+        """
+
+        final_headers = {
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": "identity",
+        }
+        if headers:
+            final_headers.update(headers)
+        request_kwargs = dict(request_kwargs or {})
+        request_kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+
+        response = requests.get(
+            url, headers=final_headers, stream=True, **request_kwargs
+        )
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+
+        if progress is not None:
+            progress.set_source_url(url)
+            if not progress.get_started():
+                progress.set_started()
+            content_length = response.headers.get("Content-Length")
+            if content_length and progress.get_content_size() is None:
+                progress.set_content_size(int(content_length))
+
+        response.raw.decode_content = True
+        return HashingStreamReader(
+            response.raw,
+            checksum_algorithm,
+            progress,
+            on_close=response.close,
+        )
+
+    @staticmethod
+    def _download_segmented(
+        url,
+        filepath,
+        headers,
+        chunk_size,
+        progress,
+        request_kwargs,
+        size,
+        segments,
+        hash_obj=None,
+    ):
+        """Download file using multiple concurrent range requests.
+
+        File is split into byte ranges which are downloaded at the same time
+        directly into preallocated '<filepath>.part' file, so no assembling
+        copy is needed at the end. Each segment is retried on its own from
+        the last written byte. Offsets of segments are stored to resume
+        information, so an interrupted download continues where each
+        segment stopped.
+
+        Checksum is calculated from contiguous downloaded part of file
+        during download, only data downloaded before the part reached them
+        are read back from file.
+
+        Returns:
+            Union[tuple[str, Union[str, None]], None]: Path to downloaded
+                file and its checksum, or None if file should be downloaded
+                using single stream (file is too small, server does not
+                support ranges or a single stream download was already
+                started).
+        """
+
+        if size is not None and size < SEGMENTED_DOWNLOAD_MIN_SIZE:
+            return None
+
+        part_path = filepath + PART_SUFFIX
+        part_info = _read_part_info(filepath)
+        if part_info and part_info.get("url") == url:
+            if not part_info.get("segments"):
+                # Continue with single stream download
+                if os.path.isfile(part_path):
+                    return None
+                part_info = None
+            elif (
+                not os.path.isfile(part_path)
+                or os.path.getsize(part_path) != part_info["size"]
+            ):
+                part_info = None
+        else:
+            part_info = None
+
+        if part_info is None:
+            part_info = RemoteFileHandler._prepare_segments(
+                url, headers, request_kwargs, size, segments
+            )
+            if part_info is None:
+                return None
+            remove_partial_download(filepath)
+            # Preallocate the file
+            with open(part_path, "wb") as stream:
+                stream.truncate(part_info["size"])
+            _write_part_info(filepath, part_info)
+        else:
+            print(f"Resuming segmented download of {url}")
+
+        total_size = part_info["size"]
+        segments_info = part_info["segments"]
+        validator = part_info["etag"] or part_info["last_modified"]
+        if progress is not None:
+            if progress.get_content_size() is None:
+                progress.set_content_size(total_size)
+            progress.set_transferred_size(sum(
+                offset - start
+                for start, _, offset in segments_info
+            ))
+
+        hasher = None
+        if hash_obj is not None:
+            hasher = _SegmentsHasher(
+                part_path, hash_obj, segments_info, total_size
+            )
+            # Hash data downloaded before download was resumed
+            hasher.catch_up()
+
+        lock = threading.Lock()
+        with ThreadPoolExecutor(
+            max_workers=len(segments_info),
+            thread_name_prefix="AYONDownload",
+        ) as executor:
+            futures = [
+                executor.submit(
+                    RemoteFileHandler._download_segment,
+                    url,
+                    filepath,
+                    headers,
+                    validator,
+                    chunk_size,
+                    progress,
+                    request_kwargs,
+                    part_info,
+                    segment,
+                    lock,
+                    hasher,
+                )
+                for segment in segments_info
+                if segment[2] <= segment[1]
+            ]
+        with lock:
+            _write_part_info(filepath, part_info)
+
+        for future in futures:
+            try:
+                future.result()
+            except RuntimeError:
+                # Downloaded segments are not valid anymore
+                remove_partial_download(filepath)
+                raise
+
+        checksum = None
+        if hasher is not None:
+            checksum = hasher.hexdigest()
+        os.replace(part_path, filepath)
+        remove_partial_download(filepath)
+        if progress is not None and not progress.get_transfer_done():
+            progress.set_transfer_done()
+        return filepath, checksum
+
+    @staticmethod
+    def _prepare_segments(url, headers, request_kwargs, size, segments):
+        """Find out if server supports ranges and split file to segments.
+
+        Returns:
+            Union[dict[str, Any], None]: Resume information with segments
+                or None if segmented download is not possible.
+        """
+
+        probe_headers = dict(headers)
+        probe_headers["Range"] = "bytes=0-0"
+        with requests.get(
+            url, headers=probe_headers, stream=True, **request_kwargs
+        ) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                return None
+            content_range = response.headers.get("Content-Range") or ""
+            total = content_range.rpartition("/")[-1]
+            if not total.isdigit():
+                return None
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        total_size = int(total)
+        if size is not None and size != total_size:
+            raise IOError(
+                f"Size of {url} is {total_size} bytes but {size} bytes"
+                " were expected."
+            )
+        if total_size < SEGMENTED_DOWNLOAD_MIN_SIZE:
+            return None
+
+        if etag and etag.startswith("W/"):
+            etag = None
+
+        segment_size = math.ceil(total_size / segments)
+        # Segments are stored as list of '[start, end, offset]' where
+        #   'end' is inclusive and 'offset' is next byte to download
+        segments_info = [
+            [start, min(start + segment_size, total_size) - 1, start]
+            for start in range(0, total_size, segment_size)
+        ]
+        return {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": total_size,
+            "segments": segments_info,
+        }
+
+    @staticmethod
+    def _download_segment(
+        url,
+        filepath,
+        headers,
+        validator,
+        chunk_size,
+        progress,
+        request_kwargs,
+        part_info,
+        segment,
+        lock,
+        hasher=None,
+    ):
+        part_path = filepath + PART_SUFFIX
+        end = segment[1]
+        attempt = 0
+        while segment[2] <= end:
+            segment_headers = dict(headers)
+            segment_headers["Range"] = f"bytes={segment[2]}-{end}"
+            if validator:
+                segment_headers["If-Range"] = validator
+            unsaved_size = 0
+            try:
+                with requests.get(
+                    url, headers=segment_headers, stream=True,
+                    **request_kwargs
+                ) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        # File changed on server, segments can't be used
+                        raise RuntimeError(
+                            f"Server did not respond with range of {url}."
+                        )
+
+                    # Unbuffered, so stored offsets match written data
+                    with open(part_path, "r+b", buffering=0) as stream:
+                        stream.seek(segment[2])
+                        for chunk in response.iter_content(chunk_size):
+                            if not chunk:
+                                continue
+                            # Ignore data over segment end
+                            chunk = chunk[:end + 1 - segment[2]]
+                            stream.write(chunk)
+                            chunk_len = len(chunk)
+                            unsaved_size += chunk_len
+                            if hasher is not None:
+                                hasher.update(segment[2], chunk)
+                            with lock:
+                                segment[2] += chunk_len
+                                if progress is not None:
+                                    progress.add_transferred_chunk(chunk_len)
+                                if unsaved_size >= _SEGMENT_SAVE_INTERVAL:
+                                    _write_part_info(filepath, part_info)
+                                    unsaved_size = 0
+                            if segment[2] > end:
+                                break
+
+                # Response ended before segment end, e.g. server closed
+                #   connection without error
+                if segment[2] <= end:
+                    raise IOError(
+                        f"Response of bytes {segment[2]}-{end} of {url}"
+                        " ended prematurely."
+                    )
+                # Hash data of following segments downloaded meanwhile
+                if hasher is not None:
+                    hasher.catch_up()
+
+            except (requests.RequestException, OSError):
+                attempt += 1
+                if attempt > SEGMENT_RETRIES:
+                    raise
+                print((
+                    f"Download of bytes {segment[2]}-{end} of {url} failed."
+                    f" Retrying ({attempt}/{SEGMENT_RETRIES})."
+                ))
+                time.sleep(attempt)
+
+    @staticmethod
+    def _urlretrieve(
+        url,
+        filename,
+        chunk_size=None,
+        headers=None,
+        progress=None,
+        size=None,
+        segments=None,
+        checksum_algorithm=None,
+    ):
+        return RemoteFileHandler.download_file_with_checksum(
+            url,
+            filename,
+            headers=headers,
+            chunk_size=chunk_size,
+            progress=progress,
+            size=size,
+            segments=segments,
+            checksum_algorithm=checksum_algorithm,
+        )[1]
 
     @staticmethod
     def _get_redirect_url(url, max_hops, headers=None):
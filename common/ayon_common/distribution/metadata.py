@@ -0,0 +1,267 @@
+"""Store of metadata about distributed addons and dependency packages.
+
+Metadata are stored in SQLite database in WAL mode, so many launcher
+processes can read and update them at the same time without losing
+each other's changes. Each item is stored under a key of name and version.
+
+Content of JSON files used by older versions of AYON launcher is imported
+automatically, and again whenever the JSON file is changed (by an older
+launcher). All metadata are written back to the JSON file after each
+update, so older launchers on the same machine see distributed items.
+"""
+import os
+import json
+import uuid
+import sqlite3
+import logging
+import contextlib
+
+# How long to wait for a lock held by other process in seconds
+DB_TIMEOUT = 30
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS items ("
+    " name TEXT NOT NULL,"
+    " version TEXT NOT NULL,"
+    " data TEXT NOT NULL,"
+    " PRIMARY KEY (name, version)"
+    ")",
+    "CREATE TABLE IF NOT EXISTS info ("
+    " key TEXT PRIMARY KEY,"
+    " value TEXT"
+    ")",
+)
+
+
+class MetadataStore:
+    """Transactional store of distribution metadata.
+
+    Connection is opened for each operation, so a store object can be used
+    from multiple threads.
+
+    Args:
+        db_path (str): Path to database file.
+        json_path (Optional[str]): Path to legacy JSON metadata file which
+            should be imported and kept up to date.
+        json_has_versions (Optional[bool]): Legacy JSON file has values
+            stored by name and version. Values are stored only by name
+            otherwise (dependency packages).
+    """
+
+    def __init__(self, db_path, json_path=None, json_has_versions=True):
+        self._db_path = db_path
+        self._json_path = json_path
+        self._json_has_versions = json_has_versions
+        self._initialized = False
+        self._log = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def db_path(self):
+        return self._db_path
+
+    def _create_connection(self):
+        os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
+        connection = sqlite3.connect(
+            self._db_path, timeout=DB_TIMEOUT, isolation_level=None
+        )
+        if not self._initialized:
+            # WAL is not available on some network filesystems, default
+            #   journal mode is used in that case
+            connection.execute("PRAGMA journal_mode=WAL")
+            for query in _SCHEMA:
+                connection.execute(query)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextlib.contextmanager
+    def _connect(self):
+        connection = self._create_connection()
+        try:
+            if not self._initialized:
+                self._import_json(connection)
+                self._initialized = True
+            yield connection
+        finally:
+            connection.close()
+
+    @contextlib.contextmanager
+    def _transaction(self, connection):
+        # Acquire write lock at the start, so read-modify-write of other
+        #   process can't interleave
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _read_json(self):
+        try:
+            with open(self._json_path, "r") as stream:
+                data = json.load(stream)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        if not self._json_has_versions:
+            return {name: {"": value} for name, value in data.items()}
+        return {
+            name: versions
+            for name, versions in data.items()
+            if isinstance(versions, dict)
+        }
+
+    def _import_json(self, connection):
+        """Import legacy JSON file if it changed since last import."""
+
+        if not self._json_path:
+            return
+        with self._transaction(connection):
+            self._import_changed_json(connection)
+
+    def _set_json_mtime(self, connection, mtime):
+        connection.execute(
+            "INSERT OR REPLACE INTO info (key, value)"
+            " VALUES ('json_mtime', ?)",
+            (mtime, )
+        )
+
+    def _import_changed_json(self, connection):
+        try:
+            mtime = str(os.path.getmtime(self._json_path))
+        except OSError:
+            return
+
+        row = connection.execute(
+            "SELECT value FROM info WHERE key = 'json_mtime'"
+        ).fetchone()
+        if row is not None and row[0] == mtime:
+            return
+
+        data = self._read_json()
+        if data:
+            self._log.debug(f"Importing metadata from {self._json_path}")
+            self._write_items(connection, data)
+        self._set_json_mtime(connection, mtime)
+
+    def _export_json(self, connection):
+        """Write all metadata to legacy JSON file for older launchers.
+
+        Failed write is only logged, metadata store is the source of truth.
+        """
+
+        output = {}
+        for name, version, data in connection.execute(
+            "SELECT name, version, data FROM items"
+        ):
+            output.setdefault(name, {})[version] = json.loads(data)
+        if not self._json_has_versions:
+            output = {
+                name: versions[""]
+                for name, versions in output.items()
+                if "" in versions
+            }
+
+        tmp_path = f"{self._json_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w") as stream:
+                json.dump(output, stream, indent=4)
+            os.replace(tmp_path, self._json_path)
+            mtime = str(os.path.getmtime(self._json_path))
+        except OSError:
+            self._log.warning(
+                f"Failed to write metadata to {self._json_path}",
+                exc_info=True
+            )
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        # Written file is not imported again
+        self._set_json_mtime(connection, mtime)
+
+    def _write_items(self, connection, items):
+        connection.executemany(
+            "INSERT OR REPLACE INTO items (name, version, data)"
+            " VALUES (?, ?, ?)",
+            [
+                (name, version, json.dumps(data))
+                for name, versions in items.items()
+                for version, data in versions.items()
+            ]
+        )
+
+    def get_item(self, name, version=""):
+        """Metadata of single item.
+
+        Args:
+            name (str): Name of item.
+            version (Optional[str]): Version of item.
+
+        Returns:
+            Union[dict[str, Any], None]: Metadata or None if item is not
+                stored.
+        """
+
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT data FROM items WHERE name = ? AND version = ?",
+                (name, version)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def get_versions(self, name):
+        """Metadata of all versions of item.
+
+        Args:
+            name (str): Name of item.
+
+        Returns:
+            dict[str, dict[str, Any]]: Metadata by version.
+        """
+
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT version, data FROM items WHERE name = ?",
+                (name, )
+            ).fetchall()
+        return {version: json.loads(data) for version, data in rows}
+
+    def get_all(self):
+        """Metadata of all items.
+
+        Returns:
+            dict[str, dict[str, dict[str, Any]]]: Metadata by name
+                and version.
+        """
+
+        output = {}
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT name, version, data FROM items"
+            ).fetchall()
+        for name, version, data in rows:
+            output.setdefault(name, {})[version] = json.loads(data)
+        return output
+
+    def update_items(self, items):
+        """Store metadata of items in single transaction.
+
+        Args:
+            items (dict[str, dict[str, dict[str, Any]]]): Metadata by name
+                and version.
+        """
+
+        if not items:
+            return
+        with self._connect() as connection:
+            with self._transaction(connection):
+                # Keep changes done by older launcher since last import
+                if self._json_path:
+                    self._import_changed_json(connection)
+                self._write_items(connection, items)
+                if self._json_path:
+                    self._export_json(connection)
@@ -0,0 +1,219 @@
+"""Benchmark of distribution throughput against local server stand-in.
+
+Synthetic addons and dependency package are served by 'LocalAyonServer'
+with selected network profiles and distributed to a temporary directory.
+End-to-end distribution time, download throughput and extraction rate
+are reported for each profile.
+
+Example:
+    python common/ayon_common/distribution/tests/benchmark_distribution.py
+        --profiles local wan --addons 10 --addon-size 5
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+_COMMON_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)))
+if __name__ == "__main__":
+    # Make 'ayon_common' importable when started as script
+    sys.path.insert(0, _COMMON_DIR)
+
+import ayon_api  # noqa: E402
+
+from ayon_common import tracing  # noqa: E402
+from ayon_common.distribution.control import (  # noqa: E402
+    AyonDistribution,
+    UpdateState,
+    fetch_bootstrap_catalog,
+)
+from ayon_common.distribution.archive_cache import ArchiveCache  # noqa: E402
+from ayon_common.distribution.tests.local_server import (  # noqa: E402
+    MB,
+    NETWORK_PROFILES,
+    LocalAyonServer,
+    create_synthetic_zip,
+)
+
+
+def _connect(server):
+    ayon_api.close_connection()
+    ayon_api.set_environments(server.url, "benchmark")
+    ayon_api.create_connection()
+
+
+def run_benchmark(
+    profile,
+    addons=10,
+    addon_files=50,
+    addon_size=2 * MB,
+    package_files=200,
+    package_size=20 * MB,
+    workers=4,
+):
+    """Distribute synthetic content from local server.
+
+    Args:
+        profile (NetworkProfile): Simulated network conditions.
+        addons (int): Number of addons.
+        addon_files (int): Number of files in each addon.
+        addon_size (int): Uncompressed size of each addon in bytes.
+        package_files (int): Number of files in dependency package.
+        package_size (int): Uncompressed size of dependency package in
+            bytes. Package is not distributed if is '0'.
+        workers (int): Number of distribution workers.
+
+    Returns:
+        dict[str, Any]: Benchmark results.
+    """
+
+    tmp_dir = tempfile.mkdtemp(prefix="ayon_benchmark_")
+    server = LocalAyonServer(profile)
+    uncompressed_size = 0
+    for idx in range(addons):
+        addon_name = f"addon_{idx}"
+        server.add_addon(
+            addon_name,
+            "1.0.0",
+            create_synthetic_zip(
+                addon_name, addon_files, addon_size // addon_files, idx
+            )
+        )
+        uncompressed_size += addon_size
+    if package_size:
+        server.add_dependency_package(
+            "benchmark_package.zip",
+            create_synthetic_zip(
+                "site-packages",
+                package_files,
+                package_size // package_files,
+                addons,
+            )
+        )
+        uncompressed_size += package_size
+
+    os.environ["AYON_TRACE"] = "1"
+    trace_start = time.perf_counter_ns() // 1000
+    try:
+        with server:
+            _connect(server)
+            start = time.perf_counter()
+            distribution = AyonDistribution(
+                addon_dirpath=os.path.join(tmp_dir, "addons"),
+                dependency_dirpath=os.path.join(tmp_dir, "dependencies"),
+                skip_installer_dist=True,
+                use_staging=False,
+                use_dev=False,
+                archive_cache=ArchiveCache(tmp_dir, 0),
+                catalog_cache=None,
+                **fetch_bootstrap_catalog(
+                    catalog_cache=None, include_installers=False
+                )
+            )
+            distribution.distribute(
+                threaded=workers > 1, max_workers=workers
+            )
+            duration = time.perf_counter() - start
+    finally:
+        os.environ.pop("AYON_TRACE", None)
+        ayon_api.close_connection()
+        ayon_api.set_environments(None, None)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    unzip_time = sum(
+        event["dur"]
+        for event in tracing.get_trace_events()
+        if event["ts"] >= trace_start and event["name"] == "unzip"
+    ) / 1000000
+    failed = [
+        item.item_label
+        for item in distribution.get_all_distribution_items()
+        if item.state != UpdateState.UPDATED
+    ]
+    return {
+        "profile": profile.name,
+        "duration": duration,
+        "served_bytes": server.served_bytes,
+        "requests": server.request_count,
+        "dropped_connections": server.dropped_connections,
+        "download_rate": server.served_bytes / duration,
+        "extracted_bytes": uncompressed_size,
+        "extract_time": unzip_time,
+        "extract_rate": (
+            uncompressed_size / unzip_time if unzip_time else None
+        ),
+        "failed": failed,
+    }
+
+
+def _format_result(result):
+    extract_rate = result["extract_rate"]
+    if extract_rate is None:
+        extract_text = "n/a"
+    else:
+        extract_text = f"{extract_rate / MB:.1f} MB/s"
+    return (
+        f"{result['profile']:<8}"
+        f" total {result['duration']:6.2f} s"
+        f" | download {result['download_rate'] / MB:7.1f} MB/s"
+        f" ({result['served_bytes'] / MB:.1f} MB,"
+        f" {result['requests']} requests,"
+        f" {result['dropped_connections']} dropped)"
+        f" | extract {extract_text}"
+        f" | failed {len(result['failed'])}"
+    )
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=list(NETWORK_PROFILES),
+        choices=list(NETWORK_PROFILES),
+        help="Network profiles to run.",
+    )
+    parser.add_argument("--addons", type=int, default=10)
+    parser.add_argument("--addon-files", type=int, default=50)
+    parser.add_argument(
+        "--addon-size", type=float, default=2, help="Addon size in MB."
+    )
+    parser.add_argument("--package-files", type=int, default=200)
+    parser.add_argument(
+        "--package-size",
+        type=float,
+        default=20,
+        help="Dependency package size in MB, '0' to skip the package.",
+    )
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--json", dest="json_path", help="Store results to JSON file."
+    )
+    parsed = parser.parse_args(args)
+
+    results = []
+    for profile_name in parsed.profiles:
+        result = run_benchmark(
+            NETWORK_PROFILES[profile_name],
+            addons=parsed.addons,
+            addon_files=parsed.addon_files,
+            addon_size=int(parsed.addon_size * MB),
+            package_files=parsed.package_files,
+            package_size=int(parsed.package_size * MB),
+            workers=parsed.workers,
+        )
+        print(_format_result(result))
+        results.append(result)
+
+    if parsed.json_path:
+        with open(parsed.json_path, "w") as stream:
+            json.dump(results, stream, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""Local stand-in of AYON server for distribution tests and benchmarks.
+
+Server mimics endpoints used by 'AyonDistribution' (catalog, addon and
+dependency package downloads with range requests) and serves synthetic
+addons and dependency packages. Network profile can add latency, cap
+bandwidth and drop connections in the middle of file responses.
+"""
+import io
+import json
+import time
+import random
+import hashlib
+import zipfile
+import platform
+import threading
+import http.server
+
+MB = 1024 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+
+class NetworkProfile:
+    """Network conditions simulated by server.
+
+    Args:
+        name (str): Profile name.
+        latency (Optional[float]): Delay of each response in seconds.
+        bandwidth (Optional[int]): Bandwidth of server in bytes per second
+            shared by all connections. Unlimited if not set.
+        drop_rate (Optional[float]): Probability that file response is
+            dropped in the middle.
+    """
+
+    def __init__(self, name, latency=0.0, bandwidth=None, drop_rate=0.0):
+        self.name = name
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.drop_rate = drop_rate
+
+    def __repr__(self):
+        return (
+            f"<NetworkProfile {self.name} latency={self.latency}"
+            f" bandwidth={self.bandwidth} drop_rate={self.drop_rate}>"
+        )
+
+
+NETWORK_PROFILES = {
+    profile.name: profile
+    for profile in (
+        NetworkProfile("local"),
+        NetworkProfile("lan", latency=0.001, bandwidth=100 * MB),
+        NetworkProfile("wan", latency=0.05, bandwidth=10 * MB),
+        NetworkProfile(
+            "flaky", latency=0.02, bandwidth=20 * MB, drop_rate=0.05
+        ),
+    )
+}
+
+
+def create_synthetic_zip(root_name, file_count, file_size, seed=0):
+    """Create zip archive with files of random content.
+
+    Half of each file is random and half is repeated, so content is
+    compressible similarly to real python code.
+
+    Args:
+        root_name (str): Name of root directory in archive.
+        file_count (int): Number of files.
+        file_size (int): Size of each file in bytes.
+        seed (Optional[int]): Seed of random content.
+
+    Returns:
+        bytes: Zip archive content.
+    """
+
+    rand = random.Random(seed)
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr(f"{root_name}/__init__.py", "")
+        for idx in range(file_count):
+            half = file_size // 2
+            content = rand.randbytes(half)
+            content += (b"#" * 64) * ((file_size - half) // 64 + 1)
+            zip_file.writestr(
+                f"{root_name}/package_{idx % 10}/module_{idx}.py",
+                content[:file_size]
+            )
+    return stream.getvalue()
+
+
+class _LocalServerHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_not_found(self):
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_file(self, content, etag):
+        server = self.server.ayon_server
+        start = 0
+        end = len(content) - 1
+        range_value = self.headers.get("Range")
+        if range_value:
+            start_str, end_str = range_value.split("=")[1].split("-")
+            start = int(start_str)
+            if end_str:
+                end = min(int(end_str), end)
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{end}/{len(content)}"
+            )
+        else:
+            self.send_response(200)
+        body = memoryview(content)[start:end + 1]
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        drop_at = None
+        if server.should_drop():
+            drop_at = len(body) // 2
+        sent = 0
+        while sent < len(body):
+            chunk = body[sent:sent + _CHUNK_SIZE]
+            if drop_at is not None and sent + len(chunk) > drop_at:
+                self.wfile.write(chunk[:drop_at - sent])
+                self.wfile.flush()
+                server.add_served_bytes(drop_at - sent)
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return
+            server.throttle(len(chunk))
+            self.wfile.write(chunk)
+            server.add_served_bytes(len(chunk))
+            sent += len(chunk)
+
+    def do_GET(self):
+        server = self.server.ayon_server
+        server.add_request(self.path)
+        if server.profile.latency:
+            time.sleep(server.profile.latency)
+
+        path = self.path
+        catalog = server.get_catalog_response(path)
+        if catalog is not None:
+            self._send_json(catalog)
+            return
+
+        file_info = server.get_file(path)
+        if file_info is None:
+            self._send_not_found()
+            return
+        self._send_file(*file_info)
+
+
+class LocalAyonServer:
+    """Local server with synthetic addons and dependency packages.
+
+    Args:
+        profile (Optional[NetworkProfile]): Simulated network conditions.
+        seed (Optional[int]): Seed for dropped connections.
+    """
+
+    def __init__(self, profile=None, seed=0):
+        if profile is None:
+            profile = NETWORK_PROFILES["local"]
+        self.profile = profile
+        self._rand = random.Random(seed)
+        self._lock = threading.Lock()
+        self._bandwidth_time = 0.0
+        self._files = {}
+        self._addons = {}
+        self._dependency_packages = []
+        self._server = None
+        self._thread = None
+
+        self.served_bytes = 0
+        self.request_count = 0
+        self._request_paths = []
+        self.dropped_connections = 0
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def add_addon(self, addon_name, version, content):
+        """Add addon version with client zip served by server.
+
+        Args:
+            addon_name (str): Addon name.
+            version (str): Addon version.
+            content (bytes): Content of client zip.
+        """
+
+        filename = f"{addon_name}-{version}.zip"
+        checksum = hashlib.sha256(content).hexdigest()
+        self._files[
+            f"/addons/{addon_name}/{version}/private/{filename}"
+        ] = (content, f'"{checksum}"')
+        addon = self._addons.setdefault(
+            addon_name, {"name": addon_name, "versions": {}}
+        )
+        addon["versions"][version] = {
+            "clientSourceInfo": [{"type": "server", "filename": filename}],
+            "checksum": checksum,
+            "checksumAlgorithm": "sha256",
+        }
+
+    def add_dependency_package(self, filename, content, platform_name=None):
+        """Add dependency package served by server.
+
+        Args:
+            filename (str): Package filename.
+            content (bytes): Package zip content.
+            platform_name (Optional[str]): Platform of package. Current
+                platform is used if not passed.
+        """
+
+        if platform_name is None:
+            platform_name = platform.system().lower()
+        checksum = hashlib.sha256(content).hexdigest()
+        self._files[f"/api/desktop/dependencyPackages/{filename}"] = (
+            content, f'"{checksum}"'
+        )
+        self._dependency_packages.append({
+            "filename": filename,
+            "platform": platform_name,
+            "checksum": checksum,
+            "checksumAlgorithm": "sha256",
+            "size": len(content),
+            "sources": [{"type": "server"}],
+            "sourceAddons": {},
+            "pythonModules": {},
+        })
+
+    def get_bundles(self):
+        addon_versions = {
+            addon_name: sorted(addon["versions"])[-1]
+            for addon_name, addon in self._addons.items()
+        }
+        dependency_packages = {
+            package["platform"]: package["filename"]
+            for package in self._dependency_packages
+        }
+        return {
+            "bundles": [{
+                "name": "BenchmarkBundle",
+                "installerVersion": None,
+                "addons": addon_versions,
+                "dependencyPackages": dependency_packages,
+                "isProduction": True,
+                "isStaging": False,
+            }],
+            "productionBundle": "BenchmarkBundle",
+            "stagingBundle": None,
+        }
+
+    def get_catalog_response(self, path):
+        responses = {
+            "/": {},
+            "/api/info": {},
+            "/api/users/me": {"name": "admin"},
+            "/api/bundles": self.get_bundles,
+            "/api/addons?details=1": lambda: {
+                "addons": list(self._addons.values())
+            },
+            "/api/desktop/dependencyPackages": lambda: {
+                "packages": self._dependency_packages
+            },
+            "/api/desktop/installers": {"installers": []},
+        }
+        response = responses.get(path)
+        if callable(response):
+            response = response()
+        return response
+
+    def get_file(self, path):
+        if path.startswith("/api/addons/"):
+            path = path[len("/api"):]
+        return self._files.get(path)
+
+    def add_request(self, path):
+        with self._lock:
+            self.request_count += 1
+            self._request_paths.append(path)
+
+    def get_request_paths(self):
+        """Paths of received requests in order they were received."""
+
+        with self._lock:
+            return list(self._request_paths)
+
+    def add_served_bytes(self, size):
+        with self._lock:
+            self.served_bytes += size
+
+    def should_drop(self):
+        if not self.profile.drop_rate:
+            return False
+        with self._lock:
+            dropped = self._rand.random() < self.profile.drop_rate
+            if dropped:
+                self.dropped_connections += 1
+        return dropped
+
+    def throttle(self, size):
+        """Wait until bandwidth allows to send data of size."""
+
+        bandwidth = self.profile.bandwidth
+        if not bandwidth:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._bandwidth_time)
+            self._bandwidth_time = start + size / bandwidth
+            end = self._bandwidth_time
+        delay = end - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def start(self):
+        server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), _LocalServerHandler
+        )
+        server.daemon_threads = True
+        server.ayon_server = self
+        self._server = server
+        self._thread = threading.Thread(
+            target=server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
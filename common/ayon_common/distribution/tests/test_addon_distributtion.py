@@ -1,19 +1,52 @@
+import io
+import os
+import sys
+import json
+import collections
 import copy
+import hashlib
 import tempfile
+import tarfile
+import shutil
+import time
+import zipfile
+import threading
+import http.server
 
 import attr
 import pytest
+import ayon_api
 
-from common.ayon_common.distribution.downloaders import (
+from ayon_common import tracing
+from ayon_common.distribution.downloaders import (
     DownloadFactory,
     OSDownloader,
     HTTPDownloader,
 )
-from common.ayon_common.distribution.control import (
+from ayon_common.distribution.control import (
     AyonDistribution,
+    DistributionItem,
     UpdateState,
+    fetch_bootstrap_catalog,
 )
-from common.ayon_common.distribution.data_structures import (
+from ayon_common.distribution.archive_cache import ArchiveCache
+from ayon_common.distribution import file_handler
+from ayon_common.distribution import utils as distribution_utils
+from ayon_common.distribution.utils import create_progress_report
+from ayon_common.distribution.metadata import MetadataStore
+from ayon_common.distribution.catalog_cache import (
+    CatalogCache,
+    get_cached_addon_settings,
+)
+from ayon_common.distribution.dedup import (
+    ObjectStore,
+    dedupe_storage,
+)
+from ayon_common.utils import (
+    extract_archive_file,
+    extract_archive_stream,
+)
+from ayon_common.distribution.data_structures import (
     AddonInfo,
     UrlType,
 )
@@ -33,11 +66,6 @@ def http_downloader(download_factory):
     yield download_factory.get_downloader(UrlType.HTTP.value)
 
 
-@pytest.fixture
-def temp_folder():
-    yield tempfile.mkdtemp(prefix="ayon_test_")
-
-
 @pytest.fixture
 def sample_bundles():
     yield {
@@ -239,3 +267,914 @@ def test_update_addon_state(
     )
     assert slack_dist_item.state == UpdateState.UPDATED, (
         "Addon should already exist")
+
+
+def _create_addon_zip(dirpath, addon_name):
+    zip_path = os.path.join(dirpath, f"{addon_name}.zip")
+    with zipfile.ZipFile(zip_path, "w") as zip_file:
+        zip_file.writestr(f"{addon_name}/__init__.py", "")
+        zip_file.writestr(f"{addon_name}/version.py", "__version__ = '1.0.0'")
+    with open(zip_path, "rb") as stream:
+        checksum = hashlib.sha256(stream.read()).hexdigest()
+    return zip_path, checksum
+
+
+def _prepare_local_addons(sources_dir, count):
+    addons_info = []
+    addon_versions = {}
+    for idx in range(count):
+        addon_name = f"addon_{idx}"
+        zip_path, checksum = _create_addon_zip(sources_dir, addon_name)
+        addon_versions[addon_name] = "1.0.0"
+        addons_info.append({
+            "name": addon_name,
+            "versions": {
+                "1.0.0": {
+                    "clientSourceInfo": [{
+                        "type": "filesystem",
+                        "path": {
+                            "windows": zip_path,
+                            "linux": zip_path,
+                            "darwin": zip_path,
+                        }
+                    }],
+                    "hash": checksum,
+                }
+            }
+        })
+
+    bundles_info = {
+        "bundles": [{
+            "name": "TestBundle",
+            "installerVersion": None,
+            "addons": addon_versions,
+            "dependencyPackages": {},
+            "isProduction": True,
+            "isStaging": False,
+        }],
+        "productionBundle": "TestBundle",
+        "stagingBundle": None,
+    }
+    return addons_info, bundles_info
+
+
+def _create_local_distribution(
+    addons_dir, download_factory, addons_info, bundles_info, cache_dir
+):
+    return AyonDistribution(
+        addon_dirpath=addons_dir,
+        dependency_dirpath=addons_dir,
+        dist_factory=download_factory,
+        addons_info=addons_info,
+        dependency_packages_info=[],
+        bundles_info=bundles_info,
+        use_staging=False,
+        use_dev=False,
+        skip_installer_dist=True,
+        archive_cache=ArchiveCache(cache_dir, 1024 * 1024 * 1024),
+    )
+
+
+def test_threaded_distribution(printer, temp_folder, download_factory):
+    """Tests that distribution in worker pool distributes all addons."""
+
+    sources_dir = tempfile.mkdtemp(prefix="ayon_test_sources_")
+    addons_info, bundles_info = _prepare_local_addons(sources_dir, 6)
+    distribution = _create_local_distribution(
+        os.path.join(temp_folder, "addons"),
+        download_factory,
+        addons_info,
+        bundles_info,
+        os.path.join(temp_folder, "cache"),
+    )
+    distribution.distribute(threaded=True, max_workers=3)
+    distribution.validate_distribution()
+    for item in distribution.get_addon_dist_items():
+        addon_name = item["addon_name"]
+        assert os.path.exists(os.path.join(
+            temp_folder,
+            "addons",
+            f"{addon_name}_1.0.0",
+            addon_name,
+            "version.py"
+        )), f"Addon '{addon_name}' was not extracted"
+
+
+def test_archive_cache_distribution(printer, temp_folder, download_factory):
+    """Tests that archives are distributed from cache without sources."""
+
+    sources_dir = tempfile.mkdtemp(prefix="ayon_test_sources_")
+    addons_info, bundles_info = _prepare_local_addons(sources_dir, 2)
+    cache_dir = os.path.join(temp_folder, "cache")
+    for subdir in ("addons_1", "addons_2"):
+        distribution = _create_local_distribution(
+            os.path.join(temp_folder, subdir),
+            download_factory,
+            addons_info,
+            bundles_info,
+            cache_dir,
+        )
+        distribution.distribute()
+        distribution.validate_distribution()
+        # Remove source files, second distribution must use cache
+        for filename in os.listdir(sources_dir):
+            os.remove(os.path.join(sources_dir, filename))
+
+
+class _RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves 'content' of server with support of range requests.
+
+    Connection is dropped in the middle of response for each range start
+    listed in 'fail_offsets' of server (only once). Range responses are
+    shortened to half with matching 'Content-Length' if 'truncate_ranges'
+    of server is set.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        content = self.server.content
+        self.server.requested_ranges.append(self.headers.get("Range"))
+        if self.server.not_modified_responses:
+            self.server.not_modified_responses -= 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        if self.headers.get("If-None-Match") == '"content"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        end = len(content) - 1
+        range_value = self.headers.get("Range")
+        if range_value:
+            start_str, end_str = range_value.split("=")[1].split("-")
+            start = int(start_str)
+            if end_str:
+                end = int(end_str)
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{end}/{len(content)}"
+            )
+        else:
+            self.send_response(200)
+        body = content[start:end + 1]
+        if range_value and self.server.truncate_ranges:
+            body = body[:len(body) // 2]
+        self.send_header("ETag", '"content"')
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.server.served_bytes += len(body)
+        if start in self.server.fail_offsets:
+            self.server.fail_offsets.remove(start)
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def range_server():
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), _RangeRequestHandler
+    )
+    server.content = os.urandom(1024 * 1024)
+    server.requested_ranges = []
+    server.fail_offsets = set()
+    server.truncate_ranges = False
+    # Count of responses 'Not Modified' sent to any request
+    server.not_modified_responses = 0
+    server.served_bytes = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_segmented_download(
+    printer, temp_folder, range_server, monkeypatch
+):
+    """Tests download of file using multiple range requests."""
+
+    monkeypatch.setattr(file_handler, "SEGMENTED_DOWNLOAD_MIN_SIZE", 1024)
+    content = range_server.content
+    segment_size = len(content) // 4
+    # Second segment fails once and must be retried
+    range_server.fail_offsets.add(segment_size)
+
+    url = f"http://127.0.0.1:{range_server.server_port}/package.zip"
+    filepath = os.path.join(temp_folder, "package.zip")
+    file_handler.RemoteFileHandler.download_file(
+        url, filepath, size=len(content), segments=4
+    )
+
+    with open(filepath, "rb") as stream:
+        assert stream.read() == content, "Downloaded content does not match"
+    assert not os.path.exists(filepath + file_handler.PART_SUFFIX)
+    assert not os.path.exists(filepath + file_handler.PART_INFO_SUFFIX)
+    requested_starts = [
+        int(value.split("=")[1].split("-")[0])
+        for value in range_server.requested_ranges
+        if value != "bytes=0-0"
+    ]
+    for idx in range(4):
+        assert segment_size * idx in requested_starts, (
+            "File was not downloaded in segments"
+        )
+    # Failed segment continued from already downloaded bytes
+    assert any(
+        segment_size < start < segment_size * 2
+        for start in requested_starts
+    ), "Failed segment was not resumed"
+
+
+def test_segmented_download_truncated_response(
+    printer, temp_folder, range_server, monkeypatch
+):
+    """Tests that short range responses are retried limited times."""
+
+    monkeypatch.setattr(file_handler, "SEGMENTED_DOWNLOAD_MIN_SIZE", 1024)
+    monkeypatch.setattr(file_handler, "SEGMENT_RETRIES", 2)
+    monkeypatch.setattr(file_handler.time, "sleep", lambda _: None)
+    range_server.truncate_ranges = True
+
+    url = f"http://127.0.0.1:{range_server.server_port}/package.zip"
+    filepath = os.path.join(temp_folder, "package.zip")
+    with pytest.raises(IOError):
+        file_handler.RemoteFileHandler.download_file(
+            url, filepath, size=len(range_server.content), segments=2
+        )
+    # Initial request and retries of each segment
+    assert len(range_server.requested_ranges) <= 1 + 2 * 3
+
+
+def test_download_with_checksum(printer, temp_folder, range_server):
+    """Tests checksum calculated during interrupted and resumed download."""
+
+    content = range_server.content
+    # First response is interrupted in the middle
+    range_server.fail_offsets.add(0)
+    url = f"http://127.0.0.1:{range_server.server_port}/addon.zip"
+    filepath = os.path.join(temp_folder, "addon.zip")
+    handler = file_handler.RemoteFileHandler
+    with pytest.raises(Exception):
+        handler.download_file_with_checksum(
+            url, filepath, checksum_algorithm="sha256"
+        )
+    assert os.path.exists(filepath + file_handler.PART_SUFFIX)
+
+    _, checksum = handler.download_file_with_checksum(
+        url, filepath, checksum_algorithm="sha256"
+    )
+    assert range_server.requested_ranges[-1] is not None, (
+        "Download was not resumed"
+    )
+    assert checksum == hashlib.sha256(content).hexdigest()
+
+    # Size expected by caller is validated instead of server response
+    with pytest.raises(IOError):
+        handler.download_file_with_checksum(
+            url,
+            os.path.join(temp_folder, "other.zip"),
+            size=len(content) + 1,
+        )
+
+
+def test_segmented_download_with_checksum(
+    printer, temp_folder, range_server, monkeypatch
+):
+    """Tests checksum calculated during resumed segmented download."""
+
+    monkeypatch.setattr(file_handler, "SEGMENTED_DOWNLOAD_MIN_SIZE", 1024)
+    monkeypatch.setattr(file_handler, "SEGMENT_RETRIES", 0)
+    content = range_server.content
+    # Third segment fails and download is resumed by next call
+    range_server.fail_offsets.add((len(content) // 4) * 2)
+    url = f"http://127.0.0.1:{range_server.server_port}/package.zip"
+    filepath = os.path.join(temp_folder, "package.zip")
+    handler = file_handler.RemoteFileHandler
+    with pytest.raises(Exception):
+        handler.download_file_with_checksum(
+            url, filepath, segments=4, checksum_algorithm="sha256"
+        )
+    assert os.path.exists(filepath + file_handler.PART_SUFFIX)
+
+    read_sizes = []
+    catch_up = file_handler._SegmentsHasher.catch_up
+
+    def _catch_up(hasher):
+        offset = hasher._offset
+        catch_up(hasher)
+        read_sizes.append(hasher._offset - offset)
+
+    monkeypatch.setattr(file_handler._SegmentsHasher, "catch_up", _catch_up)
+    _, checksum = handler.download_file_with_checksum(
+        url, filepath, segments=4, checksum_algorithm="sha256"
+    )
+    assert checksum == hashlib.sha256(content).hexdigest()
+    # Only data downloaded out of order are read back from file
+    assert sum(read_sizes) < len(content)
+
+
+def _create_addon_tar(addon_name):
+    stream = io.BytesIO()
+    with tarfile.open(fileobj=stream, mode="w:gz") as tar_file:
+        for filename, content in (
+            ("__init__.py", b""),
+            ("version.py", b"__version__ = '1.0.0'"),
+        ):
+            info = tarfile.TarInfo(f"{addon_name}/{filename}")
+            info.size = len(content)
+            tar_file.addfile(info, io.BytesIO(content))
+    return stream.getvalue()
+
+
+@pytest.mark.parametrize("valid_checksum", [True, False])
+def test_stream_extract_distribution(
+    printer,
+    temp_folder,
+    download_factory,
+    range_server,
+    monkeypatch,
+    valid_checksum,
+):
+    """Tests extraction of tar archive while it is downloaded."""
+
+    monkeypatch.setenv("AYON_DISTRIBUTION_STREAM_EXTRACT", "1")
+    addon_name = "addon_0"
+    range_server.content = _create_addon_tar(addon_name)
+    checksum = hashlib.sha256(range_server.content).hexdigest()
+    if not valid_checksum:
+        checksum = hashlib.sha256(b"").hexdigest()
+
+    url = (
+        f"http://127.0.0.1:{range_server.server_port}/{addon_name}.tar.gz"
+    )
+    addons_info = [{
+        "name": addon_name,
+        "versions": {
+            "1.0.0": {
+                "clientSourceInfo": [{"type": "http", "url": url}],
+                "hash": checksum,
+            }
+        }
+    }]
+    _, bundles_info = _prepare_local_addons(temp_folder, 0)
+    bundles_info["bundles"][0]["addons"] = {addon_name: "1.0.0"}
+    addons_dir = os.path.join(temp_folder, "addons")
+    distribution = _create_local_distribution(
+        addons_dir,
+        download_factory,
+        addons_info,
+        bundles_info,
+        os.path.join(temp_folder, "cache"),
+    )
+    distribution.distribute()
+
+    addon_dir = os.path.join(addons_dir, f"{addon_name}_1.0.0")
+    version_path = os.path.join(addon_dir, addon_name, "version.py")
+    dist_item = distribution.get_addon_dist_items()[0]["dist_item"]
+    # Archive was not downloaded to disk
+    assert range_server.requested_ranges == [None]
+    assert not os.path.exists(os.path.join(addons_dir, ".staging"))
+    if valid_checksum:
+        assert dist_item.state == UpdateState.UPDATED
+        assert os.path.exists(version_path), "Addon was not extracted"
+    else:
+        assert dist_item.state == UpdateState.UPDATE_FAILED
+        assert not os.path.exists(version_path), (
+            "Content with invalid checksum was used"
+        )
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_extract_zip_parallel(printer, temp_folder, workers):
+    """Tests that zip is extracted the same way using multiple workers."""
+
+    zip_path = os.path.join(temp_folder, "package.zip")
+    expected = {}
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr("package/empty_dir/", "")
+        for idx in range(300):
+            arcname = f"package/sub_{idx % 7}/deep_{idx % 3}/file_{idx}.py"
+            content = os.urandom(idx * 10)
+            zip_file.writestr(arcname, content)
+            expected[arcname] = content
+
+    dst_dir = os.path.join(temp_folder, "extracted")
+    extract_archive_file(zip_path, dst_dir, workers=workers)
+
+    assert os.path.isdir(os.path.join(dst_dir, "package", "empty_dir"))
+    for arcname, content in expected.items():
+        with open(os.path.join(dst_dir, *arcname.split("/")), "rb") as stream:
+            assert stream.read() == content, f"{arcname} does not match"
+
+
+@pytest.mark.parametrize("member_type", [
+    "parent_path", "absolute_path", "symlink", "nested_symlink", "hardlink"
+])
+def test_extract_archive_stream_unsafe_member(
+    printer, temp_folder, member_type
+):
+    """Tests that stream extraction does not write out of destination."""
+
+    dst_dir = os.path.join(temp_folder, "extracted")
+    outside_path = os.path.join(temp_folder, "outside.txt")
+    members = [("addon/__init__.py", tarfile.REGTYPE, None)]
+    if member_type == "parent_path":
+        members.append(("../outside.txt", tarfile.REGTYPE, None))
+    elif member_type == "absolute_path":
+        members.append((outside_path, tarfile.REGTYPE, None))
+    elif member_type == "symlink":
+        members.append(("addon/link", tarfile.SYMTYPE, temp_folder))
+    elif member_type == "nested_symlink":
+        members.append(("addon/link", tarfile.SYMTYPE, "../.."))
+        members.append(("addon/link/outside.txt", tarfile.REGTYPE, None))
+    else:
+        members.append(("addon/link", tarfile.LNKTYPE, "../outside.txt"))
+
+    stream = io.BytesIO()
+    with tarfile.open(fileobj=stream, mode="w:gz") as tar_file:
+        for name, member_type, linkname in members:
+            info = tarfile.TarInfo(name)
+            info.type = member_type
+            if linkname is not None:
+                info.linkname = linkname
+                tar_file.addfile(info)
+            else:
+                info.size = 7
+                tar_file.addfile(info, io.BytesIO(b"content"))
+    stream.seek(0)
+
+    with pytest.raises(Exception):
+        extract_archive_stream(stream, "addon.tar.gz", dst_dir)
+    assert not os.path.exists(outside_path)
+    assert not os.path.lexists(os.path.join(dst_dir, "addon", "link"))
+
+
+def test_staged_extraction(
+    printer, temp_folder, download_factory, monkeypatch
+):
+    """Tests that current content is replaced only by complete content."""
+
+    sources_dir = tempfile.mkdtemp(prefix="ayon_test_sources_")
+    addons_info, bundles_info = _prepare_local_addons(sources_dir, 1)
+    addons_dir = os.path.join(temp_folder, "addons")
+    cache_dir = os.path.join(temp_folder, "cache")
+    addon_dir = os.path.join(addons_dir, "addon_0_1.0.0")
+    old_filepath = os.path.join(addon_dir, "old_file.py")
+    os.makedirs(addon_dir)
+    with open(old_filepath, "w") as stream:
+        stream.write("")
+
+    unzip_calls = []
+    original_unzip = OSDownloader.unzip.__func__
+    monkeypatch.setattr(
+        OSDownloader,
+        "unzip",
+        classmethod(
+            lambda cls, *args: (
+                unzip_calls.append(args), original_unzip(cls, *args)
+            )
+        ),
+    )
+    original_activate = DistributionItem._activate_staging_dir
+
+    def _failing_activate(self, staging_dirpath):
+        raise OSError("Directory is used by other process")
+
+    # First distribution fails to activate extracted content
+    monkeypatch.setattr(
+        DistributionItem, "_activate_staging_dir", _failing_activate
+    )
+    distribution = _create_local_distribution(
+        addons_dir, download_factory, addons_info, bundles_info, cache_dir
+    )
+    distribution.distribute()
+    assert os.path.exists(old_filepath), "Current content was removed"
+    assert os.path.isdir(os.path.join(addons_dir, ".staging", "addon_0_1.0.0"))
+
+    # Second distribution reuses already extracted content
+    monkeypatch.setattr(
+        DistributionItem, "_activate_staging_dir", original_activate
+    )
+    distribution = _create_local_distribution(
+        addons_dir, download_factory, addons_info, bundles_info, cache_dir
+    )
+    distribution.distribute()
+    distribution.validate_distribution()
+    assert len(unzip_calls) == 1, "Extracted content was not reused"
+    assert not os.path.exists(old_filepath)
+    assert os.path.exists(os.path.join(addon_dir, "addon_0", "version.py"))
+    assert not os.path.exists(os.path.join(addons_dir, ".staging"))
+
+
+def test_distribution_lock(printer, temp_folder, download_factory):
+    """Tests that item distributed by other process is not distributed."""
+
+    from ayon_common.utils import file_lock
+
+    sources_dir = tempfile.mkdtemp(prefix="ayon_test_sources_")
+    addons_info, bundles_info = _prepare_local_addons(sources_dir, 1)
+    addons_dir = os.path.join(temp_folder, "addons")
+    cache_dir = os.path.join(temp_folder, "cache")
+    first = _create_local_distribution(
+        addons_dir, download_factory, addons_info, bundles_info, cache_dir
+    )
+    second = _create_local_distribution(
+        addons_dir, download_factory, addons_info, bundles_info, cache_dir
+    )
+    first_item = first.get_addon_dist_items()[0]["dist_item"]
+    second_item = second.get_addon_dist_items()[0]["dist_item"]
+    assert second_item.state == UpdateState.OUTDATED
+
+    # Distribution waits until lock is released
+    with file_lock(first_item._get_lock_path()):
+        thread = threading.Thread(target=first.distribute)
+        thread.start()
+        thread.join(0.5)
+        assert thread.is_alive(), "Distribution did not wait for lock"
+    thread.join()
+    assert first_item.state == UpdateState.UPDATED
+
+    # Item distributed by other process is not distributed again
+    second.distribute()
+    assert second_item.state == UpdateState.UPDATED
+    assert second_item.used_source == first_item.used_source
+    assert second_item.current_source_progress is None
+    assert all(
+        not progress.started
+        for _, progress in second_item.sources
+    )
+    second.finish_distribution()
+    second.validate_distribution()
+
+
+def _create_addon_version_zip(addon_name, version, files):
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w") as zip_file:
+        zip_file.writestr(
+            f"{addon_name}/version.py", f"__version__ = '{version}'"
+        )
+        for filename, content in files.items():
+            zip_file.writestr(f"{addon_name}/{filename}", content)
+    return stream.getvalue()
+
+
+def test_delta_update(
+    printer,
+    temp_folder,
+    download_factory,
+    range_server,
+    monkeypatch,
+):
+    """Tests that only changed files are downloaded for new version."""
+
+    monkeypatch.setenv("AYON_DISTRIBUTION_DELTA", "1")
+    monkeypatch.setenv("AYON_TRACE", "1")
+    monkeypatch.setattr(tracing, "_EVENTS", [])
+    addon_name = "addon_0"
+    files = {
+        f"module_{idx}.py": os.urandom(20 * 1024)
+        for idx in range(50)
+    }
+    zip_by_version = {
+        "1.0.0": _create_addon_version_zip(addon_name, "1.0.0", files),
+        "1.0.1": _create_addon_version_zip(addon_name, "1.0.1", files),
+    }
+    url = f"http://127.0.0.1:{range_server.server_port}/{addon_name}.zip"
+    addons_info = [{
+        "name": addon_name,
+        "versions": {
+            version: {
+                "clientSourceInfo": [{"type": "http", "url": url}],
+                "hash": hashlib.sha256(content).hexdigest(),
+            }
+            for version, content in zip_by_version.items()
+        }
+    }]
+    _, bundles_info = _prepare_local_addons(temp_folder, 0)
+    addons_dir = os.path.join(temp_folder, "addons")
+    for version, content in zip_by_version.items():
+        range_server.content = content
+        range_server.served_bytes = 0
+        bundles_info["bundles"][0]["addons"] = {addon_name: version}
+        distribution = _create_local_distribution(
+            addons_dir,
+            download_factory,
+            addons_info,
+            bundles_info,
+            os.path.join(temp_folder, "cache"),
+        )
+        distribution.distribute()
+        distribution.validate_distribution()
+        distribution.finish_distribution()
+
+    # Only zip directory and changed 'version.py' were downloaded
+    assert range_server.served_bytes < len(zip_by_version["1.0.1"]) / 2
+    new_dir = os.path.join(addons_dir, f"{addon_name}_1.0.1", addon_name)
+    old_dir = os.path.join(addons_dir, f"{addon_name}_1.0.0", addon_name)
+    with open(os.path.join(new_dir, "version.py"), "r") as stream:
+        assert stream.read() == "__version__ = '1.0.1'"
+    for filename, content in files.items():
+        with open(os.path.join(new_dir, filename), "rb") as stream:
+            assert stream.read() == content, f"{filename} does not match"
+    assert os.path.samefile(
+        os.path.join(new_dir, "module_0.py"),
+        os.path.join(old_dir, "module_0.py"),
+    ), "Unchanged file was not linked from previous version"
+
+    # Delta was applied only to the second version
+    assert [
+        event["args"]["item"]
+        for event in tracing.get_trace_events()
+        if event["name"] == "delta_update"
+    ] == [f"{addon_name}_1.0.1"]
+
+
+def test_dedupe_storage(printer, temp_folder):
+    """Tests that identical files are linked to object store."""
+
+    storage_dir = os.path.join(temp_folder, "dependency_packages")
+    shared_content = os.urandom(64 * 1024)
+    paths = []
+    for package_name in ("package_1", "package_2"):
+        dirpath = os.path.join(storage_dir, package_name, "site-packages")
+        os.makedirs(dirpath)
+        path = os.path.join(dirpath, "module.pyd")
+        with open(path, "wb") as stream:
+            stream.write(shared_content)
+        paths.append(path)
+        with open(os.path.join(dirpath, "unique.pyd"), "wb") as stream:
+            stream.write(os.urandom(64 * 1024))
+
+    store = ObjectStore(os.path.join(temp_folder, "objects"), False)
+    result = dedupe_storage([storage_dir], store)
+    assert result.files == 4
+    assert result.deduplicated == 1
+    assert result.saved_size == len(shared_content)
+    assert os.path.samefile(*paths), "Duplicated file was not linked"
+    for path in paths:
+        with open(path, "rb") as stream:
+            assert stream.read() == shared_content
+
+    # Objects used by distributed files are kept
+    assert store.collect_garbage() == 0
+    shutil.rmtree(os.path.join(storage_dir, "package_1"))
+    assert store.collect_garbage() == 1
+
+
+def test_metadata_store(printer, temp_folder):
+    """Tests migration of JSON metadata and concurrent updates."""
+
+    json_path = os.path.join(temp_folder, "addons.json")
+    db_path = os.path.join(temp_folder, "addons.db")
+    with open(json_path, "w") as stream:
+        json.dump({"addon": {"1.0.0": {"checksum": "a"}}}, stream)
+
+    store = MetadataStore(db_path, json_path)
+    assert store.get_item("addon", "1.0.0") == {"checksum": "a"}
+    assert store.get_item("addon", "2.0.0") is None
+
+    # Many stores (processes) update metadata at the same time
+    def _update(idx):
+        MetadataStore(db_path, json_path).update_items(
+            {f"addon_{idx}": {"1.0.0": {"checksum": str(idx)}}}
+        )
+
+    threads = [
+        threading.Thread(target=_update, args=(idx, ))
+        for idx in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metadata = store.get_all()
+    assert len(metadata) == 11
+    for idx in range(10):
+        assert metadata[f"addon_{idx}"] == {"1.0.0": {"checksum": str(idx)}}
+
+    # Changes of JSON file made by older launcher are imported again
+    with open(json_path, "w") as stream:
+        json.dump({"addon": {"2.0.0": {"checksum": "b"}}}, stream)
+    os.utime(json_path, (0, 0))
+    assert MetadataStore(db_path, json_path).get_versions("addon") == {
+        "1.0.0": {"checksum": "a"},
+        "2.0.0": {"checksum": "b"},
+    }
+
+    # Older launcher reading only JSON file sees updates of the store
+    store.update_items({"addon": {"3.0.0": {"checksum": "c"}}})
+    with open(json_path, "r") as stream:
+        legacy_metadata = json.load(stream)
+    assert legacy_metadata == store.get_all()
+    assert len(legacy_metadata) == 11
+    assert legacy_metadata["addon"]["3.0.0"] == {"checksum": "c"}
+
+    # Dependency packages are stored in JSON file only by name
+    dep_json_path = os.path.join(temp_folder, "dependency.json")
+    MetadataStore(
+        os.path.join(temp_folder, "dependency.db"),
+        dep_json_path,
+        json_has_versions=False,
+    ).update_items({"package.zip": {"": {"checksum": "d"}}})
+    with open(dep_json_path, "r") as stream:
+        assert json.load(stream) == {"package.zip": {"checksum": "d"}}
+
+
+def test_catalog_cache(printer, temp_folder, range_server):
+    """Tests that unchanged catalog is revalidated without body."""
+
+    bundles = {"bundles": [], "productionBundle": None}
+    range_server.content = json.dumps(bundles).encode("utf-8")
+    host, port = range_server.server_address
+    con = ayon_api.ServerAPI(f"http://{host}:{port}")
+    cache = CatalogCache(temp_folder, ttl=0)
+
+    assert cache.get("bundles", con) == bundles
+    served_bytes = range_server.served_bytes
+    assert cache.get("bundles", con) == bundles
+    assert range_server.served_bytes == served_bytes, (
+        "Unchanged catalog was downloaded again"
+    )
+    assert len(range_server.requested_ranges) == 2
+
+    # Entry is not revalidated within time to live
+    assert CatalogCache(temp_folder, ttl=60).get("bundles", con) == bundles
+    assert len(range_server.requested_ranges) == 2
+
+    # Not modified response without cached entry is a cache miss
+    range_server.not_modified_responses = 1
+    cache = CatalogCache(os.path.join(temp_folder, "other"), ttl=0)
+    assert cache.get("bundles", con) == bundles
+    assert len(range_server.requested_ranges) == 4
+
+
+def test_cached_addon_settings(printer, temp_folder, range_server):
+    """Tests that addon settings are cached per bundle and variant."""
+
+    settings = {"disk_mapping": {"linux": []}}
+    range_server.content = json.dumps(settings).encode("utf-8")
+    host, port = range_server.server_address
+    con = ayon_api.ServerAPI(f"http://{host}:{port}")
+    cache = CatalogCache(temp_folder, ttl=0)
+
+    args = ("core", "1.0.0", "Bundle", "production")
+    assert get_cached_addon_settings(*args, cache, con) == settings
+    served_bytes = range_server.served_bytes
+    assert get_cached_addon_settings(*args, cache, con) == settings
+    assert range_server.served_bytes == served_bytes
+
+    # Other settings variant is cached separately
+    args = ("core", "1.0.0", "Bundle", "staging")
+    assert get_cached_addon_settings(*args, cache, con) == settings
+    assert range_server.served_bytes > served_bytes
+
+
+class _CatalogRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves JSON 'responses' of server by request path."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = json.dumps(self.server.responses[self.path]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_fetch_bootstrap_catalog(printer, temp_folder, sample_bundles):
+    """Tests that fetched catalog can be passed to 'AyonDistribution'."""
+
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), _CatalogRequestHandler
+    )
+    server.responses = {
+        "/": {},
+        "/api/info": {},
+        "/api/users/me": {"name": "admin"},
+        "/api/bundles": sample_bundles,
+        "/api/addons?details=1": {"addons": []},
+        "/api/desktop/dependencyPackages": {"packages": []},
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address
+        con = ayon_api.ServerAPI(f"http://{host}:{port}", token="token")
+
+        # Session of connection is not used from catalog threads
+        def _session_get(*args, **kwargs):
+            raise AssertionError("Session of connection was used")
+
+        con.get = _session_get
+        uncached_catalog = fetch_bootstrap_catalog(
+            None, include_installers=False, con=con
+        )
+        catalog = fetch_bootstrap_catalog(
+            CatalogCache(temp_folder), include_installers=False, con=con
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert catalog == {
+        "bundles_info": sample_bundles,
+        "addons_info": [],
+        "dependency_packages_info": [],
+        "active_user": "admin",
+    }
+    assert uncached_catalog == catalog
+    distribution = AyonDistribution(
+        addon_dirpath=os.path.join(temp_folder, "addons"),
+        dependency_dirpath=os.path.join(temp_folder, "dependency_packages"),
+        skip_installer_dist=True,
+        catalog_cache=None,
+        **catalog
+    )
+    assert distribution.bundle_to_use.name == "TestBundle"
+
+
+def test_progress_report(printer, temp_folder, download_factory):
+    """Tests progress report of distribution items."""
+
+    sources_dir = tempfile.mkdtemp(prefix="ayon_test_sources_")
+    addons_info, bundles_info = _prepare_local_addons(sources_dir, 2)
+    distribution = _create_local_distribution(
+        os.path.join(temp_folder, "addons"),
+        download_factory,
+        addons_info,
+        bundles_info,
+        os.path.join(temp_folder, "cache"),
+    )
+    items = distribution.get_all_distribution_items()
+    report = create_progress_report(items)
+    assert report["finished"] == 0
+    assert report["total"] == 2
+    assert {info["phase"] for info in report["items"]} == {"waiting"}
+
+    distribution.distribute()
+    report = create_progress_report(items, collections.deque())
+    assert report["finished"] == 2
+    assert {info["phase"] for info in report["items"]} == {"done"}
+    assert report["transferred"] == report["size"]
+
+
+def test_update_window_stop(printer, monkeypatch):
+    """Tests that update window which does not read reports is stopped."""
+
+    monkeypatch.setattr(
+        distribution_utils,
+        "get_ayon_launch_args",
+        lambda *args: [sys.executable, "-c", "import time; time.sleep(60)"],
+    )
+    counter = iter(range(1000000))
+    monkeypatch.setattr(
+        distribution_utils,
+        "create_progress_report",
+        lambda *args: {"items": [next(counter)], "data": "x" * 10000},
+    )
+
+    manager = distribution_utils.UpdateWindowManager(report_interval=0.001)
+    manager.start([object()])
+    # Fill the pipe so writes of report thread are blocked
+    time.sleep(0.5)
+
+    stop_thread = threading.Thread(target=manager.stop, daemon=True)
+    stop_thread.start()
+    stop_thread.join(distribution_utils.REPORT_THREAD_JOIN_TIMEOUT * 2)
+    assert not stop_thread.is_alive()
+
+
+def test_benchmark_distribution(printer):
+    """Tests distribution from local server stand-in over shaped network."""
+
+    from ayon_common.distribution.tests.benchmark_distribution import (
+        run_benchmark,
+    )
+    from ayon_common.distribution.tests.local_server import (
+        MB,
+        NetworkProfile,
+    )
+
+    result = run_benchmark(
+        NetworkProfile("test", latency=0.005, bandwidth=50 * MB),
+        addons=3,
+        addon_files=10,
+        addon_size=MB // 4,
+        package_files=20,
+        package_size=MB,
+        workers=2,
+    )
+    assert result["failed"] == []
+    assert result["served_bytes"] > 0
+    assert result["extract_rate"]
@@ -1,4 +1,8 @@
+import sys
+import json
 import signal
+import threading
+
 from qtpy import QtWidgets, QtCore, QtGui
 
 from ayon_common.resources import (
@@ -44,16 +48,12 @@ class AnimationWidget(QtWidgets.QWidget):
         anim_group.addAnimation(legs_scale_anim)
         anim_group.addAnimation(ball_translate_anim)
 
-        repaint_timer = QtCore.QTimer()
-        repaint_timer.setInterval(10)
-
         angle_anim.valueChanged.connect(
             self._on_angle_anim)
         legs_scale_anim.valueChanged.connect(
             self._on_legs_scale_anim)
         ball_translate_anim.valueChanged.connect(
             self._on_ball_translate_anim)
-        repaint_timer.timeout.connect(self.repaint)
 
         anim_group.finished.connect(self._on_anim_group_finish)
 
@@ -61,16 +61,19 @@ class AnimationWidget(QtWidgets.QWidget):
         self._angle = 0
         self._legs_scale = 1.0
         self._anim_group = anim_group
-        self._repaint_timer = repaint_timer
 
+    # Repaint is scheduled only when animated values change
     def _on_angle_anim(self, value):
         self._angle = int(value * 360)
+        self.update()
 
     def _on_legs_scale_anim(self, value):
         self._legs_scale = value
+        self.update()
 
     def _on_ball_translate_anim(self, value):
         self._ball_offset_ratio = value
+        self.update()
 
     def _on_anim_group_finish(self):
         self._anim_group.start()
@@ -78,7 +81,10 @@ class AnimationWidget(QtWidgets.QWidget):
     def showEvent(self, event):
         super().showEvent(event)
         self._anim_group.start()
-        self._repaint_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._anim_group.stop()
 
     def sizeHint(self):
         height = self.fontMetrics().height()
@@ -151,6 +157,108 @@ class AnimationWidget(QtWidgets.QWidget):
         painter.end()
 
 
+def _format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            break
+        size /= 1024
+    return f"{size:.1f} {unit}"
+
+
+def _format_eta(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} min {seconds} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} h {minutes} min"
+
+
+class ProgressReader(QtCore.QObject):
+    """Read progress reports from stdin in a thread.
+
+    Reports are JSON lines sent by 'UpdateWindowManager'.
+    """
+
+    report_received = QtCore.Signal(dict)
+
+    def start(self):
+        thread = threading.Thread(target=self._read, daemon=True)
+        thread.start()
+
+    def _read(self):
+        if sys.stdin is None:
+            return
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                report = json.loads(line)
+            except ValueError:
+                continue
+            self.report_received.emit(report)
+
+
+class ProgressWidget(QtWidgets.QWidget):
+    """Overall progress, active items, speed and ETA."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+
+        progress_bar = QtWidgets.QProgressBar(self)
+        progress_bar.setRange(0, 0)
+        progress_bar.setTextVisible(False)
+
+        items_label = QtWidgets.QLabel(self)
+        items_label.setAlignment(QtCore.Qt.AlignCenter)
+
+        stats_label = QtWidgets.QLabel(self)
+        stats_label.setAlignment(QtCore.Qt.AlignCenter)
+
+        main_layout = QtWidgets.QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.addWidget(progress_bar, 0)
+        main_layout.addWidget(items_label, 0)
+        main_layout.addWidget(stats_label, 0)
+
+        self._progress_bar = progress_bar
+        self._items_label = items_label
+        self._stats_label = stats_label
+
+    def set_report(self, report):
+        size = report["size"]
+        transferred = report["transferred"]
+        if size:
+            self._progress_bar.setRange(0, 1000)
+            self._progress_bar.setValue(
+                int(min(transferred, size) / size * 1000)
+            )
+
+        active_labels = [
+            f"{info['label']} ({info['phase']})"
+            for info in report["items"]
+            if info["phase"] not in ("waiting", "done", "failed")
+        ]
+        items_text = f"{report['finished']}/{report['total']} items"
+        if active_labels:
+            items_text += ": " + ", ".join(active_labels[:2])
+            if len(active_labels) > 2:
+                items_text += f" +{len(active_labels) - 2}"
+        self._items_label.setText(items_text)
+
+        stats = [_format_size(transferred)]
+        if size:
+            stats[0] += f" of {_format_size(size)}"
+        if report["speed"] is not None:
+            stats.append(f"{_format_size(report['speed'])}/s")
+        if report["eta"] is not None:
+            stats.append(f"ETA {_format_eta(report['eta'])}")
+        self._stats_label.setText(" | ".join(stats))
+
+
 class UpdateWindow(QtWidgets.QWidget):
     aspect = 10.0 / 16.0
     default_width = 300
@@ -175,12 +283,27 @@ class UpdateWindow(QtWidgets.QWidget):
         message_label = QtWidgets.QLabel("<b>AYON is updating...</b>", self)
         message_label.setAlignment(QtCore.Qt.AlignCenter)
 
+        progress_widget = ProgressWidget(self)
+        progress_widget.setVisible(False)
+
         margin = 30
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.setContentsMargins(margin, margin, margin, margin)
         main_layout.addWidget(anim_widget, 1)
         main_layout.addSpacing(10)
         main_layout.addWidget(message_label, 0)
+        main_layout.addWidget(progress_widget, 0)
+
+        self._progress_widget = progress_widget
+
+    def set_report(self, report):
+        if not self._progress_widget.isVisible():
+            self._progress_widget.setVisible(True)
+            # Make space for progress information
+            self.resize(
+                self.width(), max(self.height(), self.sizeHint().height())
+            )
+        self._progress_widget.set_report(report)
 
     def paintEvent(self, event):
         painter = QtGui.QPainter()
@@ -224,6 +347,10 @@ if __name__ == "__main__":
     window = UpdateWindow()
     window.show()
 
+    progress_reader = ProgressReader()
+    progress_reader.report_received.connect(window.set_report)
+    progress_reader.start()
+
     def signal_handler(*_args):
         window.close()
 
@@ -1,10 +1,22 @@
 import os
 import json
+import time
+import threading
 import subprocess
 import tempfile
+import collections
 
 from ayon_common.utils import get_launcher_storage_dir, get_ayon_launch_args
 
+DEFAULT_DISTRIBUTION_WORKERS = 4
+DEFAULT_DOWNLOAD_SEGMENTS = 4
+# Interval of progress reports sent to update window in seconds
+PROGRESS_REPORT_INTERVAL = 0.25
+# Timeout of progress report thread when update window is stopped
+REPORT_THREAD_JOIN_TIMEOUT = 5.0
+# Time window used to calculate download speed in seconds
+_SPEED_WINDOW = 5.0
+
 
 def get_addons_dir():
     """Directory where addon packages are stored.
@@ -50,6 +62,83 @@ def get_dependencies_dir():
     return dependencies_dir
 
 
+def get_distribution_workers():
+    """Number of workers used to distribute items in parallel.
+
+    The value can be changed using 'AYON_DISTRIBUTION_WORKERS' environment
+    variable. Value '1' means that items are distributed one by one.
+
+    Returns:
+        int: Number of distribution workers.
+    """
+
+    workers = DEFAULT_DISTRIBUTION_WORKERS
+    value = os.environ.get("AYON_DISTRIBUTION_WORKERS")
+    if value:
+        try:
+            workers = int(value)
+        except ValueError:
+            print(
+                "Invalid value of 'AYON_DISTRIBUTION_WORKERS'"
+                f" environment variable \"{value}\". Expected integer."
+            )
+    return max(1, workers)
+
+
+def get_download_segments():
+    """Number of concurrent range requests used to download big files.
+
+    Used for dependency packages and installers. The value can be changed
+    using 'AYON_DOWNLOAD_SEGMENTS' environment variable. Value '1' means
+    that files are downloaded using single stream.
+
+    Returns:
+        int: Number of download segments.
+    """
+
+    segments = DEFAULT_DOWNLOAD_SEGMENTS
+    value = os.environ.get("AYON_DOWNLOAD_SEGMENTS")
+    if value:
+        try:
+            segments = int(value)
+        except ValueError:
+            print(
+                "Invalid value of 'AYON_DOWNLOAD_SEGMENTS'"
+                f" environment variable \"{value}\". Expected integer."
+            )
+    return max(1, segments)
+
+
+def is_stream_extract_enabled():
+    """Tar archives are extracted while being downloaded.
+
+    Streaming extraction is enabled using 'AYON_DISTRIBUTION_STREAM_EXTRACT'
+    environment variable set to '1'. Extracted content is used only if
+    checksum of streamed archive matches, but the archive is not stored,
+    so it can't be cached or resumed.
+
+    Returns:
+        bool: Streaming extraction is enabled.
+    """
+
+    return os.getenv("AYON_DISTRIBUTION_STREAM_EXTRACT") == "1"
+
+
+def is_delta_update_enabled():
+    """Addons are updated by downloading only changed files.
+
+    Delta update is enabled using 'AYON_DISTRIBUTION_DELTA' environment
+    variable set to '1'. Unchanged files are reused from previously
+    distributed version of addon. Downloaded files are validated by CRC32
+    stored in zip archive, checksum of whole archive can't be validated.
+
+    Returns:
+        bool: Delta update is enabled.
+    """
+
+    return os.getenv("AYON_DISTRIBUTION_DELTA") == "1"
+
+
 def show_missing_bundle_information(url, bundle_name=None, username=None):
     """Show missing bundle information window.
 
@@ -107,9 +196,74 @@ def show_installer_issue_information(message, installer_path=None):
         os.remove(filepath)
 
 
+def create_progress_report(items, speed_samples=None):
+    """Create progress report of distribution items.
+
+    Report contains progress of each item, total transferred and expected
+    size, download speed in bytes per second and ETA in seconds. Speed and
+    ETA are calculated only if 'speed_samples' are passed.
+
+    Args:
+        items (Iterable[BaseDistributionItem]): Distribution items.
+        speed_samples (Optional[collections.deque]): Samples of time and
+            transferred size from previous reports. New sample is added.
+
+    Returns:
+        dict[str, Any]: Progress report.
+    """
+
+    items_info = [item.get_progress_info() for item in items]
+    transferred = sum(info["transferred"] for info in items_info)
+    size = sum(info["size"] for info in items_info)
+    finished = sum(
+        1 for info in items_info if info["phase"] in ("done", "failed")
+    )
+
+    speed = eta = None
+    if speed_samples is not None:
+        now = time.monotonic()
+        speed_samples.append((now, transferred))
+        while now - speed_samples[0][0] > _SPEED_WINDOW:
+            speed_samples.popleft()
+        first_time, first_transferred = speed_samples[0]
+        if now > first_time:
+            speed = (transferred - first_transferred) / (now - first_time)
+
+        # ETA is known only when size of all items is known
+        size_known = all(
+            info["size"] or info["phase"] in ("done", "failed")
+            for info in items_info
+        )
+        if speed and size_known:
+            eta = max(0, size - transferred) / speed
+
+    return {
+        "items": items_info,
+        "finished": finished,
+        "total": len(items_info),
+        "transferred": transferred,
+        "size": size,
+        "speed": speed,
+        "eta": eta,
+    }
+
+
 class UpdateWindowManager:
-    def __init__(self):
+    """Show update window in a subprocess.
+
+    When distribution items are passed to 'start', progress reports are
+    sent to the window as JSON lines through its stdin.
+
+    Args:
+        report_interval (Optional[float]): Interval of progress reports
+            in seconds.
+    """
+
+    def __init__(self, report_interval=PROGRESS_REPORT_INTERVAL):
         self._process = None
+        self._report_interval = report_interval
+        self._report_thread = None
+        self._stop_event = threading.Event()
 
     def __enter__(self):
         self.start()
@@ -118,16 +272,71 @@ class UpdateWindowManager:
         finally:
             self.stop()
 
-    def start(self):
+    def start(self, items=None):
+        """Start update window.
+
+        Args:
+            items (Optional[list[BaseDistributionItem]]): Distribution
+                items which progress is shown in the window.
+        """
+
         ui_dir = os.path.join(os.path.dirname(__file__), "ui")
         script_path = os.path.join(ui_dir, "update_window.py")
 
         args = get_ayon_launch_args(script_path, "--skip-bootstrap")
-        self._process = subprocess.Popen(args)
+        if not items:
+            self._process = subprocess.Popen(args, stdin=subprocess.DEVNULL)
+            return
+
+        self._process = subprocess.Popen(args, stdin=subprocess.PIPE)
+        self._stop_event.clear()
+        self._report_thread = threading.Thread(
+            target=self._report_progress,
+            args=(items, self._process.stdin),
+            name="AYONUpdateWindowProgress",
+            daemon=True,
+        )
+        self._report_thread.start()
+
+    def _send_report(self, stream, report):
+        stream.write(json.dumps(report).encode("utf-8") + b"\n")
+        stream.flush()
+
+    def _report_progress(self, items, stream):
+        speed_samples = collections.deque()
+        last_items_info = None
+        try:
+            while not self._stop_event.wait(self._report_interval):
+                report = create_progress_report(items, speed_samples)
+                # Don't wake up the window if nothing changed
+                if report["items"] == last_items_info:
+                    continue
+                last_items_info = report["items"]
+                self._send_report(stream, report)
+        except (OSError, ValueError):
+            # Window was closed
+            pass
 
     def stop(self):
         if self._process is None:
             return
+        self._stop_event.set()
+        # Kill the window first, report thread may be blocked by write to
+        #   stdin of window which does not read it
         if self._process.poll() is None:
             self._process.kill()
+        report_thread = self._report_thread
+        self._report_thread = None
+        if report_thread is not None:
+            report_thread.join(REPORT_THREAD_JOIN_TIMEOUT)
+        # Closing stdin would wait for blocked write of the thread
+        if (
+            self._process.stdin is not None
+            and (report_thread is None or not report_thread.is_alive())
+        ):
+            try:
+                self._process.stdin.close()
+            except (OSError, ValueError):
+                pass
+        self._process.wait()
         self._process = None
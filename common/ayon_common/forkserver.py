@@ -0,0 +1,569 @@
+"""Pre-warmed forkserver of bootstrapped AYON launcher (Linux only).
+
+Forkserver is a resident process that already went through bootstrap and
+imported 'ayon_core'. AYON launcher processes connect to it over Unix
+socket and the forkserver forks a child with their arguments, environment,
+working directory and stdio. Child inherits everything imported and
+resolved by the forkserver, so it starts without interpreter start,
+server requests and distribution checks.
+
+Forkserver is opt-in using 'AYON_FORKSERVER' environment variable set
+to '1'. There is one forkserver per user, server, requested bundle and
+AYON launcher executable. It is started in background by the first
+process that did not find it, after that process finished its own
+bootstrap, and stops after 'AYON_FORKSERVER_IDLE_TIMEOUT' seconds without
+a request, or after 'AYON_FORKSERVER_LIFETIME' seconds, so changes of
+bundles on server are picked up.
+
+Socket is used only if its directory is owned by current user and is not
+accessible by others, and only if forkserver runs as the same user.
+
+Forkserver holds a lock file next to the socket for its whole lifetime,
+so only one forkserver is started. Output of forkserver is stored to a log
+file next to the socket. When bootstrap of forkserver fails, no other
+forkserver is started for 'FAILED_RETRY_DELAY' seconds.
+
+Module uses only standard library to keep the client side cheap.
+"""
+import os
+import sys
+import stat
+import json
+import time
+import socket
+import signal
+import struct
+import hashlib
+import tempfile
+import traceback
+import subprocess
+from typing import Optional, Any, Callable, Dict, List
+
+DEFAULT_IDLE_TIMEOUT = 600
+DEFAULT_LIFETIME = 3600
+# Seconds after failed start of forkserver when it is not started again
+FAILED_RETRY_DELAY = 300
+# Header sent together with stdio file descriptors
+_FDS_HEADER = b"AYON"
+# Environment variables used to define the forkserver key
+_KEY_ENV_KEYS = (
+    "AYON_VERSION",
+    "AYON_SERVER_URL",
+    "AYON_BUNDLE_NAME",
+    "AYON_USE_STAGING",
+    "AYON_USE_DEV",
+)
+# Environment variables of request which are not overridden by bootstrap
+_REQUEST_ENV_KEYS = (
+    "AYON_API_KEY",
+)
+
+
+def is_forkserver_enabled() -> bool:
+    """Forkserver is enabled.
+
+    Forkserver is available only on Linux and is enabled using
+        'AYON_FORKSERVER' environment variable set to '1'.
+
+    Returns:
+        bool: Forkserver is enabled.
+
+    """
+    return (
+        sys.platform.startswith("linux")
+        and os.getenv("AYON_FORKSERVER") == "1"
+    )
+
+
+def _get_env_seconds(env_key: str, default: int) -> int:
+    value = os.environ.get(env_key)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(
+            f"Invalid value of '{env_key}' environment variable"
+            f" \"{value}\". Expected integer."
+        )
+    return default
+
+
+def get_forkserver_idle_timeout() -> int:
+    """Seconds after which forkserver stops if it did not get a request.
+
+    Returns:
+        int: Idle timeout in seconds.
+
+    """
+    return _get_env_seconds(
+        "AYON_FORKSERVER_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT
+    )
+
+
+def get_forkserver_lifetime() -> int:
+    """Seconds after which forkserver stops accepting requests.
+
+    Returns:
+        int: Lifetime in seconds.
+
+    """
+    return _get_env_seconds("AYON_FORKSERVER_LIFETIME", DEFAULT_LIFETIME)
+
+
+def get_forkserver_socket_path() -> str:
+    """Path to socket of forkserver for current process.
+
+    The path is based on executable, AYON launcher version, server url,
+        hash of api key and requested bundle. Socket is stored in user
+        runtime directory, or in user specific temp directory.
+
+    Returns:
+        str: Path to socket.
+
+    """
+    key_parts = [sys.executable]
+    key_parts.extend(os.getenv(env_key, "") for env_key in _KEY_ENV_KEYS)
+    # Processes with different api key don't share forkserver
+    key_parts.append(hashlib.sha256(
+        os.getenv("AYON_API_KEY", "").encode("utf-8")
+    ).hexdigest())
+    key = hashlib.sha1("|".join(key_parts).encode("utf-8")).hexdigest()
+
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        dirpath = os.path.join(runtime_dir, "ayon")
+    else:
+        dirpath = os.path.join(
+            tempfile.gettempdir(), f"ayon-{os.getuid()}"
+        )
+    # Socket path length is limited, so only part of hash is used
+    return os.path.join(dirpath, f"forkserver-{key[:16]}.sock")
+
+
+def _is_private_dir(dirpath: str) -> bool:
+    """Directory is owned by current user and accessible only by the user.
+
+    Args:
+        dirpath (str): Path to directory.
+
+    Returns:
+        bool: Directory is private.
+
+    """
+    try:
+        dir_stat = os.lstat(dirpath)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(dir_stat.st_mode)
+        and dir_stat.st_uid == os.getuid()
+        and stat.S_IMODE(dir_stat.st_mode) == 0o700
+    )
+
+
+def get_forkserver_log_path(socket_path: str) -> str:
+    """Path to log file with output of forkserver.
+
+    Args:
+        socket_path (str): Path to forkserver socket.
+
+    Returns:
+        str: Path to log file.
+
+    """
+    return os.path.splitext(socket_path)[0] + ".log"
+
+
+def _get_failed_marker_path(socket_path: str) -> str:
+    return os.path.splitext(socket_path)[0] + ".failed"
+
+
+def lock_forkserver(socket_path: str) -> Optional[int]:
+    """Try to acquire lock of forkserver.
+
+    Lock is held by forkserver for its whole lifetime. Lock is released
+        when file descriptor is closed, or when process ends.
+
+    Args:
+        socket_path (str): Path to forkserver socket.
+
+    Returns:
+        Optional[int]: File descriptor of locked file, or None if lock is
+            held by other process or directory of socket is not private.
+
+    """
+    import fcntl
+
+    dirpath = os.path.dirname(socket_path)
+    os.makedirs(dirpath, mode=0o700, exist_ok=True)
+    if not _is_private_dir(dirpath):
+        return None
+    lock_path = os.path.splitext(socket_path)[0] + ".lock"
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def set_forkserver_failed(socket_path: str, failed: bool):
+    """Mark that bootstrap of forkserver failed or succeeded.
+
+    Args:
+        socket_path (str): Path to forkserver socket.
+        failed (bool): Bootstrap of forkserver failed.
+
+    """
+    marker_path = _get_failed_marker_path(socket_path)
+    if failed:
+        with open(marker_path, "w"):
+            pass
+    elif os.path.exists(marker_path):
+        os.remove(marker_path)
+
+
+def is_forkserver_failed(socket_path: str) -> bool:
+    """Bootstrap of forkserver failed recently.
+
+    Args:
+        socket_path (str): Path to forkserver socket.
+
+    Returns:
+        bool: Forkserver failed less than 'FAILED_RETRY_DELAY' seconds ago.
+
+    """
+    try:
+        mtime = os.path.getmtime(_get_failed_marker_path(socket_path))
+    except OSError:
+        return False
+    return time.time() - mtime < FAILED_RETRY_DELAY
+
+
+def _send_message(conn: socket.socket, data: Dict[str, Any]):
+    conn.sendall(json.dumps(data).encode("utf-8") + b"\n")
+
+
+def _exit_code_from_exception(exc: SystemExit) -> int:
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_in_forkserver(
+    socket_path: str,
+    argv: List[str],
+    env: Dict[str, str],
+    cwd: str,
+    data: Optional[Dict[str, Any]] = None,
+) -> Optional[int]:
+    """Run process in forkserver and wait until it finishes.
+
+    Stdio of current process is passed to the child. Signals 'SIGINT',
+        'SIGTERM' and 'SIGHUP' are forwarded to the child.
+
+    Args:
+        socket_path (str): Path to forkserver socket.
+        argv (list[str]): Arguments of child process.
+        env (dict[str, str]): Environment of child process.
+        cwd (str): Working directory of child process.
+        data (Optional[dict[str, Any]]): Additional data passed to
+            forkserver handler.
+
+    Returns:
+        Optional[int]: Exit code of child process, or None if forkserver
+            is not running or is not trusted.
+
+    """
+    # Socket in directory writable by other users could be replaced
+    if not _is_private_dir(os.path.dirname(socket_path)):
+        return None
+
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+        trusted = _is_same_user(conn)
+    except OSError:
+        trusted = False
+    if not trusted:
+        conn.close()
+        return None
+
+    child_pid = None
+    previous_handlers = {}
+
+    def _forward_signal(signum, _frame):
+        if child_pid is not None:
+            try:
+                os.kill(child_pid, signum)
+            except OSError:
+                pass
+
+    try:
+        socket.send_fds(conn, [_FDS_HEADER], [0, 1, 2])
+        _send_message(conn, {
+            "argv": argv,
+            "env": env,
+            "cwd": cwd,
+            "data": data or {},
+        })
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            previous_handlers[signum] = signal.signal(
+                signum, _forward_signal
+            )
+
+        with conn.makefile("rb") as stream:
+            for line in stream:
+                message = json.loads(line)
+                if "pid" in message:
+                    child_pid = message["pid"]
+                elif "exit_code" in message:
+                    return message["exit_code"]
+
+    except OSError:
+        # Forkserver is not usable, e.g. it is just stopping
+        if child_pid is None:
+            return None
+
+    finally:
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        conn.close()
+
+    # Child did not report exit code, it was killed or replaced its process
+    return 1
+
+
+def start_forkserver(
+    socket_path: str, args: List[str], env: Dict[str, str]
+) -> bool:
+    """Start forkserver process in background.
+
+    Forkserver runs headless in a new session and its output is stored
+        to log file. Forkserver is not started if other forkserver is
+        starting or running, or if forkserver failed recently.
+
+    Args:
+        socket_path (str): Path to forkserver socket.
+        args (list[str]): Arguments to launch forkserver.
+        env (dict[str, str]): Environment of forkserver.
+
+    Returns:
+        bool: Forkserver was started.
+
+    """
+    lock_fd = lock_forkserver(socket_path)
+    if lock_fd is None:
+        return False
+    # Forkserver acquires the lock on its own
+    os.close(lock_fd)
+    if is_forkserver_failed(socket_path):
+        return False
+
+    env = dict(env)
+    env["AYON_HEADLESS_MODE"] = "1"
+    with open(get_forkserver_log_path(socket_path), "w") as log_stream:
+        subprocess.Popen(
+            args,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=log_stream,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    return True
+
+
+def _is_same_user(conn: socket.socket) -> bool:
+    creds = conn.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    _pid, uid, _gid = struct.unpack("3i", creds)
+    return uid == os.getuid()
+
+
+def _create_server_socket(socket_path: str) -> socket.socket:
+    dirpath = os.path.dirname(socket_path)
+    os.makedirs(dirpath, mode=0o700, exist_ok=True)
+    os.chmod(dirpath, 0o700)
+
+    # Bind to unique path and replace the socket atomically, so running
+    #   clients never see missing socket
+    tmp_path = f"{socket_path}.{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(tmp_path)
+    server.listen(16)
+    os.replace(tmp_path, socket_path)
+    return server
+
+
+def _run_child(
+    conn: socket.socket,
+    fds: List[int],
+    request: Dict[str, Any],
+    bootstrap_env: Dict[str, Optional[str]],
+    handler: Callable[[List[str], Dict[str, Any]], Optional[int]],
+    lock_fd: Optional[int],
+):
+    """Prepare forked child process and run handler.
+
+    Never returns, process is terminated with exit code of handler.
+    """
+    exit_code = 1
+    try:
+        # Lock of forkserver must not be held by children
+        if lock_fd is not None:
+            os.close(lock_fd)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        os.setsid()
+        for target_fd, fd in enumerate(fds):
+            os.dup2(fd, target_fd)
+            os.close(fd)
+        # Stdio of forkserver was not interactive
+        for stream in (sys.stdout, sys.stderr):
+            if stream is not None:
+                stream.reconfigure(line_buffering=True)
+
+        env = dict(request["env"])
+        for key, value in bootstrap_env.items():
+            if key in _REQUEST_ENV_KEYS:
+                continue
+            if value is None:
+                env.pop(key, None)
+            else:
+                env[key] = value
+        os.environ.clear()
+        os.environ.update(env)
+        os.chdir(request["cwd"])
+
+        _send_message(conn, {"pid": os.getpid()})
+        exit_code = handler(request["argv"], request["data"]) or 0
+
+    except SystemExit as exc:
+        exit_code = _exit_code_from_exception(exc)
+
+    except BaseException:
+        traceback.print_exc()
+
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:
+                pass
+        try:
+            _send_message(conn, {"exit_code": exit_code})
+        except OSError:
+            pass
+        os._exit(exit_code)
+
+
+def _prepare_fork():
+    """Release resources of bootstrap which must not be shared by children.
+
+    Session of global 'ayon_api' connection keeps pooled sockets which
+        would be used by all children at once, so the session is closed
+        and children do requests with their own sockets. Threads are not
+        running in children, so background trash cleanup is finished first.
+    """
+    control = sys.modules.get("ayon_common.distribution.control")
+    if control is not None:
+        control.wait_for_trash_cleanup()
+
+    ayon_api = sys.modules.get("ayon_api")
+    if ayon_api is not None and ayon_api.is_connection_created():
+        ayon_api.get_server_api_connection().close_session()
+
+
+def serve_forkserver(
+    socket_path: str,
+    bootstrap_env: Dict[str, Optional[str]],
+    handler: Callable[[List[str], Dict[str, Any]], Optional[int]],
+    idle_timeout: Optional[int] = None,
+    lifetime: Optional[int] = None,
+    lock_fd: Optional[int] = None,
+):
+    """Serve requests of AYON launcher processes.
+
+    Each request is handled in a forked child process which calls
+        'handler' with arguments and additional data of the request.
+
+    Args:
+        socket_path (str): Path to socket.
+        bootstrap_env (dict[str, Optional[str]]): Environment changes done
+            by bootstrap applied on top of environment of each request.
+            Keys with 'None' value are removed. Api key of request is
+            never changed.
+        handler (Callable[[list[str], dict[str, Any]], Optional[int]]):
+            Function running the process logic in child, returns exit code.
+        idle_timeout (Optional[int]): Seconds after which forkserver stops
+            if it did not get a request.
+        lifetime (Optional[int]): Seconds after which forkserver stops.
+        lock_fd (Optional[int]): File descriptor of forkserver lock, it is
+            closed in children.
+
+    """
+    if idle_timeout is None:
+        idle_timeout = get_forkserver_idle_timeout()
+    if lifetime is None:
+        lifetime = get_forkserver_lifetime()
+
+    _prepare_fork()
+    # Children are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    server = _create_server_socket(socket_path)
+    socket_inode = os.stat(socket_path).st_ino
+    end_time = time.monotonic() + lifetime
+    try:
+        while True:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            server.settimeout(min(idle_timeout, remaining))
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+
+            fds = []
+            try:
+                conn.settimeout(None)
+                if not _is_same_user(conn):
+                    conn.close()
+                    continue
+                _, fds, _, _ = socket.recv_fds(conn, len(_FDS_HEADER), 3)
+                with conn.makefile("rb") as stream:
+                    request = json.loads(stream.readline())
+            except (OSError, ValueError):
+                for fd in fds:
+                    os.close(fd)
+                conn.close()
+                continue
+
+            pid = os.fork()
+            if pid == 0:
+                server.close()
+                _run_child(
+                    conn, fds, request, bootstrap_env, handler, lock_fd
+                )
+
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+
+    finally:
+        server.close()
+        # Remove socket only if was not replaced by other forkserver
+        try:
+            if os.stat(socket_path).st_ino == socket_inode:
+                os.remove(socket_path)
+        except OSError:
+            pass
@@ -6,6 +6,21 @@ import tempfile
 
 from ayon_common.utils import get_ayon_launch_args
 
+from .offline import (
+    is_offline_mode_forced,
+    is_offline_fallback_enabled,
+    get_offline_timeout,
+    get_bundle_request_key,
+    save_offline_snapshot,
+    load_offline_snapshot,
+)
+from .bootstrap_snapshot import (
+    BOOTSTRAP_SNAPSHOT_ENV_KEY,
+    get_env_changes,
+    save_bootstrap_snapshot,
+    load_bootstrap_snapshot,
+)
+
 
 def show_startup_error(title, message, detail=None):
     """Show startup error message.
@@ -42,3 +57,20 @@ def show_startup_error(title, message, detail=None):
         subprocess.call(args)
     finally:
         os.remove(filepath)
+
+
+__all__ = (
+    "is_offline_mode_forced",
+    "is_offline_fallback_enabled",
+    "get_offline_timeout",
+    "get_bundle_request_key",
+    "save_offline_snapshot",
+    "load_offline_snapshot",
+
+    "BOOTSTRAP_SNAPSHOT_ENV_KEY",
+    "get_env_changes",
+    "save_bootstrap_snapshot",
+    "load_bootstrap_snapshot",
+
+    "show_startup_error",
+)
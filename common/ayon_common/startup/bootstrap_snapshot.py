@@ -0,0 +1,175 @@
+"""Bootstrap snapshot reused by child AYON launcher processes.
+
+AYON launcher stores result of bootstrap (environment changes and paths
+added to 'sys.path') to a snapshot file and passes path to the file to
+child processes using 'AYON_BOOTSTRAP_SNAPSHOT' environment variable.
+Child process started with the same executable, server and bundle applies
+the snapshot instead of server requests and distribution checks.
+
+Snapshot is signed with a machine local secret, and is valid only while
+all stored paths exist with the same modification time.
+"""
+import os
+import sys
+import hmac
+import json
+import uuid
+import hashlib
+
+from ayon_common.utils import get_launcher_local_dir
+
+BOOTSTRAP_SNAPSHOT_ENV_KEY = "AYON_BOOTSTRAP_SNAPSHOT"
+SNAPSHOT_VERSION = 1
+# Environment variables that are never stored to snapshot
+_SECRET_ENV_KEYS = {"AYON_API_KEY"}
+# Environment variables of requested bundle which must match the snapshot
+_BUNDLE_ENV_KEYS = ("AYON_BUNDLE_NAME", "AYON_USE_DEV", "AYON_USE_STAGING")
+
+
+def _get_snapshot_secret():
+    filepath = get_launcher_local_dir("bootstrap", "secret")
+    try:
+        with open(filepath, "rb") as stream:
+            secret = stream.read()
+        if secret:
+            return secret
+    except OSError:
+        pass
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    secret = os.urandom(32)
+    tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as stream:
+        stream.write(secret)
+    os.replace(tmp_path, filepath)
+    return secret
+
+
+def _sign(content):
+    return hmac.new(
+        _get_snapshot_secret(), content.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+
+def _get_path_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_env_changes(env_before):
+    """Environment changes done since 'env_before' was captured.
+
+    Args:
+        env_before (dict[str, str]): Copy of environment before changes.
+
+    Returns:
+        dict[str, Union[str, None]]: Changed environment variables, removed
+            variables have 'None' value.
+    """
+
+    changes = {
+        key: value
+        for key, value in os.environ.items()
+        if env_before.get(key) != value
+    }
+    for key in env_before:
+        if key not in os.environ:
+            changes[key] = None
+    return changes
+
+
+def save_bootstrap_snapshot(server_url, env_changes, sys_paths):
+    """Store bootstrap snapshot.
+
+    Args:
+        server_url (str): Server url.
+        env_changes (dict[str, Union[str, None]]): Environment changes done
+            by bootstrap.
+        sys_paths (list[str]): Paths added to 'sys.path' by bootstrap.
+
+    Returns:
+        str: Path to snapshot file.
+    """
+
+    env = {
+        key: value
+        for key, value in env_changes.items()
+        if key not in _SECRET_ENV_KEYS
+    }
+    # Bundle variables are always stored to be validated in child
+    for key in _BUNDLE_ENV_KEYS:
+        env[key] = os.environ.get(key) or None
+
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "executable": sys.executable,
+        "ayon_version": os.environ.get("AYON_VERSION"),
+        "server_url": server_url,
+        "env": env,
+        "sys_paths": [
+            [path, _get_path_mtime(path)]
+            for path in sys_paths
+        ],
+    }
+    content = json.dumps(data, sort_keys=True)
+    signature = _sign(content)
+    filepath = get_launcher_local_dir(
+        "bootstrap", f"{signature[:16]}.json"
+    )
+    if not os.path.exists(filepath):
+        tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as stream:
+            json.dump({"data": content, "signature": signature}, stream)
+        os.replace(tmp_path, filepath)
+    return filepath
+
+
+def load_bootstrap_snapshot(filepath, server_url):
+    """Load bootstrap snapshot if is valid for current process.
+
+    Snapshot is valid if signature matches, was created by the same
+        executable for the same server and bundle, and all stored paths
+        exist with the same modification time.
+
+    Args:
+        filepath (str): Path to snapshot file.
+        server_url (str): Server url of current process.
+
+    Returns:
+        Union[dict[str, Any], None]: Snapshot data, or None if snapshot
+            is not valid.
+    """
+
+    try:
+        with open(filepath, "r") as stream:
+            stored = json.load(stream)
+        content = stored["data"]
+        signature = stored["signature"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if not hmac.compare_digest(_sign(content), signature):
+        return None
+
+    data = json.loads(content)
+    if (
+        data.get("version") != SNAPSHOT_VERSION
+        or data["executable"] != sys.executable
+        or data["ayon_version"] != os.environ.get("AYON_VERSION")
+        or data["server_url"] != server_url
+    ):
+        return None
+
+    env = data["env"]
+    for key in _BUNDLE_ENV_KEYS:
+        if (os.environ.get(key) or None) != env.get(key):
+            return None
+
+    for path, mtime in data["sys_paths"]:
+        if _get_path_mtime(path) != mtime:
+            return None
+    data["sys_paths"] = [path for path, _ in data["sys_paths"]]
+    return data
@@ -0,0 +1,156 @@
+"""Offline boot from last successfully resolved bundle.
+
+Resolved bundle, paths of distributed addons and dependency package and
+other information needed for bootstrap are stored after each successful
+distribution. When server is not reached, AYON launcher can start from
+the stored snapshot without any server request.
+"""
+import os
+import json
+import uuid
+import hashlib
+
+from ayon_common.utils import get_launcher_local_dir
+
+SNAPSHOT_VERSION = 1
+# Timeout of server connection in seconds when snapshot can be used
+DEFAULT_OFFLINE_TIMEOUT = 3
+
+
+def is_offline_mode_forced():
+    """Offline mode was requested.
+
+    Offline mode is forced using 'AYON_OFFLINE_MODE' environment variable
+    set to '1'. Argument '--offline' forces offline mode only for current
+    process.
+
+    Returns:
+        bool: Offline mode is forced.
+    """
+
+    return os.getenv("AYON_OFFLINE_MODE") == "1"
+
+
+def is_offline_fallback_enabled():
+    """Offline snapshot is used when server is not reached.
+
+    The fallback can be disabled using 'AYON_OFFLINE_FALLBACK' environment
+    variable set to '0'.
+
+    Returns:
+        bool: Offline fallback is enabled.
+    """
+
+    return os.getenv("AYON_OFFLINE_FALLBACK") != "0"
+
+
+def get_offline_timeout():
+    """Timeout of server connection when offline snapshot can be used.
+
+    Server which does not respond in the timeout is considered as not
+    reached. The value can be changed using 'AYON_OFFLINE_TIMEOUT'
+    environment variable.
+
+    Returns:
+        float: Timeout in seconds.
+    """
+
+    timeout = DEFAULT_OFFLINE_TIMEOUT
+    value = os.environ.get("AYON_OFFLINE_TIMEOUT")
+    if value:
+        try:
+            timeout = float(value)
+        except ValueError:
+            print(
+                "Invalid value of 'AYON_OFFLINE_TIMEOUT'"
+                f" environment variable \"{value}\". Expected number."
+            )
+    return timeout
+
+
+def get_bundle_request_key():
+    """Key of requested bundle used to store snapshot.
+
+    Snapshots of production, staging, dev and explicitly requested bundles
+    are stored separately.
+
+    Returns:
+        str: Bundle request key.
+    """
+
+    bundle_name = os.getenv("AYON_BUNDLE_NAME")
+    if bundle_name:
+        return f"bundle-{bundle_name}"
+    if os.getenv("AYON_USE_DEV") == "1":
+        return "dev"
+    if os.getenv("AYON_USE_STAGING") == "1":
+        return "staging"
+    return "production"
+
+
+def get_offline_snapshot_path(server_url, request_key):
+    """Path to offline snapshot file.
+
+    Args:
+        server_url (str): Server url.
+        request_key (str): Bundle request key.
+
+    Returns:
+        str: Path to snapshot file.
+    """
+
+    key = hashlib.sha1(
+        f"{server_url.rstrip('/')}|{request_key}".encode("utf-8")
+    ).hexdigest()
+    return get_launcher_local_dir("offline", f"{key}.json")
+
+
+def save_offline_snapshot(server_url, request_key, snapshot):
+    """Store snapshot of resolved bundle.
+
+    Args:
+        server_url (str): Server url.
+        request_key (str): Bundle request key.
+        snapshot (dict[str, Any]): Data needed to boot without server.
+    """
+
+    filepath = get_offline_snapshot_path(server_url, request_key)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    data = dict(snapshot)
+    data["version"] = SNAPSHOT_VERSION
+    data["server_url"] = server_url
+    tmp_path = f"{filepath}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "w") as stream:
+        json.dump(data, stream, indent=4)
+    os.replace(tmp_path, filepath)
+
+
+def load_offline_snapshot(server_url, request_key):
+    """Load snapshot of last resolved bundle.
+
+    Snapshot is ignored if any of stored paths does not exist anymore.
+
+    Args:
+        server_url (str): Server url.
+        request_key (str): Bundle request key.
+
+    Returns:
+        Union[dict[str, Any], None]: Snapshot data or None if is not
+            available or usable.
+    """
+
+    filepath = get_offline_snapshot_path(server_url, request_key)
+    try:
+        with open(filepath, "r") as stream:
+            data = json.load(stream)
+    except (OSError, ValueError):
+        return None
+
+    if data.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    for path in data["python_paths"] + data["sys_paths"]:
+        if not os.path.exists(path):
+            return None
+    return data
+
@@ -0,0 +1,52 @@
+import os
+import json
+
+
+def test_bootstrap_snapshot(printer, temp_folder, monkeypatch):
+    """Tests that bootstrap snapshot is valid only for the same bootstrap."""
+
+    from ayon_common.startup import bootstrap_snapshot
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    monkeypatch.setenv("AYON_BUNDLE_NAME", "Bundle")
+    monkeypatch.delenv("AYON_USE_DEV", raising=False)
+    monkeypatch.delenv("AYON_USE_STAGING", raising=False)
+    addon_dir = os.path.join(temp_folder, "addons", "core_1.0.0")
+    os.makedirs(addon_dir)
+    url = "https://ayon.io"
+
+    filepath = bootstrap_snapshot.save_bootstrap_snapshot(
+        url,
+        {"AYON_API_KEY": "secret", "AYON_ADDONS_DIR": "addons"},
+        [addon_dir],
+    )
+    with open(filepath, "r") as stream:
+        content = stream.read()
+    assert "secret" not in content
+
+    snapshot = bootstrap_snapshot.load_bootstrap_snapshot(filepath, url)
+    assert snapshot["sys_paths"] == [addon_dir]
+    assert snapshot["env"]["AYON_ADDONS_DIR"] == "addons"
+    assert snapshot["env"]["AYON_BUNDLE_NAME"] == "Bundle"
+
+    # Different server or requested bundle
+    assert bootstrap_snapshot.load_bootstrap_snapshot(
+        filepath, "https://other.io"
+    ) is None
+    monkeypatch.setenv("AYON_USE_STAGING", "1")
+    assert bootstrap_snapshot.load_bootstrap_snapshot(filepath, url) is None
+    monkeypatch.delenv("AYON_USE_STAGING")
+
+    # Modified snapshot
+    data = json.loads(content)
+    data["data"] = data["data"].replace("addons", "other")
+    with open(filepath, "w") as stream:
+        json.dump(data, stream)
+    assert bootstrap_snapshot.load_bootstrap_snapshot(filepath, url) is None
+    with open(filepath, "w") as stream:
+        stream.write(content)
+
+    # Changed content of distributed directory
+    assert bootstrap_snapshot.load_bootstrap_snapshot(filepath, url)
+    os.utime(addon_dir, ns=(0, 0))
+    assert bootstrap_snapshot.load_bootstrap_snapshot(filepath, url) is None
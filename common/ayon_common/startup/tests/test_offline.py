@@ -0,0 +1,46 @@
+import os
+
+from ayon_common.startup import offline
+
+
+def test_offline_snapshot(printer, temp_folder, monkeypatch):
+    """Tests that offline snapshot is usable only while paths exist."""
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    addon_dir = os.path.join(temp_folder, "addons", "core_1.0.0")
+    os.makedirs(addon_dir)
+    url = "https://ayon.io"
+    snapshot = {
+        "bundle_name": "Bundle",
+        "python_paths": [],
+        "sys_paths": [addon_dir],
+    }
+
+    assert offline.load_offline_snapshot(url, "production") is None
+    offline.save_offline_snapshot(url, "production", snapshot)
+    data = offline.load_offline_snapshot(url + "/", "production")
+    assert data["bundle_name"] == "Bundle"
+    assert data["server_url"] == url
+
+    # Snapshots are stored per server and requested bundle
+    assert offline.load_offline_snapshot(url, "staging") is None
+    assert offline.load_offline_snapshot(
+        "https://other.io", "production"
+    ) is None
+
+    # Distributed directory was removed
+    os.rmdir(addon_dir)
+    assert offline.load_offline_snapshot(url, "production") is None
+
+
+def test_offline_timeout(printer, monkeypatch):
+    """Tests timeout of server connection when snapshot can be used."""
+
+    monkeypatch.delenv("AYON_OFFLINE_TIMEOUT", raising=False)
+    assert offline.get_offline_timeout() == offline.DEFAULT_OFFLINE_TIMEOUT
+
+    monkeypatch.setenv("AYON_OFFLINE_TIMEOUT", "0.5")
+    assert offline.get_offline_timeout() == 0.5
+
+    monkeypatch.setenv("AYON_OFFLINE_TIMEOUT", "invalid")
+    assert offline.get_offline_timeout() == offline.DEFAULT_OFFLINE_TIMEOUT
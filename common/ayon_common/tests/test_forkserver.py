@@ -0,0 +1,251 @@
+import os
+import sys
+import time
+import socket
+import subprocess
+
+import pytest
+
+from ayon_common.forkserver import run_in_forkserver
+
+_COMMON_DIR = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)
+)))
+
+
+_FORKSERVER_SCRIPT = """
+import os
+import sys
+
+sys.path.insert(0, {common_dir!r})
+from ayon_common.forkserver import serve_forkserver
+
+
+def handler(argv, data):
+    print(
+        "|".join(argv),
+        os.environ["TEST_VALUE"],
+        os.environ["TEST_BOOTSTRAP"],
+        os.environ.get("AYON_API_KEY"),
+        os.getcwd(),
+        data["value"],
+    )
+    return 3
+
+
+serve_forkserver(
+    {socket_path!r},
+    {{"TEST_BOOTSTRAP": "bootstrap", "AYON_API_KEY": "bootstrap_token"}},
+    handler,
+    idle_timeout=10,
+    lifetime=30,
+)
+"""
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Forkserver is Linux only"
+)
+def test_forkserver(printer, temp_folder, capfd):
+    """Tests running processes in forkserver."""
+
+    socket_path = os.path.join(temp_folder, "forkserver.sock")
+    assert run_in_forkserver(socket_path, [], {}, temp_folder) is None
+
+    server_process = subprocess.Popen([
+        sys.executable,
+        "-c",
+        _FORKSERVER_SCRIPT.format(
+            common_dir=_COMMON_DIR, socket_path=socket_path
+        ),
+    ])
+    try:
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.05)
+
+        env = {
+            "TEST_VALUE": "value",
+            "TEST_BOOTSTRAP": "original",
+            "AYON_API_KEY": "token",
+        }
+        for idx in range(2):
+            exit_code = run_in_forkserver(
+                socket_path,
+                ["start.py", f"arg{idx}"],
+                env,
+                temp_folder,
+                {"value": idx},
+            )
+            assert exit_code == 3
+            output = capfd.readouterr().out
+            assert output == (
+                f"start.py|arg{idx} value bootstrap token"
+                f" {temp_folder} {idx}\n"
+            )
+    finally:
+        server_process.terminate()
+        server_process.wait()
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Forkserver is Linux only"
+)
+def test_forkserver_start(printer, temp_folder):
+    """Tests that only one forkserver is started and its output is stored."""
+
+    from ayon_common import forkserver
+
+    socket_path = os.path.join(temp_folder, "forkserver.sock")
+    args = [sys.executable, "-c", "print('forkserver started')"]
+    env = dict(os.environ)
+
+    # Other forkserver holds the lock
+    lock_fd = forkserver.lock_forkserver(socket_path)
+    assert lock_fd is not None
+    assert forkserver.lock_forkserver(socket_path) is None
+    assert not forkserver.start_forkserver(socket_path, args, env)
+    os.close(lock_fd)
+
+    # Forkserver failed recently
+    forkserver.set_forkserver_failed(socket_path, True)
+    assert not forkserver.start_forkserver(socket_path, args, env)
+    forkserver.set_forkserver_failed(socket_path, False)
+
+    assert forkserver.start_forkserver(socket_path, args, env)
+    log_path = forkserver.get_forkserver_log_path(socket_path)
+    content = ""
+    for _ in range(100):
+        with open(log_path, "r") as stream:
+            content = stream.read()
+        if content:
+            break
+        time.sleep(0.05)
+    assert content == "forkserver started\n"
+
+
+_FORKSERVER_CONNECTION_SCRIPT = """
+import os
+import sys
+
+sys.path.insert(0, {common_dir!r})
+import ayon_api
+from ayon_common.forkserver import serve_forkserver
+from ayon_common.distribution.control import cleanup_trash_dir
+
+
+def handler(argv, data):
+    con = ayon_api.get_server_api_connection()
+    print(
+        con._session is None,
+        con.get_user()["name"],
+        os.path.exists({trash_filepath!r}),
+    )
+    return 0
+
+
+# Connection of bootstrap has session with pooled sockets
+ayon_api.get_server_api_connection().get_info()
+cleanup_trash_dir({trash_dirpath!r})
+serve_forkserver({socket_path!r}, {{}}, handler, idle_timeout=10, lifetime=30)
+"""
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Forkserver is Linux only"
+)
+def test_forkserver_children_connection(printer, temp_folder, capfd):
+    """Tests that forked children don't share connection of forkserver."""
+
+    from ayon_common.distribution.tests.local_server import (
+        LocalAyonServer,
+    )
+
+    socket_path = os.path.join(temp_folder, "forkserver.sock")
+    trash_dirpath = os.path.join(temp_folder, ".trash")
+    trash_filepath = os.path.join(trash_dirpath, "removed_file")
+    os.makedirs(trash_dirpath)
+    with open(trash_filepath, "w") as stream:
+        stream.write("content")
+
+    with LocalAyonServer() as server:
+        env = dict(os.environ)
+        env["AYON_SERVER_URL"] = server.url
+        env["AYON_API_KEY"] = "token"
+        server_process = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                _FORKSERVER_CONNECTION_SCRIPT.format(
+                    common_dir=_COMMON_DIR,
+                    socket_path=socket_path,
+                    trash_dirpath=trash_dirpath,
+                    trash_filepath=trash_filepath,
+                ),
+            ],
+            env=env,
+        )
+        try:
+            for _ in range(100):
+                if os.path.exists(socket_path):
+                    break
+                time.sleep(0.05)
+
+            for _ in range(2):
+                exit_code = run_in_forkserver(
+                    socket_path, ["start.py"], env, temp_folder
+                )
+                assert exit_code == 0
+                output = capfd.readouterr().out
+                assert output == "True admin False\n"
+        finally:
+            server_process.terminate()
+            server_process.wait()
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="Forkserver is Linux only"
+)
+def test_forkserver_private_dir(printer, temp_folder):
+    """Tests that socket in directory accessible by others is not used."""
+
+    from ayon_common import forkserver
+
+    dirpath = os.path.join(temp_folder, "shared")
+    os.makedirs(dirpath)
+    os.chmod(dirpath, 0o755)
+    socket_path = os.path.join(dirpath, "forkserver.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(1)
+    try:
+        assert run_in_forkserver(socket_path, [], {}, temp_folder) is None
+        assert forkserver.lock_forkserver(socket_path) is None
+        assert not forkserver.start_forkserver(
+            socket_path, [sys.executable, "-c", ""], dict(os.environ)
+        )
+
+        # Symlink to private directory
+        link_path = os.path.join(temp_folder, "link")
+        os.chmod(dirpath, 0o700)
+        os.symlink(dirpath, link_path)
+        assert forkserver.lock_forkserver(
+            os.path.join(link_path, "forkserver.sock")
+        ) is None
+    finally:
+        server.close()
+
+
+def test_forkserver_socket_path(printer, monkeypatch):
+    """Tests that processes with different api key use other forkserver."""
+
+    from ayon_common.forkserver import get_forkserver_socket_path
+
+    monkeypatch.setenv("AYON_API_KEY", "token")
+    socket_path = get_forkserver_socket_path()
+    assert "token" not in socket_path
+    assert get_forkserver_socket_path() == socket_path
+
+    monkeypatch.setenv("AYON_API_KEY", "other_token")
+    assert get_forkserver_socket_path() != socket_path
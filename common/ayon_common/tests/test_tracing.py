@@ -0,0 +1,69 @@
+import os
+import json
+import time
+
+from ayon_common import tracing
+
+
+def test_trace_spans(printer, temp_folder, monkeypatch):
+    """Tests nested spans, trace file and summary."""
+
+    monkeypatch.setenv("AYON_TRACE", "1")
+    monkeypatch.setattr(tracing, "_EVENTS", [])
+
+    @tracing.traced(category="test")
+    def load_addons():
+        time.sleep(0.01)
+
+    with tracing.trace_span("bootstrap"):
+        with tracing.trace_span("connect", url="https://ayon.io"):
+            time.sleep(0.01)
+        load_addons()
+
+    events = {event["name"]: event for event in tracing.get_trace_events()}
+    assert set(events) == {"bootstrap", "connect", "load_addons"}
+    root = events["bootstrap"]
+    for name in ("connect", "load_addons"):
+        event = events[name]
+        assert event["ts"] >= root["ts"]
+        assert event["ts"] + event["dur"] <= root["ts"] + root["dur"]
+    assert events["connect"]["args"] == {"url": "https://ayon.io"}
+    assert events["load_addons"]["cat"] == "test"
+    assert (
+        events["connect"]["ts"] + events["connect"]["dur"]
+        <= events["load_addons"]["ts"]
+    )
+
+    summary = tracing.get_trace_summary()
+    printer(summary)
+    assert summary.startswith("bootstrap ")
+    assert summary.index("connect ") < summary.index("load_addons ")
+
+    filepath = tracing.write_trace(os.path.join(temp_folder, "trace.json"))
+    with open(filepath, "r") as stream:
+        data = json.load(stream)
+    assert data["displayTimeUnit"] == "ms"
+    assert len(data["traceEvents"]) == 3
+    for event in data["traceEvents"]:
+        assert event["ph"] == "X"
+        assert event["pid"] == os.getpid()
+        assert {"name", "cat", "ts", "dur", "tid"} <= set(event)
+
+    # Output path from environment
+    filepath = os.path.join(temp_folder, "env", "trace.json")
+    monkeypatch.setenv("AYON_TRACE_FILE", filepath)
+    assert tracing.write_trace() == filepath
+    assert os.path.exists(filepath)
+
+
+def test_trace_disabled(printer, temp_folder, monkeypatch):
+    """Tests that nothing is recorded when tracing is disabled."""
+
+    monkeypatch.delenv("AYON_TRACE", raising=False)
+    monkeypatch.setattr(tracing, "_EVENTS", [])
+
+    with tracing.trace_span("bootstrap"):
+        pass
+    assert tracing.get_trace_events() == []
+    assert tracing.write_trace(os.path.join(temp_folder, "trace.json")) is None
+    assert not os.listdir(temp_folder)
@@ -0,0 +1,93 @@
+import os
+
+
+def test_executables_registry(printer, temp_folder, monkeypatch):
+    """Tests cached versions and latest pointer of executables info."""
+
+    from ayon_common import utils
+    from shim import shim_start
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    executables = []
+    for version in ("1.0.0", "1.2.0", "1.1.0"):
+        root = os.path.join(temp_folder, f"ayon-{version}")
+        os.makedirs(root)
+        with open(os.path.join(root, "version.py"), "w") as stream:
+            stream.write(f"__version__ = \"{version}\"\n")
+        executable = os.path.join(root, "ayon")
+        with open(executable, "w") as stream:
+            stream.write("")
+        executables.append(executable)
+    utils.store_executables(executables)
+
+    info = utils.get_executables_info(check_cleanup=False)
+    assert info["latest"]["executable"] == executables[1]
+    assert shim_start.get_latest_executable(info).path == executables[1]
+
+    # Cached versions are used while 'version.py' files did not change
+    loaded = []
+
+    def _load_executable_version(executable):
+        loaded.append(executable)
+        return utils.load_version_from_root(os.path.dirname(executable))
+
+    monkeypatch.setattr(
+        utils, "load_executable_version", _load_executable_version
+    )
+    items = utils.get_executables_info_by_version("1.1.0")
+    assert [item["executable"] for item in items] == [executables[2]]
+    assert loaded == []
+
+    # Changed 'version.py' invalidates cached version and latest pointer
+    with open(
+        os.path.join(os.path.dirname(executables[1]), "version.py"), "w"
+    ) as stream:
+        stream.write("__version__ = \"0.9.0\"\n")
+    assert shim_start.get_latest_executable(info) is None
+    assert utils.get_executables_info_by_version("0.9.0")
+    assert loaded == [executables[1]]
+
+    info = utils.get_executables_info(check_cleanup=False)
+    assert info["latest"]["executable"] == executables[2]
+    assert (
+        shim_start.find_latest_executable(info).path
+        == shim_start.get_latest_executable(info).path
+    )
+
+    # Executable without loadable version is not used
+    os.remove(os.path.join(os.path.dirname(executables[2]), "version.py"))
+    assert utils.get_executables_info_by_version("1.1.0") == []
+    info = utils.get_executables_info(check_cleanup=False)
+    assert info["latest"]["executable"] == executables[0]
+
+
+def test_launcher_init_stamp(printer, temp_folder, monkeypatch):
+    """Tests that init stamp is invalidated by version changes."""
+
+    from ayon_common import utils
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    monkeypatch.setenv("AYON_VERSION", "1.0.0")
+    monkeypatch.setattr(utils, "IS_BUILT_APPLICATION", True)
+    monkeypatch.setattr(utils.platform, "system", lambda: "Linux")
+
+    assert not utils.is_launcher_init_stamp_valid()
+    utils.store_launcher_init_stamp()
+    # Executables info was not stored yet
+    assert not utils.is_launcher_init_stamp_valid()
+
+    utils.store_executables_info(utils.get_executables_info())
+    assert utils.is_launcher_init_stamp_valid()
+
+    # Different launcher version
+    monkeypatch.setenv("AYON_VERSION", "1.0.1")
+    assert not utils.is_launcher_init_stamp_valid()
+    utils.store_launcher_init_stamp()
+    assert utils.is_launcher_init_stamp_valid()
+
+    # Different installed shim version
+    shim_root = os.path.join(temp_folder, "shim")
+    os.makedirs(shim_root)
+    with open(os.path.join(shim_root, "version"), "w") as stream:
+        stream.write("1.1.0")
+    assert not utils.is_launcher_init_stamp_valid()
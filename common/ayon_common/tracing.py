@@ -0,0 +1,186 @@
+"""Tracing of bootstrap phases.
+
+Spans are recorded as Chrome trace events and can be opened in
+'chrome://tracing' or 'https://ui.perfetto.dev'. Tracing is enabled using
+'AYON_TRACE' environment variable set to '1' (or '--trace' argument).
+Output file can be defined using 'AYON_TRACE_FILE' environment variable,
+otherwise it is stored to 'traces' in launcher local dir.
+
+When tracing is disabled, spans don't record anything.
+"""
+import os
+import json
+import time
+import datetime
+import threading
+import functools
+import contextlib
+from typing import Optional, Any, Dict, List
+
+_EVENTS: List[Dict[str, Any]] = []
+_LOCK = threading.Lock()
+
+
+def is_tracing_enabled() -> bool:
+    """Tracing is enabled.
+
+    Returns:
+        bool: Tracing is enabled.
+
+    """
+    return os.getenv("AYON_TRACE") == "1"
+
+
+def _now_us() -> int:
+    return time.perf_counter_ns() // 1000
+
+
+@contextlib.contextmanager
+def trace_span(name: str, category: str = "bootstrap", **args):
+    """Record duration of a code block as span.
+
+    Spans called inside other spans in the same thread are nested.
+
+    Args:
+        name (str): Span name.
+        category (str): Span category.
+        **args (Any): Additional information shown with span.
+
+    """
+    if not is_tracing_enabled():
+        yield
+        return
+
+    start = _now_us()
+    try:
+        yield
+    finally:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start,
+            "dur": _now_us() - start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {
+                key: str(value) for key, value in args.items()
+            }
+        with _LOCK:
+            _EVENTS.append(event)
+
+
+def traced(name: Optional[str] = None, category: str = "bootstrap"):
+    """Decorator recording each call of function as span.
+
+    Args:
+        name (Optional[str]): Span name. Function name is used if
+            not passed.
+        category (str): Span category.
+
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_trace_events() -> List[Dict[str, Any]]:
+    """Recorded trace events.
+
+    Returns:
+        list[dict[str, Any]]: Copy of recorded events.
+
+    """
+    with _LOCK:
+        return list(_EVENTS)
+
+
+def get_trace_summary() -> str:
+    """One line summary of top level spans.
+
+    Returns:
+        str: Summary with duration of top level spans.
+
+    """
+    events = sorted(get_trace_events(), key=lambda e: e["ts"])
+    top_level = []
+    last_end = None
+    for event in events:
+        if last_end is not None and event["ts"] < last_end:
+            continue
+        top_level.append(event)
+        last_end = event["ts"] + event["dur"]
+
+    # Summarize children of the only top level span
+    if len(top_level) == 1:
+        root = top_level[0]
+        root_end = root["ts"] + root["dur"]
+        children = []
+        last_end = None
+        for event in events:
+            if event is root or event["ts"] + event["dur"] > root_end:
+                continue
+            if last_end is not None and event["ts"] < last_end:
+                continue
+            children.append(event)
+            last_end = event["ts"] + event["dur"]
+        parts = [
+            f"{event['name']} {event['dur'] / 1000000:.2f}s"
+            for event in children
+        ]
+        summary = f"{root['name']} {root['dur'] / 1000000:.2f}s"
+        if parts:
+            summary += f" ({', '.join(parts)})"
+        return summary
+
+    return ", ".join(
+        f"{event['name']} {event['dur'] / 1000000:.2f}s"
+        for event in top_level
+    )
+
+
+def _get_default_trace_filepath() -> str:
+    from ayon_common.utils import get_launcher_local_dir
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return get_launcher_local_dir(
+        "traces", f"trace_{timestamp}_{os.getpid()}.json"
+    )
+
+
+def write_trace(filepath: Optional[str] = None) -> Optional[str]:
+    """Write recorded events to Chrome trace file.
+
+    Args:
+        filepath (Optional[str]): Output path. Value of 'AYON_TRACE_FILE'
+            or default path in launcher local dir is used if not passed.
+
+    Returns:
+        Optional[str]: Path to trace file or None if tracing is disabled.
+
+    """
+    if not is_tracing_enabled():
+        return None
+
+    if filepath is None:
+        filepath = os.getenv("AYON_TRACE_FILE")
+    if not filepath:
+        filepath = _get_default_trace_filepath()
+
+    dirpath = os.path.dirname(filepath)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    with open(filepath, "w") as stream:
+        json.dump(
+            {"traceEvents": get_trace_events(), "displayTimeUnit": "ms"},
+            stream
+        )
+    return filepath
@@ -1,19 +1,21 @@
 import os
 import sys
+import time
 import platform
 import json
 import datetime
+import contextlib
 import subprocess
 import zipfile
 import tarfile
 import warnings
 import shutil
 from uuid import UUID
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Iterable, List, Dict, Tuple, Any
 
 import appdirs
 import semver
-from ayon_api.constants import SITE_ID_ENV_KEY
 
 DATE_FMT = "%Y-%m-%d %H:%M:%S"
 CLEANUP_INTERVAL = 2  # days
@@ -25,6 +27,10 @@ IMPLEMENTED_ARCHIVE_FORMATS = {
     ".zip", ".tar", ".tgz", ".tar.gz", ".tar.xz", ".tar.bz2"
 }
 
+DEFAULT_EXTRACT_WORKERS = 8
+# Smaller zip archives are extracted in a single thread
+PARALLEL_EXTRACT_MIN_MEMBERS = 100
+
 ExecutablesInfo = Dict[str, Any]
 
 
@@ -182,6 +188,9 @@ def get_local_site_id() -> str:
         str: Site id.
 
     """
+    # Imported here, 'ayon_api' is not needed by UI helper scripts
+    from ayon_api.constants import SITE_ID_ENV_KEY
+
     # used for background syncing
     site_id = os.environ.get(SITE_ID_ENV_KEY)
     if site_id:
@@ -200,6 +209,41 @@ def get_local_site_id() -> str:
     return site_id
 
 
+@contextlib.contextmanager
+def file_lock(filepath: str):
+    """Exclusive lock shared between processes.
+
+    Blocks until the lock is acquired. Lock is released by operating system
+        when process ends, so it is not left locked after a crash.
+
+    Args:
+        filepath (str): Path to lock file.
+
+    """
+    dirpath = os.path.dirname(filepath)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    fd = os.open(filepath, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if platform.system().lower() == "windows":
+            import msvcrt
+
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        else:
+            import fcntl
+
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the file releases the lock
+        os.close(fd)
+
+
 def get_ayon_launch_args(*args: str) -> List[str]:
     """Launch arguments that can be used to launch ayon process.
 
@@ -270,17 +314,49 @@ def get_executables_info(
     return get_executables_info(check_cleanup=False)
 
 
+def _get_latest_executable_item(
+    info: ExecutablesInfo
+) -> Optional[Dict[str, Any]]:
+    latest_item = None
+    latest_version = None
+    for item in info.get("available_versions", []):
+        executable = item.get("executable")
+        version = item.get("version")
+        if not executable or not version or not os.path.exists(executable):
+            continue
+        try:
+            semver_version = semver.VersionInfo.parse(version)
+        except ValueError:
+            continue
+        if latest_version is None or semver_version > latest_version:
+            latest_item = item
+            latest_version = semver_version
+
+    if latest_item is None:
+        return None
+    return {
+        "executable": latest_item["executable"],
+        "version": latest_item["version"],
+        "version_stat": latest_item.get("version_stat"),
+    }
+
+
 def store_executables_info(info: ExecutablesInfo):
     """Store information about executables.
 
-    This will override existing information so use it wisely.
+    This will override existing information so use it wisely. Pointer to
+        the latest available executable is updated, so shim can use it
+        without loading version of each executable.
 
     """
     filepath = get_executables_info_filepath()
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
-    with open(filepath, "w") as stream:
+    info["latest"] = _get_latest_executable_item(info)
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as stream:
         json.dump(info, stream, indent=4)
+    os.replace(tmp_path, filepath)
 
 
 def load_version_from_file(filepath: str) -> str:
@@ -333,6 +409,65 @@ def load_executable_version(executable: str) -> Optional[str]:
     return load_version_from_root(os.path.dirname(executable))
 
 
+def get_version_file_stat(executable: str) -> Optional[List[int]]:
+    """Modification time and size of 'version.py' of executable.
+
+    Used to validate version of executable cached in executables info.
+
+    Args:
+        executable (str): Path to executable.
+
+    Returns:
+        Optional[list[int]]: Modification time in nanoseconds and size,
+            or None if 'version.py' does not exist.
+
+    """
+    if not executable:
+        return None
+    version_filepath = os.path.join(
+        os.path.dirname(executable), "version.py"
+    )
+    try:
+        stat = os.stat(version_filepath)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _update_item_version(item: Dict[str, Any]) -> bool:
+    """Update version of executables info item if 'version.py' changed.
+
+    Version in the item is used without loading 'version.py' if the file
+        has the same modification time and size as when it was loaded.
+        Version is unset if 'version.py' is missing or can't be loaded.
+
+    Args:
+        item (dict[str, Any]): Item of available versions.
+
+    Returns:
+        bool: Item was changed.
+
+    """
+    executable = item.get("executable")
+    version_stat = get_version_file_stat(executable)
+    if (
+        version_stat is not None
+        and item.get("version")
+        and item.get("version_stat") == version_stat
+    ):
+        return False
+
+    version = load_executable_version(executable)
+    if (
+        version == item.get("version")
+        and version_stat == item.get("version_stat")
+    ):
+        return False
+    item["version"] = version
+    item["version_stat"] = version_stat
+    return True
+
+
 def store_executables(executables: Iterable[str]):
     """Store information about executables.
 
@@ -354,6 +489,7 @@ def store_executables(executables: Iterable[str]):
             executable = os.path.join(root, filename)
 
         version = load_version_from_root(root)
+        version_stat = get_version_file_stat(executable)
 
         match_item = None
         item_is_new = True
@@ -364,7 +500,10 @@ def store_executables(executables: Iterable[str]):
                 continue
 
             # Version has changed, update it
-            if item.get("version") != version:
+            if (
+                item.get("version") != version
+                or item.get("version_stat") != version_stat
+            ):
                 match_item = item
             item_is_new = False
             break
@@ -377,6 +516,7 @@ def store_executables(executables: Iterable[str]):
 
         match_item.update({
             "version": version,
+            "version_stat": version_stat,
             "executable": executable,
             "added": datetime.datetime.now().strftime("%y-%m-%d-%H%M"),
         })
@@ -419,14 +559,21 @@ def get_executables_info_by_version(
     available_versions = info.setdefault("available_versions", [])
     if validate:
         _available_versions = []
+        changed = False
         for item in available_versions:
             executable = item.get("executable")
             if not executable or not os.path.exists(executable):
                 continue
 
-            executable_version = load_executable_version(executable)
-            if executable_version == version:
+            if _update_item_version(item):
+                changed = True
+            # Skip executables with unknown version
+            if item.get("version"):
                 _available_versions.append(item)
+
+        # Store loaded versions for next validation
+        if changed:
+            store_executables_info(info)
         available_versions = _available_versions
     return [
         item
@@ -460,9 +607,7 @@ def cleanup_executables_info():
         if not executable or not os.path.exists(executable):
             continue
 
-        version = load_executable_version(executable)
-        if version and item.get("version") != version:
-            item["version"] = version
+        _update_item_version(item)
         new_executables.append(item)
 
     info["available_versions"] = new_executables
@@ -576,15 +721,60 @@ class ZipFileLongPaths(zipfile.ZipFile):
     """
     _is_windows = platform.system().lower() == "windows"
 
-    def _extract_member(self, member, tpath, pwd):
+    def _long_path(self, tpath):
         if self._is_windows:
             tpath = os.path.abspath(tpath)
             if tpath.startswith("\\\\"):
                 tpath = "\\\\?\\UNC\\" + tpath[2:]
             else:
                 tpath = "\\\\?\\" + tpath
+        return tpath
 
-        return super()._extract_member(member, tpath, pwd)
+    def _extract_member(self, member, tpath, pwd):
+        return super()._extract_member(member, self._long_path(tpath), pwd)
+
+    def get_member_path(self, member, tpath):
+        """Path where member will be extracted.
+
+        Follows the same path sanitization as 'zipfile' does on extraction.
+
+        Args:
+            member (zipfile.ZipInfo): Zip member.
+            tpath (str): Target extraction directory.
+
+        Returns:
+            str: Path of extracted member.
+        """
+
+        arcname = member.filename.replace("/", os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        invalid_path_parts = ("", os.path.curdir, os.path.pardir)
+        arcname = os.path.sep.join(
+            part
+            for part in arcname.split(os.path.sep)
+            if part not in invalid_path_parts
+        )
+        if self._is_windows:
+            arcname = self._sanitize_windows_name(arcname, os.path.sep)
+        return self._long_path(os.path.join(tpath, arcname))
+
+    def get_member_dirpath(self, member, tpath):
+        """Directory where member will be extracted.
+
+        Args:
+            member (zipfile.ZipInfo): Zip member.
+            tpath (str): Target extraction directory.
+
+        Returns:
+            str: Directory of extracted member.
+        """
+
+        path = self.get_member_path(member, tpath)
+        if member.is_dir():
+            return path
+        return os.path.dirname(path)
 
 
 def get_archive_ext_and_type(
@@ -616,13 +806,95 @@ def get_archive_ext_and_type(
     return None, None
 
 
-def extract_archive_file(archive_file: str, dst_folder: Optional[str] = None):
+def get_extract_workers() -> int:
+    """Number of threads used to extract zip archives.
+
+    The value can be changed using 'AYON_EXTRACT_WORKERS' environment
+    variable. Value '1' means that members are extracted one by one.
+
+    Returns:
+        int: Number of extraction workers.
+
+    """
+    workers = min(DEFAULT_EXTRACT_WORKERS, os.cpu_count() or 1)
+    value = os.getenv("AYON_EXTRACT_WORKERS")
+    if value:
+        try:
+            workers = int(value)
+        except ValueError:
+            print(
+                "Invalid value of 'AYON_EXTRACT_WORKERS'"
+                f" environment variable \"{value}\". Expected integer."
+            )
+    return max(1, workers)
+
+
+def _extract_zip_members(
+    archive_file: str, members: List[zipfile.ZipInfo], dst_folder: str
+):
+    # Each worker has own file handle, so members can be read in parallel
+    with ZipFileLongPaths(archive_file) as zip_file:
+        for member in members:
+            zip_file.extract(member, dst_folder)
+
+
+def _extract_zip_parallel(
+    zip_file: ZipFileLongPaths,
+    archive_file: str,
+    dst_folder: str,
+    workers: int,
+):
+    """Extract zip members using multiple threads.
+
+    Directories are created upfront, so workers do not race on their
+    creation. Files are split between workers by their size.
+    """
+    file_members = []
+    for member in zip_file.infolist():
+        os.makedirs(
+            zip_file.get_member_dirpath(member, dst_folder), exist_ok=True
+        )
+        if not member.is_dir():
+            file_members.append(member)
+
+    # Give next biggest file to worker with the least data to extract
+    partitions = [[0, []] for _ in range(workers)]
+    for member in sorted(
+        file_members, key=lambda m: m.file_size, reverse=True
+    ):
+        partition = min(partitions, key=lambda p: p[0])
+        partition[0] += member.file_size
+        partition[1].append(member)
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="AYONExtract"
+    ) as executor:
+        futures = [
+            executor.submit(
+                _extract_zip_members, archive_file, members, dst_folder
+            )
+            for _, members in partitions
+            if members
+        ]
+    for future in futures:
+        future.result()
+
+
+def extract_archive_file(
+    archive_file: str,
+    dst_folder: Optional[str] = None,
+    workers: Optional[int] = None,
+):
     """Extract archived file to a directory.
 
+    Zip archives with many members are extracted using multiple threads.
+
     Args:
         archive_file (str): Path to a archive file.
         dst_folder (Optional[str]): Directory where content will be extracted.
             By default, same folder where archive file is.
+        workers (Optional[int]): Number of threads used to extract zip
+            archive. Value from 'get_extract_workers' is used if not passed.
 
     """
     if not dst_folder:
@@ -639,22 +911,21 @@ def extract_archive_file(archive_file: str, dst_folder: Optional[str] = None):
         ))
 
     if archive_type == "zip":
-        zip_file = ZipFileLongPaths(archive_file)
-        zip_file.extractall(dst_folder)
-        zip_file.close()
+        if workers is None:
+            workers = get_extract_workers()
+        with ZipFileLongPaths(archive_file) as zip_file:
+            if (
+                workers > 1
+                and len(zip_file.infolist()) >= PARALLEL_EXTRACT_MIN_MEMBERS
+            ):
+                _extract_zip_parallel(
+                    zip_file, archive_file, dst_folder, workers
+                )
+            else:
+                zip_file.extractall(dst_folder)
 
     elif archive_type == "tar":
-        if archive_ext == ".tar":
-            tar_type = "r:"
-        elif archive_ext.endswith(".xz"):
-            tar_type = "r:xz"
-        elif archive_ext.endswith(".gz"):
-            tar_type = "r:gz"
-        elif archive_ext.endswith(".bz2"):
-            tar_type = "r:bz2"
-        else:
-            tar_type = "r:*"
-
+        tar_type = _get_tar_open_mode(archive_ext)
         try:
             tar_file = tarfile.open(archive_file, tar_type)
         except tarfile.ReadError:
@@ -664,6 +935,116 @@ def extract_archive_file(archive_file: str, dst_folder: Optional[str] = None):
         tar_file.close()
 
 
+def _get_tar_open_mode(archive_ext: str, stream: bool = False) -> str:
+    """Mode for 'tarfile.open' based on archive extension.
+
+    Args:
+        archive_ext (str): Archive extension.
+        stream (bool): Archive is read as non-seekable stream.
+
+    Returns:
+        str: Open mode.
+
+    """
+    separator = "|" if stream else ":"
+    if archive_ext == ".tar":
+        return f"r{separator}"
+    for compression in ("xz", "gz", "bz2"):
+        if archive_ext.endswith(compression):
+            return f"r{separator}{compression}"
+    return f"r{separator}*"
+
+
+def _is_path_in_dir(path: str, dirpath: str) -> bool:
+    return os.path.commonpath([dirpath, path]) == dirpath
+
+
+def _iter_safe_tar_members(tar_file, dst_folder: str):
+    """Iterate tar members validating they are extracted into 'dst_folder'.
+
+    Members are validated while they are read, so symlinks extracted by
+        previous members are resolved.
+
+    Args:
+        tar_file (tarfile.TarFile): Opened tar archive.
+        dst_folder (str): Directory where content is extracted.
+
+    Yields:
+        tarfile.TarInfo: Validated member.
+
+    Raises:
+        ValueError: Member would be extracted out of 'dst_folder', or is
+            a link out of 'dst_folder' or a device file.
+
+    """
+    root = os.path.realpath(dst_folder)
+    for member in tar_file:
+        name = member.name
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.isabs(name) or not _is_path_in_dir(path, root):
+            raise ValueError(
+                f"Archive member \"{name}\" is outside of destination."
+            )
+
+        if member.isdev():
+            raise ValueError(f"Archive member \"{name}\" is a device file.")
+
+        link_path = None
+        if member.issym():
+            link_path = os.path.join(os.path.dirname(path), member.linkname)
+        elif member.islnk():
+            link_path = os.path.join(root, member.linkname)
+
+        if link_path is not None and (
+            os.path.isabs(member.linkname)
+            or not _is_path_in_dir(os.path.realpath(link_path), root)
+        ):
+            raise ValueError(
+                f"Archive member \"{name}\" links outside of destination."
+            )
+        yield member
+
+
+def extract_archive_stream(
+    stream, archive_filename: str, dst_folder: str
+):
+    """Extract tar archive from a non-seekable stream to a directory.
+
+    Members are extracted one by one while they are read from the stream,
+    so archive can be extracted while it is being downloaded.
+
+    Args:
+        stream (BinaryIO): Readable binary stream with archive content.
+        archive_filename (str): Filename of archive used to define
+            compression.
+        dst_folder (str): Directory where content will be extracted.
+
+    Raises:
+        ValueError: Archive is not a tar archive, or contains member which
+            would be extracted out of 'dst_folder'.
+
+    """
+    archive_ext, archive_type = get_archive_ext_and_type(archive_filename)
+    if archive_type != "tar":
+        raise ValueError(
+            f"Archive \"{archive_filename}\" can't be extracted from stream."
+        )
+
+    print("Extracting {} stream -> {}".format(archive_filename, dst_folder))
+    kwargs = {}
+    # Extraction filters are not available in all python 3.9 versions
+    if hasattr(tarfile, "data_filter"):
+        kwargs["filter"] = "data"
+    with tarfile.open(
+        fileobj=stream, mode=_get_tar_open_mode(archive_ext, stream=True)
+    ) as tar_file:
+        tar_file.extractall(
+            dst_folder,
+            members=_iter_safe_tar_members(tar_file, dst_folder),
+            **kwargs
+        )
+
+
 def calculate_file_checksum(
     filepath: str, checksum_algorithm: str, chunk_size: Optional[int]=10000
 ):
@@ -885,6 +1266,71 @@ def _get_installed_shim_version() -> str:
     return dst_shim_version
 
 
+def get_launcher_init_stamp_filepath() -> str:
+    """Get path to file with stamps of initialized executables.
+
+    Returns:
+        str: Path to json file with stamps.
+
+    """
+    return get_launcher_local_dir("init_stamps.json")
+
+
+def _get_launcher_init_stamp() -> Dict[str, str]:
+    return {
+        "version": os.getenv("AYON_VERSION", ""),
+        "shim_version": _get_installed_shim_version(),
+    }
+
+
+def _load_launcher_init_stamps() -> Dict[str, Dict[str, str]]:
+    try:
+        with open(get_launcher_init_stamp_filepath(), "r") as stream:
+            data = json.load(stream)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return data
+
+
+def is_launcher_init_stamp_valid() -> bool:
+    """Current executable was already initialized.
+
+    Stamp is valid if current executable was initialized with the same
+        AYON launcher version and installed shim version, and the file
+        with executables info exists.
+
+    Returns:
+        bool: Initialization of current executable can be skipped.
+
+    """
+    if not os.path.exists(get_executables_info_filepath()):
+        return False
+    stamp = _load_launcher_init_stamps().get(sys.executable)
+    return stamp == _get_launcher_init_stamp()
+
+
+def store_launcher_init_stamp():
+    """Store stamp of initialized current executable.
+
+    The stamp is not stored if the application is not built, because
+        initialization does not do anything in that case.
+
+    """
+    if not IS_BUILT_APPLICATION:
+        return
+
+    filepath = get_launcher_init_stamp_filepath()
+    stamps = _load_launcher_init_stamps()
+    stamps[sys.executable] = _get_launcher_init_stamp()
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as stream:
+        json.dump(stamps, stream, indent=4)
+    os.replace(tmp_path, filepath)
+
+
 def _deploy_shim_windows(
     installer_shim_root: str,
     create_desktop_icons: bool
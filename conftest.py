@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Tests import 'ayon_common' the same way as AYON launcher does
+_COMMON_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "common"
+)
+if _COMMON_DIR not in sys.path:
+    sys.path.insert(0, _COMMON_DIR)
+
+
+@pytest.fixture
+def temp_folder():
+    yield tempfile.mkdtemp(prefix="ayon_test_")
@@ -115,6 +115,28 @@ def load_version_from_root(root):
     return version
 
 
+def get_version_file_stat(executable):
+    """Modification time and size of 'version.py' of executable.
+
+    Args:
+        executable (str): Path to executable.
+
+    Returns:
+        Union[list[int], None]: Modification time in nanoseconds and size.
+    """
+
+    if not executable:
+        return None
+    version_filepath = os.path.join(
+        os.path.dirname(executable), "version.py"
+    )
+    try:
+        stat = os.stat(version_filepath)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
 def load_executable_version(executable):
     """Get version of executable.
 
@@ -171,13 +193,71 @@ class Executable:
         return self._semver_version
 
 
-def main():
-    executables_info = get_executables_info()
+def get_item_version(version_info):
+    """Get version of executable from executables info item.
+
+    Version stored by AYON launcher is used if 'version.py' of executable
+    did not change since it was stored.
+
+    Args:
+        version_info (dict[str, Any]): Executables info item.
+
+    Returns:
+        Union[str, None]: Version of executable.
+    """
+
+    executable = version_info.get("executable")
+    version_stat = get_version_file_stat(executable)
+    if (
+        version_stat is not None
+        and version_info.get("version")
+        and version_info.get("version_stat") == version_stat
+    ):
+        return version_info["version"]
+    return load_executable_version(executable)
+
+
+def get_latest_executable(executables_info):
+    """Get latest executable from pointer stored by AYON launcher.
+
+    Args:
+        executables_info (dict[str, Any]): Executables info.
+
+    Returns:
+        Union[Executable, None]: Latest executable, or None if pointer
+            is not available or is not valid anymore.
+    """
+
+    latest_info = executables_info.get("latest")
+    if not latest_info:
+        return None
+
+    version_stat = get_version_file_stat(latest_info.get("executable"))
+    if (
+        version_stat is None
+        or version_stat != latest_info.get("version_stat")
+    ):
+        return None
+    executable = Executable(latest_info["executable"], latest_info["version"])
+    if executable.exists:
+        return executable
+    return None
+
+
+def find_latest_executable(executables_info):
+    """Find latest executable from all available executables.
+
+    Args:
+        executables_info (dict[str, Any]): Executables info.
+
+    Returns:
+        Executable: Latest executable.
+    """
 
     executables = []
     for version_info in executables_info["available_versions"]:
         executable = version_info["executable"]
-        version = load_executable_version(executable)
+        version = get_item_version(version_info)
         executable = Executable(executable, version)
         if executable.exists:
             executables.append(executable)
@@ -187,7 +267,15 @@ def main():
             "Shim was not able to locate any AYON launcher executables."
         )
     executables.sort()
-    executable = executables[-1]
+    return executables[-1]
+
+
+def main():
+    executables_info = get_executables_info()
+
+    executable = get_latest_executable(executables_info)
+    if executable is None:
+        executable = find_latest_executable(executables_info)
 
     # Split dir and filename
     # - decide if filename should be 'ayon_console.exe' for windows
@@ -209,6 +297,14 @@ def main():
     # - replace start python script path when running from code
     args = list(sys.argv)
     args[0] = executable_path
+    # Replace shim process with AYON launcher, so shim does not stay
+    #   running for whole session
+    # - on Windows 'execv' does not replace the process, and console would
+    #   not wait for the launcher
+    if platform.system().lower() != "windows":
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(executable_path, args)
     sys.exit(subprocess.call(args))
 
 
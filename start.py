@@ -16,6 +16,16 @@ Arguments that are always handled by AYON launcher:
     --use-dev - use dev server
     --bundle <bundle_name> - specify bundle name to use
     --headless - enable headless mode - bootstrap won't show any UI
+    --offline - start from snapshot of last successful boot without server
+    --trace - store bootstrap phases to Chrome trace file
+    --forkserver - bootstrap and run as forkserver for other AYON launcher
+        processes (used internally when 'AYON_FORKSERVER' is enabled)
+    --distribution-workers <count> - number of workers used to distribute
+        addons and dependency package, '1' disables parallel distribution
+    --print-bootstrap-env - bootstrap and print environment of bootstrapped
+        process as shell commands, e.g. for farm job wrappers
+    --force-init - initialize AYON launcher executable (executables info and
+        shim) even if it was already initialized with the same versions
 
 AYON launcher can be running in multiple different states. The top layer of
 states is 'production', 'staging' and 'dev'.
@@ -62,6 +72,41 @@ Environment variables set during bootstrap:
     - AYON_LAUNCHER_LOCAL_DIR - dir where machine specific files are stored
     - AYON_ADDONS_DIR - path to AYON addons directory
     - AYON_DEPENDENCIES_DIR - path to AYON dependencies directory
+    - AYON_DISTRIBUTION_WORKERS - number of workers used for distribution
+    - AYON_DOWNLOAD_SEGMENTS - number of concurrent range requests used to
+        download dependency packages and installers
+    - AYON_DISTRIBUTION_STREAM_EXTRACT - extract tar archives while they are
+        downloaded when set to '1'
+    - AYON_EXTRACT_WORKERS - number of threads used to extract zip archives
+    - AYON_DISTRIBUTION_DELTA - download only changed files of addons when
+        set to '1'
+    - AYON_DISTRIBUTION_DEDUP - replace duplicated files of distributed items
+        with links to shared object store when set to '1'
+    - AYON_OBJECT_STORE_DIR - dir of shared object store used by deduplication
+    - AYON_CATALOG_CACHE - set to '0' to disable cache of server catalog
+    - AYON_CATALOG_CACHE_TTL - seconds for which cached server catalog is
+        used without revalidation
+    - AYON_OFFLINE_MODE - set to '1' to start from snapshot of last
+        successful boot without server (same as '--offline')
+    - AYON_OFFLINE_FALLBACK - set to '0' to not start from the snapshot
+        when server is not reached
+    - AYON_OFFLINE_TIMEOUT - seconds to wait for server before the snapshot
+        is used
+    - AYON_TRACE - set to '1' to store bootstrap phases to Chrome trace
+        file (same as '--trace')
+    - AYON_TRACE_FILE - path to trace file, file is stored to launcher local
+        dir if not set
+    - AYON_FORKSERVER - set to '1' to run processes in pre-warmed forkserver
+        of bootstrapped AYON launcher (Linux only)
+    - AYON_FORKSERVER_IDLE_TIMEOUT - seconds after which forkserver stops
+        if it did not get any request
+    - AYON_FORKSERVER_LIFETIME - seconds after which forkserver stops,
+        bundle changes on server are used after restart
+    - AYON_TOKEN_VALIDATION_TTL - seconds for which validated token is
+        trusted without server request, '0' disables the cache
+    - AYON_BOOTSTRAP_SNAPSHOT - path to snapshot of bootstrap of parent
+        process, child processes with the same server and bundle use it
+        instead of server requests and distribution checks
 
 Some of the environment variables are not in this script but in 'ayon_common'
 module.
@@ -140,6 +185,17 @@ if "--verbose" in sys.argv:
 
     os.environ["AYON_LOG_LEVEL"] = str(log_level)
 
+# Define how many workers are used to distribute addons and dependencies
+if "--distribution-workers" in sys.argv:
+    idx = sys.argv.index("--distribution-workers")
+    sys.argv.pop(idx)
+    if idx >= len(sys.argv) or not sys.argv[idx].isdigit():
+        raise RuntimeError((
+            "Expect positive integer after \"--distribution-workers\""
+            " argument."
+        ))
+    os.environ["AYON_DISTRIBUTION_WORKERS"] = sys.argv.pop(idx)
+
 # Enable debug mode, may affect log level if log level is not defined
 if "--debug" in sys.argv:
     sys.argv.remove("--debug")
@@ -215,6 +271,36 @@ if "--headless" in sys.argv:
 elif os.getenv("AYON_HEADLESS_MODE") != "1":
     os.environ.pop("AYON_HEADLESS_MODE", None)
 
+# Record bootstrap phases to Chrome trace file
+if "--trace" in sys.argv:
+    sys.argv.remove("--trace")
+    os.environ["AYON_TRACE"] = "1"
+
+# Start from snapshot of last successful boot without server
+# - used only by current process, child processes connect to server
+OFFLINE_MODE = False
+if "--offline" in sys.argv:
+    sys.argv.remove("--offline")
+    OFFLINE_MODE = True
+
+# Run as forkserver of bootstrapped AYON launcher
+FORKSERVER_MODE = False
+if "--forkserver" in sys.argv:
+    sys.argv.remove("--forkserver")
+    FORKSERVER_MODE = True
+
+# Print environment of bootstrapped process
+PRINT_BOOTSTRAP_ENV = False
+if "--print-bootstrap-env" in sys.argv:
+    sys.argv.remove("--print-bootstrap-env")
+    PRINT_BOOTSTRAP_ENV = True
+
+# Initialize AYON launcher executable even if stamp says it is initialized
+FORCE_INIT = False
+if "--force-init" in sys.argv:
+    sys.argv.remove("--force-init")
+    FORCE_INIT = True
+
 IS_BUILT_APPLICATION = getattr(sys, "frozen", False)
 HEADLESS_MODE_ENABLED = os.getenv("AYON_HEADLESS_MODE") == "1"
 AYON_IN_LOGIN_MODE = os.environ["AYON_IN_LOGIN_MODE"] == "1"
@@ -259,95 +345,98 @@ os.environ["AYON_EXECUTABLE"] = sys.executable
 os.environ["AYON_ROOT"] = AYON_ROOT
 os.environ["AYON_MENU_LABEL"] = "AYON"
 
-import blessed  # noqa: E402
-import certifi  # noqa: E402
-import requests  # noqa: E402
-
-
-if sys.__stdout__:
-    term = blessed.Terminal()
-
-    def _print(message: str):
-        if message.startswith("!!! "):
-            print(f'{term.orangered2("!!! ")}{message[4:]}')
-        elif message.startswith(">>> "):
-            print(f'{term.aquamarine3(">>> ")}{message[4:]}')
-        elif message.startswith("--- "):
-            print(f'{term.darkolivegreen3("--- ")}{message[4:]}')
-        elif message.startswith("*** "):
-            print(f'{term.gold("*** ")}{message[4:]}')
-        elif message.startswith("  - "):
-            print(f'{term.wheat("  - ")}{message[4:]}')
-        elif message.startswith("  . "):
-            print(f'{term.tan("  . ")}{message[4:]}')
-        elif message.startswith("     - "):
-            print(f'{term.seagreen3("     - ")}{message[7:]}')
-        elif message.startswith("     ! "):
-            print(f'{term.goldenrod("     ! ")}{message[7:]}')
-        elif message.startswith("     * "):
-            print(f'{term.aquamarine1("     * ")}{message[7:]}')
-        elif message.startswith("    "):
-            print(f'{term.darkseagreen3("    ")}{message[4:]}')
-        else:
-            print(message)
-else:
-    def _print(message: str):
+# Same values as constants in 'ayon_api.constants', 'ayon_api' is imported
+#   only when it is needed
+SERVER_URL_ENV_KEY = "AYON_SERVER_URL"
+SERVER_API_ENV_KEY = "AYON_API_KEY"
+DEFAULT_VARIANT_ENV_KEY = "AYON_DEFAULT_SETTINGS_VARIANT"
+SITE_ID_ENV_KEY = "AYON_SITE_ID"
+
+# Heavy modules ('blessed', 'requests', 'ayon_api', 'ayon_common') are
+#   imported lazily in functions that need them. Scripts started with
+#   '--skip-bootstrap' (e.g. UI helper subprocesses) don't import them.
+_TERMINAL = None
+
+
+def _get_terminal():
+    global _TERMINAL
+    if _TERMINAL is None:
+        import blessed
+
+        _TERMINAL = blessed.Terminal()
+    return _TERMINAL
+
+
+def _print(message: str):
+    if not sys.__stdout__:
+        print(message)
+        return
+
+    term = _get_terminal()
+    if message.startswith("!!! "):
+        print(f'{term.orangered2("!!! ")}{message[4:]}')
+    elif message.startswith(">>> "):
+        print(f'{term.aquamarine3(">>> ")}{message[4:]}')
+    elif message.startswith("--- "):
+        print(f'{term.darkolivegreen3("--- ")}{message[4:]}')
+    elif message.startswith("*** "):
+        print(f'{term.gold("*** ")}{message[4:]}')
+    elif message.startswith("  - "):
+        print(f'{term.wheat("  - ")}{message[4:]}')
+    elif message.startswith("  . "):
+        print(f'{term.tan("  . ")}{message[4:]}')
+    elif message.startswith("     - "):
+        print(f'{term.seagreen3("     - ")}{message[7:]}')
+    elif message.startswith("     ! "):
+        print(f'{term.goldenrod("     ! ")}{message[7:]}')
+    elif message.startswith("     * "):
+        print(f'{term.aquamarine1("     * ")}{message[7:]}')
+    elif message.startswith("    "):
+        print(f'{term.darkseagreen3("    ")}{message[4:]}')
+    else:
         print(message)
 
 
 # if SSL_CERT_FILE is not set prior to AYON launcher launch, we set it to
 #   point to certifi bundle to make sure we have reasonably
 #       new CA certificates.
-if not os.getenv("SSL_CERT_FILE"):
-    os.environ["SSL_CERT_FILE"] = certifi.where()
-elif os.getenv("SSL_CERT_FILE") != certifi.where():
-    _print("--- your system is set to use custom CA certificate bundle.")
-
-from ayon_api import (  # noqa E402
-    get_base_url,
-    set_default_settings_variant,
-    get_addons_studio_settings,
-    get_event,
-    update_event,
-    take_web_action_event,
-    abort_web_action_event,
-)
-from ayon_api.constants import (  # noqa E402
-    SERVER_URL_ENV_KEY,
-    SERVER_API_ENV_KEY,
-    DEFAULT_VARIANT_ENV_KEY,
-    SITE_ID_ENV_KEY,
-)
-from ayon_common import is_staging_enabled, is_dev_mode_enabled  # noqa E402
-from ayon_common.connection.credentials import (  # noqa E402
-    ask_to_login_ui,
-    add_server,
-    load_token,
-    need_server_or_login,
-    load_environments,
-    create_global_connection,
-    confirm_server_login,
-    show_invalid_credentials_ui,
-)
-from ayon_common.distribution import (  # noqa E402
-    AyonDistribution,
-    BundleNotFoundError,
-    show_missing_bundle_information,
-    show_installer_issue_information,
-    UpdateWindowManager,
-)
-
-from ayon_common.utils import (  # noqa E402
-    store_current_executable_info,
-    deploy_ayon_launcher_shims,
-    get_local_site_id,
-    get_launcher_local_dir,
-    get_launcher_storage_dir,
-)
-from ayon_common.startup import show_startup_error  # noqa E402
-
-
-def _connect_to_ayon_server(force=False, username=None):
+# - scripts without bootstrap are usually subprocesses of AYON launcher
+#   and have the variable already set
+_ssl_cert_file = os.getenv("SSL_CERT_FILE")
+if not _ssl_cert_file or not SKIP_BOOTSTRAP:
+    import certifi
+
+    if not _ssl_cert_file:
+        os.environ["SSL_CERT_FILE"] = certifi.where()
+    elif _ssl_cert_file != certifi.where():
+        _print("--- your system is set to use custom CA certificate bundle.")
+
+
+def _has_offline_fallback(server_url):
+    """Offline snapshot can be used if server is not reached.
+
+    Args:
+        server_url (Union[str, None]): Server url.
+
+    Returns:
+        bool: Fallback is enabled and snapshot is available.
+    """
+    from ayon_common.startup import (
+        is_offline_fallback_enabled,
+        get_bundle_request_key,
+        load_offline_snapshot,
+    )
+
+    return bool(
+        server_url
+        and is_offline_fallback_enabled()
+        and load_offline_snapshot(server_url, get_bundle_request_key())
+    )
+
+
+def _connect_to_ayon_server(
+    force=False, username=None, offline_fallback=False
+):
     """Connect to AYON server.
 
     Load existing credentials to AYON server, and show login dialog if are not
@@ -361,21 +450,47 @@ def _connect_to_ayon_server(force=False, username=None):
     Args:
         force (Optional[bool]): Force login to server.
         username (Optional[str]): Username that will be forced to use.
+        offline_fallback (Optional[bool]): Boot from offline snapshot when
+            server is not reached.
+
+    Returns:
+        bool: Connected to server, 'False' if booted from offline snapshot.
 
     """
+    from ayon_common.connection.credentials import (
+        ask_to_login_ui,
+        add_server,
+        need_server_or_login,
+        load_environments,
+        confirm_server_login,
+        show_invalid_credentials_ui,
+    )
+
     if force and HEADLESS_MODE_ENABLED:
         _print("!!! Login UI was requested in headless mode.")
         sys.exit(1)
 
     load_environments()
+    current_url = os.environ.get(SERVER_URL_ENV_KEY)
     need_server = need_api_key = True
     if not force:
-        need_server, need_api_key = need_server_or_login(username)
+        timeout = None
+        if offline_fallback and _has_offline_fallback(current_url):
+            from ayon_common.startup import get_offline_timeout
+
+            # Don't wait long for server if boot can continue offline
+            timeout = get_offline_timeout()
+        need_server, need_api_key = need_server_or_login(username, timeout)
 
-    current_url = os.environ.get(SERVER_URL_ENV_KEY)
     if not need_server and not need_api_key:
         _print(f">>> Connected to AYON server {current_url}")
-        return
+        return True
+
+    if need_server and current_url and offline_fallback:
+        from ayon_common.startup import get_bundle_request_key
+
+        if _boot_offline(get_bundle_request_key()):
+            return False
 
     if need_server:
         if current_url:
@@ -414,7 +529,7 @@ def _connect_to_ayon_server(force=False, username=None):
     )
     if url is not None and token is not None:
         confirm_server_login(url, token, username)
-        return
+        return True
 
     if url is not None:
         add_server(url, username)
@@ -433,6 +548,7 @@ def _set_default_settings_variant(use_dev, use_staging, bundle_name):
         use_staging (bool): Is staging mode enabled.
         bundle_name (str): Name of bundle to use.
     """
+    from ayon_api import set_default_settings_variant
 
     if use_dev:
         variant = bundle_name
@@ -491,23 +607,53 @@ def _prepare_disk_mapping_args(src_path, dst_path):
     return []
 
 
-def _run_disk_mapping(bundle_name):
-    """Run disk mapping logic.
+def _get_disk_mapping(bundle):
+    """Get disk mapping of current platform.
 
     Mapping of disks is taken from core addon settings. To run this logic
         '_set_default_settings_variant' must be called first, so correct
         settings are received from server.
+
+    Only settings of core addon are received, and are cached per bundle
+        and settings variant.
+
+    Args:
+        bundle (Bundle): Bundle to use.
+
+    Returns:
+        list[dict[str, str]]: Disk mapping items with source and destination.
     """
+    from ayon_common.distribution.catalog_cache import (
+        get_cached_addon_settings,
+    )
+
+    core_version = bundle.addon_versions.get("core")
+    if not core_version:
+        return []
 
     low_platform = platform.system().lower()
-    settings = get_addons_studio_settings(bundle_name)
-    core_settings = settings.get("core") or {}
+    core_settings = get_cached_addon_settings(
+        "core",
+        core_version,
+        bundle.name,
+        os.environ[DEFAULT_VARIANT_ENV_KEY],
+    )
     disk_mapping = core_settings.get("disk_mapping") or {}
-    platform_disk_mapping = disk_mapping.get(low_platform)
-    if not platform_disk_mapping:
-        return
+    return disk_mapping.get(low_platform) or []
+
+
+def _run_disk_mapping(disk_mapping):
+    """Run disk mapping logic.
+
+    Mapping is skipped only if destination exists, mappings can be lost
+        without reboot (e.g. 'subst' drives exist only in logon session).
 
-    for item in platform_disk_mapping:
+    Args:
+        disk_mapping (list[dict[str, str]]): Disk mapping items with source
+            and destination.
+    """
+
+    for item in disk_mapping:
         src_path = item.get("source")
         dst_path = item.get("destination")
         if not src_path or not dst_path:
@@ -522,33 +668,87 @@ def _run_disk_mapping(bundle_name):
 
         _print(f"*** disk mapping arguments: {args}")
         try:
-            output = subprocess.Popen(args)
-            if output.returncode and output.returncode != 0:
-                exc_msg = f'Executing was not successful: "{args}"'
-
-                raise RuntimeError(exc_msg)
+            returncode = subprocess.Popen(args).wait()
         except TypeError as exc:
             _print(
                 f"Error {str(exc)} in mapping drive {src_path}, {dst_path}")
             raise
 
+        if returncode != 0:
+            _print(f'!!! Executing was not successful: "{args}"')
+
+
+def _add_distribution_paths(python_paths, sys_paths):
+    """Add paths of distributed addons and dependency package.
+
+    Args:
+        python_paths (list[str]): Paths added to 'sys.path' and PYTHONPATH.
+        sys_paths (list[str]): Paths added only to 'sys.path'.
+    """
+
+    # TODO probably remove paths to other addons?
+    env_python_paths = [
+        path
+        for path in os.getenv("PYTHONPATH", "").split(os.pathsep)
+        if path
+    ]
+
+    for path in python_paths:
+        sys.path.insert(0, path)
+        if path not in env_python_paths:
+            env_python_paths.append(path)
 
-def _start_distribution():
+    for path in sys_paths:
+        sys.path.insert(0, path)
+
+    os.environ["PYTHONPATH"] = os.pathsep.join(env_python_paths)
+
+
+def _start_distribution(request_key):
     """Gets info from AYON server and updates possible missing pieces.
 
+    Args:
+        request_key (str): Key of requested bundle used to store offline
+            snapshot.
+
     Raises:
         RuntimeError
     """
-
-    # Create distribution object
+    from ayon_api import get_base_url
+    from ayon_common.distribution import (
+        AyonDistribution,
+        BundleNotFoundError,
+        fetch_bootstrap_catalog,
+        show_missing_bundle_information,
+        show_installer_issue_information,
+        get_distribution_workers,
+        UpdateWindowManager,
+    )
+    from ayon_common.connection.credentials import get_validated_username
+    from ayon_common.startup import save_offline_snapshot
+    from ayon_common.tracing import trace_span
+
+    # Fetch server catalog concurrently and create distribution object
+    # - username is known if token was validated
+    skip_installer_dist = not IS_BUILT_APPLICATION
+    with trace_span("fetch_bootstrap_catalog"):
+        catalog = fetch_bootstrap_catalog(
+            include_installers=not skip_installer_dist,
+            active_user=get_validated_username(
+                os.environ.get(SERVER_URL_ENV_KEY),
+                os.environ.get(SERVER_API_ENV_KEY),
+            ),
+        )
     distribution = AyonDistribution(
-        skip_installer_dist=not IS_BUILT_APPLICATION
+        skip_installer_dist=skip_installer_dist,
+        **catalog
     )
     bundle = None
     bundle_name = None
     # Try to find required bundle and handle missing one
     try:
-        bundle = distribution.bundle_to_use
+        with trace_span("resolve_bundle"):
+            bundle = distribution.bundle_to_use
         if bundle is not None:
             bundle_name = bundle.name
     except BundleNotFoundError as exc:
@@ -594,15 +794,28 @@ def _start_distribution():
         distribution.use_staging,
         bundle_name
     )
-    _run_disk_mapping(bundle_name)
+    with trace_span("disk_mapping"):
+        disk_mapping = _get_disk_mapping(bundle)
+        _run_disk_mapping(disk_mapping)
 
     # Start distribution
     update_window_manager = UpdateWindowManager()
     if not HEADLESS_MODE_ENABLED:
-        update_window_manager.start()
-
+        progress_items = None
+        if not distribution.need_installer_change:
+            progress_items = [
+                item
+                for item in distribution.get_all_distribution_items()
+                if item.need_distribution
+            ]
+        update_window_manager.start(progress_items)
+
+    workers = get_distribution_workers()
     try:
-        distribution.distribute()
+        with trace_span("distribute"):
+            distribution.distribute(
+                threaded=workers > 1, max_workers=workers
+            )
     finally:
         update_window_manager.stop()
 
@@ -632,37 +845,226 @@ def _start_distribution():
     distribution.validate_distribution()
     os.environ["AYON_BUNDLE_NAME"] = bundle_name
 
-    # TODO probably remove paths to other addons?
-    python_paths = [
+    python_paths = distribution.get_python_paths()
+    sys_paths = distribution.get_sys_paths()
+    _add_distribution_paths(python_paths, sys_paths)
+
+    dependency_package = distribution.dependency_package_item
+    try:
+        save_offline_snapshot(
+            os.environ[SERVER_URL_ENV_KEY],
+            request_key,
+            {
+                "bundle_name": bundle_name,
+                "use_dev": distribution.use_dev,
+                "use_staging": distribution.use_staging,
+                "settings_variant": os.environ[DEFAULT_VARIANT_ENV_KEY],
+                "addon_versions": bundle.addon_versions,
+                "dependency_package": (
+                    None
+                    if dependency_package is None
+                    else dependency_package.filename
+                ),
+                "python_paths": python_paths,
+                "sys_paths": sys_paths,
+                "disk_mapping": disk_mapping,
+            }
+        )
+    except OSError as exc:
+        _print(f"*** Failed to store offline snapshot: {exc}")
+
+
+def _boot_offline(request_key, forced=False):
+    """Boot from snapshot of last successful boot without server.
+
+    Snapshot is used when offline mode is forced, or when server was
+        not reached.
+
+    Args:
+        request_key (str): Key of requested bundle.
+        forced (Optional[bool]): Offline mode was requested, process is
+            terminated if snapshot is not available.
+
+    Returns:
+        bool: AYON launcher was booted from snapshot.
+    """
+    from ayon_common.connection.credentials import load_environments
+    from ayon_common.startup import (
+        is_offline_fallback_enabled,
+        load_offline_snapshot,
+    )
+
+    if not forced and not is_offline_fallback_enabled():
+        return False
+
+    load_environments()
+    server_url = os.environ.get(SERVER_URL_ENV_KEY)
+    snapshot = None
+    if server_url:
+        snapshot = load_offline_snapshot(server_url, request_key)
+
+    if snapshot is None:
+        if forced:
+            _print((
+                "!!! Offline mode was requested but there is no usable"
+                " snapshot of previous boot."
+            ))
+            sys.exit(1)
+        return False
+
+    if not forced:
+        _print(f"!!! AYON server '{server_url}' is not reachable.")
+
+    bundle_name = snapshot["bundle_name"]
+    _print(f">>> Starting offline with release bundle '{bundle_name}'")
+    os.environ[DEFAULT_VARIANT_ENV_KEY] = snapshot["settings_variant"]
+    if snapshot["use_dev"]:
+        os.environ["AYON_USE_DEV"] = "1"
+    else:
+        os.environ.pop("AYON_USE_DEV", None)
+    if not snapshot["use_staging"]:
+        os.environ.pop("AYON_USE_STAGING", None)
+
+    _run_disk_mapping(snapshot["disk_mapping"])
+    os.environ["AYON_BUNDLE_NAME"] = bundle_name
+    _add_distribution_paths(snapshot["python_paths"], snapshot["sys_paths"])
+    return True
+
+
+def _boot_from_bootstrap_snapshot():
+    """Boot from bootstrap snapshot of parent process.
+
+    Snapshot is used only if was created by the same executable for the same
+        server and bundle, and distributed paths did not change. Global
+        connection is created with stored credentials and default settings
+        variant is set as in full bootstrap.
+
+    Returns:
+        bool: AYON launcher was booted from snapshot.
+    """
+    from ayon_common import is_staging_enabled, is_dev_mode_enabled
+    from ayon_common.connection.credentials import (
+        load_environments,
+        create_global_connection,
+    )
+    from ayon_common.startup import (
+        BOOTSTRAP_SNAPSHOT_ENV_KEY,
+        load_bootstrap_snapshot,
+    )
+
+    filepath = os.environ.get(BOOTSTRAP_SNAPSHOT_ENV_KEY)
+    if not filepath:
+        return False
+
+    load_environments()
+    server_url = os.environ.get(SERVER_URL_ENV_KEY)
+    snapshot = None
+    if server_url and os.environ.get(SERVER_API_ENV_KEY):
+        snapshot = load_bootstrap_snapshot(filepath, server_url)
+
+    # Token is validated on server again by full bootstrap if was rejected
+    if snapshot is None or not create_global_connection():
+        os.environ.pop(BOOTSTRAP_SNAPSHOT_ENV_KEY, None)
+        return False
+
+    env = dict(snapshot["env"])
+    snapshot_pythonpath = env.pop("PYTHONPATH", None) or ""
+    for key, value in env.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+    # Keep paths of current process and add missing paths of snapshot
+    env_python_paths = [
         path
         for path in os.getenv("PYTHONPATH", "").split(os.pathsep)
         if path
     ]
+    for path in snapshot_pythonpath.split(os.pathsep):
+        if path and path not in env_python_paths:
+            env_python_paths.append(path)
+    os.environ["PYTHONPATH"] = os.pathsep.join(env_python_paths)
 
-    for path in distribution.get_python_paths():
-        sys.path.insert(0, path)
-        if path not in python_paths:
-            python_paths.append(path)
+    sys.path[0:0] = [
+        path
+        for path in snapshot["sys_paths"]
+        if path not in sys.path
+    ]
 
-    for path in distribution.get_sys_paths():
-        sys.path.insert(0, path)
+    bundle_name = os.environ["AYON_BUNDLE_NAME"]
+    _set_default_settings_variant(
+        is_dev_mode_enabled(), is_staging_enabled(), bundle_name
+    )
+    _print(f">>> Using bootstrap of release bundle '{bundle_name}'")
+    return True
 
-    os.environ["PYTHONPATH"] = os.pathsep.join(python_paths)
+
+def _store_bootstrap_snapshot(env_before, sys_path_before):
+    """Store bootstrap snapshot for child processes.
+
+    Args:
+        env_before (dict[str, str]): Environment before bootstrap.
+        sys_path_before (list[str]): 'sys.path' before bootstrap.
+    """
+    from ayon_common.startup import (
+        BOOTSTRAP_SNAPSHOT_ENV_KEY,
+        get_env_changes,
+        save_bootstrap_snapshot,
+    )
+
+    lookup_set = set(sys_path_before)
+    sys_paths = [path for path in sys.path if path not in lookup_set]
+    try:
+        filepath = save_bootstrap_snapshot(
+            os.environ[SERVER_URL_ENV_KEY],
+            get_env_changes(env_before),
+            sys_paths,
+        )
+    except OSError as exc:
+        _print(f"*** Failed to store bootstrap snapshot: {exc}")
+        return
+    os.environ[BOOTSTRAP_SNAPSHOT_ENV_KEY] = filepath
 
 
 def init_launcher_executable(ensure_protocol_is_registered=False):
     """Initialize AYON launcher executable.
 
     Make sure current AYON launcher executable is stored to known executables
-        and shim is deployed.
+        and shim is deployed. Initialization is skipped if the executable
+        was already initialized with the same AYON launcher and shim
+        version, unless '--force-init' is passed.
 
     """
-    create_desktop_icons = "--create-desktop-icons" in sys.argv
-    store_current_executable_info()
-    deploy_ayon_launcher_shims(
-        create_desktop_icons=create_desktop_icons,
-        ensure_protocol_is_registered=ensure_protocol_is_registered,
+    from ayon_common.utils import (
+        store_current_executable_info,
+        deploy_ayon_launcher_shims,
+        is_launcher_init_stamp_valid,
+        store_launcher_init_stamp,
     )
+    from ayon_common.tracing import trace_span
+
+    create_desktop_icons = "--create-desktop-icons" in sys.argv
+    if (
+        not FORCE_INIT
+        and not create_desktop_icons
+        and not ensure_protocol_is_registered
+        and is_launcher_init_stamp_valid()
+    ):
+        return
+
+    with trace_span("store_current_executable_info"):
+        store_current_executable_info()
+    with trace_span("deploy_ayon_launcher_shims"):
+        deploy_ayon_launcher_shims(
+            create_desktop_icons=create_desktop_icons,
+            ensure_protocol_is_registered=ensure_protocol_is_registered,
+        )
+
+    try:
+        store_launcher_init_stamp()
+    except OSError as exc:
+        _print(f"*** Failed to store initialization stamp: {exc}")
 
 
 def fill_pythonpath():
@@ -676,15 +1078,53 @@ def fill_pythonpath():
 
 def boot():
     """Bootstrap AYON launcher."""
-    init_launcher_executable()
+    from ayon_common.utils import (
+        get_local_site_id,
+        get_launcher_local_dir,
+        get_launcher_storage_dir,
+    )
+    from ayon_common.connection.credentials import create_global_connection
+    from ayon_common.startup import (
+        get_bundle_request_key,
+        is_offline_mode_forced,
+    )
+    from ayon_common.tracing import trace_span
+
+    env_before = dict(os.environ)
+    sys_path_before = list(sys.path)
+    with trace_span("init_launcher_executable"):
+        init_launcher_executable()
 
     # Setup site id in environment variable for all possible subprocesses
     if SITE_ID_ENV_KEY not in os.environ:
         os.environ[SITE_ID_ENV_KEY] = get_local_site_id()
 
-    _connect_to_ayon_server()
-    create_global_connection()
-    _start_distribution()
+    with trace_span("boot_from_bootstrap_snapshot"):
+        booted_from_snapshot = _boot_from_bootstrap_snapshot()
+
+    booted_offline = booted_from_snapshot
+    if not booted_offline and (OFFLINE_MODE or is_offline_mode_forced()):
+        with trace_span("boot_offline"):
+            booted_offline = _boot_offline(
+                get_bundle_request_key(), forced=True
+            )
+    if not booted_offline:
+        # Offline snapshot is used only when server is not reached
+        with trace_span("connect_to_ayon_server"):
+            booted_offline = not _connect_to_ayon_server(
+                offline_fallback=True
+            )
+    if not booted_offline:
+        with trace_span("create_global_connection"):
+            token_is_valid = create_global_connection()
+        # Token validated earlier was rejected by server, validate it again
+        if not token_is_valid:
+            with trace_span("connect_to_ayon_server"):
+                _connect_to_ayon_server()
+            with trace_span("create_global_connection"):
+                create_global_connection()
+        with trace_span("start_distribution"):
+            _start_distribution(get_bundle_request_key())
     fill_pythonpath()
 
     # Call launcher storage dir getters to make sure their
@@ -692,8 +1132,212 @@ def boot():
     get_launcher_local_dir()
     get_launcher_storage_dir()
 
+    if not booted_from_snapshot:
+        _store_bootstrap_snapshot(env_before, sys_path_before)
+
+
+def _get_forkserver_socket_path():
+    """Path to forkserver socket if forkserver is enabled.
+
+    Returns:
+        Optional[str]: Path to socket, or None if forkserver is disabled.
+    """
+    from ayon_common.forkserver import (
+        is_forkserver_enabled,
+        get_forkserver_socket_path,
+    )
+
+    if not is_forkserver_enabled():
+        return None
+    return get_forkserver_socket_path()
+
+
+def _run_in_forkserver(socket_path):
+    """Run current process in forkserver.
+
+    Args:
+        socket_path (str): Path to forkserver socket.
+
+    Returns:
+        Optional[int]: Exit code of process run by forkserver, or None if
+            forkserver is not running.
+    """
+    from ayon_common.forkserver import run_in_forkserver
+
+    return run_in_forkserver(
+        socket_path,
+        sys.argv,
+        dict(os.environ),
+        os.getcwd(),
+        {"skip_headers": SKIP_HEADERS},
+    )
+
+
+def _start_forkserver(socket_path, env):
+    """Start forkserver in background for next processes.
+
+    Forkserver is started after bootstrap of current process, so both
+        processes don't distribute addons at the same time.
+
+    Args:
+        socket_path (str): Path to forkserver socket.
+        env (dict[str, str]): Environment before bootstrap.
+    """
+    from ayon_common.forkserver import (
+        start_forkserver,
+        get_forkserver_log_path,
+    )
+
+    args = [sys.executable]
+    if not IS_BUILT_APPLICATION:
+        args.append(os.path.abspath(__file__))
+    args.append("--forkserver")
+    env = dict(env)
+    env.pop("AYON_WEBACTION_EVENT_ID", None)
+    try:
+        started = start_forkserver(socket_path, args, env)
+    except OSError as exc:
+        _print(f"*** Failed to start forkserver: {exc}")
+        return
+    if started:
+        log_path = get_forkserver_log_path(socket_path)
+        _print(f">>> Starting forkserver, output is stored to '{log_path}'")
+
+
+def _run_forked_process(argv, data):
+    """Run AYON launcher process forked from forkserver.
+
+    Global connection of forkserver is replaced by connection with
+        credentials of the process.
+
+    Args:
+        argv (list[str]): Arguments of the process.
+        data (dict[str, Any]): Additional data from the process.
+    """
+    global SKIP_HEADERS, HEADLESS_MODE_ENABLED, _TERMINAL
+    from ayon_common.connection.credentials import (
+        load_environments,
+        create_global_connection,
+    )
+
+    sys.argv[:] = argv
+    SKIP_HEADERS = data.get("skip_headers", False)
+    HEADLESS_MODE_ENABLED = os.getenv("AYON_HEADLESS_MODE") == "1"
+    # Terminal of forkserver was created for its own stdio
+    _TERMINAL = None
+
+    load_environments()
+    if not create_global_connection():
+        _connect_to_ayon_server()
+        create_global_connection()
+
+    start_arg = StartArgScript.from_args(sys.argv)
+    if start_arg.is_valid:
+        script_cli(start_arg)
+    else:
+        main_cli()
+
+
+def _run_forkserver():
+    """Bootstrap AYON launcher and serve other processes as forkserver."""
+    from ayon_common.forkserver import (
+        get_forkserver_socket_path,
+        lock_forkserver,
+        set_forkserver_failed,
+        serve_forkserver,
+    )
+    from ayon_common.startup import get_env_changes
+
+    # Socket path is based on environment before bootstrap
+    socket_path = get_forkserver_socket_path()
+    lock_fd = lock_forkserver(socket_path)
+    if lock_fd is None:
+        _print("*** Other forkserver is already running.")
+        return
+
+    env_before = dict(os.environ)
+    try:
+        boot()
+        _import_main_addon()
+    except BaseException:
+        # Don't start forkserver again for a while
+        set_forkserver_failed(socket_path, True)
+        raise
+    set_forkserver_failed(socket_path, False)
+
+    # Children get environment changes done by bootstrap
+    bootstrap_env = get_env_changes(env_before)
+
+    _print(f">>> Forkserver is listening on '{socket_path}'")
+    serve_forkserver(
+        socket_path, bootstrap_env, _run_forked_process, lock_fd=lock_fd
+    )
+
+
+def _print_bootstrap_env():
+    """Bootstrap and print environment of bootstrapped process.
+
+    Output contains shell commands setting environment variables changed
+        by bootstrap, including path to bootstrap snapshot, so processes
+        started with the environment skip bootstrap. Output of bootstrap
+        is printed to stderr. API key is not printed.
+    """
+    import shlex
+    from contextlib import redirect_stdout
+    from ayon_common.startup import (
+        BOOTSTRAP_SNAPSHOT_ENV_KEY,
+        load_bootstrap_snapshot,
+    )
+
+    with redirect_stdout(sys.stderr):
+        boot()
+
+    filepath = os.environ.get(BOOTSTRAP_SNAPSHOT_ENV_KEY)
+    snapshot = None
+    if filepath:
+        snapshot = load_bootstrap_snapshot(
+            filepath, os.environ[SERVER_URL_ENV_KEY]
+        )
+    if snapshot is None:
+        _print("!!! Bootstrap snapshot is not available.")
+        sys.exit(1)
+
+    env = dict(snapshot["env"])
+    env["PYTHONPATH"] = os.environ["PYTHONPATH"]
+    env[BOOTSTRAP_SNAPSHOT_ENV_KEY] = filepath
+    env[SERVER_URL_ENV_KEY] = os.environ[SERVER_URL_ENV_KEY]
+    for key in sorted(env):
+        value = env[key]
+        if platform.system().lower() == "windows":
+            print(f'set "{key}={value or ""}"')
+        elif value is None:
+            print(f"unset {key}")
+        else:
+            print(f"export {key}={shlex.quote(value)}")
+
+
+def _finish_trace():
+    """Store bootstrap trace if tracing is enabled.
+
+    Tracing is disabled afterwards, so processes launched by AYON are
+        not traced.
+    """
+    from ayon_common.tracing import write_trace, get_trace_summary
+
+    filepath = write_trace()
+    os.environ.pop("AYON_TRACE", None)
+    os.environ.pop("AYON_TRACE_FILE", None)
+    if filepath is None:
+        return
+
+    if HEADLESS_MODE_ENABLED:
+        _print(f">>> Bootstrap trace: {get_trace_summary()}")
+    _print(f">>> Bootstrap trace stored to '{filepath}'")
+
 
 def _on_main_addon_missing():
+    from ayon_common.startup import show_startup_error
+
     if HEADLESS_MODE_ENABLED:
         raise RuntimeError("Failed to import required AYON core addon.")
     show_startup_error(
@@ -708,6 +1352,8 @@ def _on_main_addon_missing():
 
 
 def _on_main_addon_import_error(exception):
+    from ayon_common.startup import show_startup_error
+
     if HEADLESS_MODE_ENABLED:
         raise RuntimeError(
             "Failed to import AYON core addon. Probably because"
@@ -742,6 +1388,11 @@ def process_uri():
 
     server_url = parsed_query["server_url"][0]
     uri_token = parsed_query["token"][0]
+
+    import requests
+    from ayon_api import take_web_action_event
+    from ayon_common.connection.credentials import load_token
+
     # Use raw requests to get all necessary information from server
     data = take_web_action_event(server_url, uri_token)
     username = data.get("userName")
@@ -848,6 +1499,8 @@ def webaction_event_handler():
         if not event_id:
             return
 
+        from ayon_api import get_event, update_event
+
         try:
             event = get_event(event_id)
             if not event:
@@ -872,6 +1525,28 @@ def webaction_event_handler():
 
 
 
+def _import_main_addon():
+    """Import 'ayon_core' addon.
+
+    Returns:
+        ModuleType: 'ayon_core.cli' module.
+    """
+    from ayon_common.tracing import trace_span
+
+    with trace_span("import_ayon_core"):
+        try:
+            import ayon_core  # noqa F401
+        except ModuleNotFoundError:
+            _on_main_addon_missing()
+
+        try:
+            from ayon_core import cli
+        except ImportError as exc:
+            traceback.print_exception(*sys.exc_info())
+            _on_main_addon_import_error(exc)
+    return cli
+
+
 def main_cli():
     """Main startup logic.
 
@@ -879,16 +1554,10 @@ def main_cli():
     moment is fully dependent on 'ayon_core' addon. Which means it
     contains more logic than it should.
     """
-    try:
-        import ayon_core  # noqa F401
-    except ModuleNotFoundError:
-        _on_main_addon_missing()
+    from ayon_common import is_staging_enabled, is_dev_mode_enabled
 
-    try:
-        from ayon_core import cli
-    except ImportError as exc:
-        traceback.print_exception(*sys.exc_info())
-        _on_main_addon_import_error(exc)
+    cli = _import_main_addon()
+    _finish_trace()
 
     # print info when not running scripts defined in 'silent commands'
     if not SKIP_HEADERS:
@@ -1020,6 +1689,13 @@ def main():
         init_launcher_executable(ensure_protocol_is_registered=True)
         sys.exit(0)
 
+    # Maintenance of distributed addons and dependency packages
+    if "dedup-ayon-storage" in sys.argv:
+        from ayon_common.distribution import cli_dedupe_storage
+
+        cli_dedupe_storage()
+        sys.exit(0)
+
     if SHOW_LOGIN_UI:
         if HEADLESS_MODE_ENABLED:
             _print((
@@ -1037,10 +1713,28 @@ def main():
             fill_pythonpath()
             return script_cli()
 
+        if FORKSERVER_MODE:
+            _run_forkserver()
+            sys.exit(0)
+
+        if PRINT_BOOTSTRAP_ENV:
+            _print_bootstrap_env()
+            sys.exit(0)
+
+        forkserver_socket_path = _get_forkserver_socket_path()
+        if forkserver_socket_path:
+            exit_code = _run_in_forkserver(forkserver_socket_path)
+            if exit_code is not None:
+                sys.exit(exit_code)
+            forkserver_env = dict(os.environ)
+
         boot()
+        if forkserver_socket_path:
+            _start_forkserver(forkserver_socket_path, forkserver_env)
 
         start_arg = StartArgScript.from_args(sys.argv)
         if start_arg.is_valid:
+            _finish_trace()
             script_cli(start_arg)
         else:
             main_cli()
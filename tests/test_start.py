@@ -0,0 +1,208 @@
+import os
+import sys
+import time
+import socket
+import subprocess
+
+_START_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "start.py"
+)
+
+# Modules that must not be imported by scripts started with '--skip-bootstrap'
+_BOOTSTRAP_MODULES = {
+    "blessed", "requests", "urllib3", "ayon_api", "ayon_common"
+}
+# Import time budget of 'start.py' with '--skip-bootstrap' in seconds
+_SKIP_BOOTSTRAP_IMPORT_BUDGET = 0.15
+
+
+def _get_import_times(args):
+    """Self import time of imported modules using '-X importtime'."""
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, module_name = line[len("import time:"):].split("|")
+        if self_time.strip().isdigit():
+            import_times[module_name.strip()] = int(self_time)
+    return import_times
+
+
+def test_skip_bootstrap_import_time(printer, temp_folder):
+    """Tests that '--skip-bootstrap' does not import bootstrap modules."""
+
+    script_path = os.path.join(temp_folder, "script.py")
+    with open(script_path, "w") as stream:
+        stream.write("")
+
+    baseline = _get_import_times(["-c", "pass"])
+    import_times = {
+        module_name: import_time
+        for module_name, import_time in _get_import_times([
+            _START_PATH, "--skip-bootstrap", script_path
+        ]).items()
+        if module_name not in baseline
+    }
+    bootstrap_modules = {
+        module_name
+        for module_name in import_times
+        if module_name.split(".")[0] in _BOOTSTRAP_MODULES
+    }
+    assert not bootstrap_modules
+
+    total = sum(import_times.values()) / 1000000
+    printer(f"Imports of 'start.py --skip-bootstrap' took {total:.3f}s")
+    assert total < _SKIP_BOOTSTRAP_IMPORT_BUDGET
+
+
+def test_bootstrap_snapshot_boot(printer, temp_folder, monkeypatch):
+    """Tests global connection of process booted from bootstrap snapshot."""
+
+    from version import __version__
+    from ayon_common.startup import bootstrap_snapshot
+    from ayon_common.distribution.tests.local_server import (
+        LocalAyonServer,
+    )
+
+    script_path = os.path.join(temp_folder, "script.py")
+    with open(script_path, "w") as stream:
+        stream.write(
+            "import ayon_api\n"
+            "print(ayon_api.get_default_settings_variant())\n"
+        )
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    monkeypatch.setenv("AYON_LAUNCHER_STORAGE_DIR", temp_folder)
+    monkeypatch.setenv("AYON_VERSION", __version__)
+    monkeypatch.setenv("AYON_BUNDLE_NAME", "StagingBundle")
+    monkeypatch.setenv("AYON_USE_STAGING", "1")
+    monkeypatch.delenv("AYON_USE_DEV", raising=False)
+    with LocalAyonServer() as server:
+        filepath = bootstrap_snapshot.save_bootstrap_snapshot(
+            server.url, {"AYON_DEFAULT_SETTINGS_VARIANT": "production"}, []
+        )
+        env = dict(os.environ)
+        env.pop("AYON_USE_STAGING")
+        env["AYON_SERVER_URL"] = server.url
+        env["AYON_API_KEY"] = "token"
+        env["AYON_BOOTSTRAP_SNAPSHOT"] = filepath
+        process = subprocess.run(
+            [
+                sys.executable,
+                _START_PATH,
+                "--use-staging",
+                script_path,
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+    lines = process.stdout.splitlines()
+    assert ">>> Using bootstrap of release bundle 'StagingBundle'" in lines
+    assert lines[-1] == "staging"
+
+
+def _run_start(args, env):
+    return subprocess.run(
+        [sys.executable, _START_PATH, *args],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_offline_boot(printer, temp_folder, monkeypatch):
+    """Tests forced offline mode and fallback when server is not reached."""
+
+    from version import __version__
+    from ayon_common.startup import save_offline_snapshot
+
+    script_path = os.path.join(temp_folder, "script.py")
+    with open(script_path, "w") as stream:
+        stream.write("print('script executed')\n")
+
+    monkeypatch.setenv("AYON_LAUNCHER_LOCAL_DIR", temp_folder)
+    monkeypatch.setenv("AYON_LAUNCHER_STORAGE_DIR", temp_folder)
+    monkeypatch.setenv("AYON_VERSION", __version__)
+    monkeypatch.setenv("AYON_HEADLESS_MODE", "1")
+    monkeypatch.setenv("AYON_API_KEY", "token")
+    for env_key in (
+        "AYON_BUNDLE_NAME",
+        "AYON_USE_DEV",
+        "AYON_USE_STAGING",
+        "AYON_OFFLINE_MODE",
+        "AYON_OFFLINE_FALLBACK",
+        "AYON_BOOTSTRAP_SNAPSHOT",
+    ):
+        monkeypatch.delenv(env_key, raising=False)
+    snapshot = {
+        "bundle_name": "Bundle",
+        "use_dev": False,
+        "use_staging": False,
+        "settings_variant": "production",
+        "addon_versions": {},
+        "dependency_package": None,
+        "python_paths": [],
+        "sys_paths": [],
+        "disk_mapping": [],
+    }
+
+    # Server which accepts connections but never responds
+    hanging_server = socket.socket()
+    hanging_server.bind(("127.0.0.1", 0))
+    hanging_server.listen()
+    # Port where nothing listens
+    closed_server = socket.socket()
+    closed_server.bind(("127.0.0.1", 0))
+    closed_url = "http://127.0.0.1:{}".format(closed_server.getsockname()[1])
+    closed_server.close()
+    try:
+        url = "http://127.0.0.1:{}".format(hanging_server.getsockname()[1])
+        env = dict(os.environ)
+        env["AYON_SERVER_URL"] = url
+
+        # Forced offline mode without snapshot
+        process = _run_start(["--offline", script_path], env)
+        assert process.returncode == 1
+
+        save_offline_snapshot(url, "production", snapshot)
+        process = _run_start(["--offline", script_path], env)
+        lines = process.stdout.splitlines()
+        assert process.returncode == 0
+        assert ">>> Starting offline with release bundle 'Bundle'" in lines
+        assert lines[-1] == "script executed"
+
+        # Server does not respond in offline timeout
+        env["AYON_OFFLINE_TIMEOUT"] = "0.5"
+        start = time.time()
+        process = _run_start([script_path], env)
+        elapsed = time.time() - start
+        lines = process.stdout.splitlines()
+        printer(f"Offline fallback took {elapsed:.3f}s")
+        assert process.returncode == 0
+        assert f"!!! AYON server '{url}' is not reachable." in lines
+        assert lines[-1] == "script executed"
+        assert elapsed < 10
+
+        # Fallback is disabled
+        env["AYON_SERVER_URL"] = closed_url
+        save_offline_snapshot(closed_url, "production", snapshot)
+        process = _run_start([script_path], env)
+        assert process.returncode == 0
+        assert process.stdout.splitlines()[-1] == "script executed"
+
+        env["AYON_OFFLINE_FALLBACK"] = "0"
+        process = _run_start([script_path], env)
+        assert process.returncode == 1
+        assert "script executed" not in process.stdout
+    finally:
+        hanging_server.close()